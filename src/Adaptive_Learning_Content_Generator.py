@@ -1,19 +1,48 @@
-import nltk
-from nltk.tokenize import sent_tokenize
 import random
-import os
+import threading
+from tokenization import punkt_available, sentence_tokenize
+from substitution_engine import SubstitutionDictionary
+from lru_cache import LRUCache
 
 class AdaptiveLearningContentGenerator:
-    def __init__(self):
-        # Ensure necessary NLTK resources are available
-        self.ensure_nltk_data()
-        
+    def __init__(self, cache_size=128, warm_cache=False):
         # Initialize dictionaries for word substitution
         self.initialize_dictionaries()
         
         # Initialize content database
         self.initialize_content_database()
 
+        # Processed content only depends on (subject, complexity level, learning speed)
+        self.content_cache = LRUCache(maxsize=cache_size)
+        self._cached_dictionary_versions = self._dictionary_versions()
+        self._cache_versions_lock = threading.Lock()
+        if warm_cache:
+            self.warm_up_cache()
+
+    @property
+    def simple_words(self):
+        return self._simple_words
+
+    @simple_words.setter
+    def simple_words(self, words):
+        # Matching is case-insensitive because simplify_sentence lowercases its input
+        previous = getattr(self, '_simple_words', None)
+        self._simple_words = SubstitutionDictionary(words, ignore_case=True)
+        if previous is not None:
+            # Keep the version moving forward so caches notice the replacement
+            self._simple_words.version = previous.version + 1
+
+    @property
+    def enhanced_words(self):
+        return self._enhanced_words
+
+    @enhanced_words.setter
+    def enhanced_words(self, words):
+        previous = getattr(self, '_enhanced_words', None)
+        self._enhanced_words = SubstitutionDictionary(words)
+        if previous is not None:
+            self._enhanced_words.version = previous.version + 1
+
     def initialize_dictionaries(self):
         """Initialize the dictionaries for word simplification and enhancement."""
         self.simple_words = {
@@ -106,17 +135,16 @@ class AdaptiveLearningContentGenerator:
         }
 
     def ensure_nltk_data(self):
-        """Ensure that required NLTK data is downloaded."""
-        try:
-            nltk_data_path = nltk.data.find('tokenizers/punkt')
-            print(f"NLTK punkt tokenizer found at: {nltk_data_path}")
-        except LookupError:
-            print("Downloading required NLTK data...")
-            home_dir = os.path.expanduser("~")
-            nltk_data_dir = os.path.join(home_dir, "nltk_data")
-            os.makedirs(nltk_data_dir, exist_ok=True)
-            nltk.download('punkt', download_dir=nltk_data_dir, quiet=True)
-            print(f"Downloaded punkt tokenizer to {nltk_data_dir}")
+        """
+        Check whether the NLTK punkt tokenizer is available.
+
+        The check runs once per process and never downloads anything;
+        without punkt, sentences are split with the regex tokenizer.
+        """
+        available = punkt_available()
+        if not available:
+            print("NLTK punkt tokenizer not found. Using regex sentence tokenizer.")
+        return available
 
     def generate_adaptive_content(self, subject, learning_speed, student_level=None):
         """
@@ -146,8 +174,7 @@ class AdaptiveLearningContentGenerator:
         complexity_level = speed_map.get(learning_speed.lower(), 'intermediate')
         
         try:
-            content = self.content_database[normalized_subject][complexity_level]
-            processed_content = self.process_content(content, learning_speed)
+            processed_content = self._get_processed_content(normalized_subject, complexity_level, learning_speed)
             
             return {
                 "subject": normalized_subject,
@@ -163,10 +190,42 @@ class AdaptiveLearningContentGenerator:
                 "error": f"Could not generate content for {normalized_subject} at {complexity_level} level"
             }
 
+    def _dictionary_versions(self):
+        return (self.simple_words.version, self.enhanced_words.version)
+
+    def _get_processed_content(self, subject, complexity_level, learning_speed):
+        """Return processed content from the cache, processing it on a miss."""
+        versions = self._dictionary_versions()
+        with self._cache_versions_lock:
+            if versions != self._cached_dictionary_versions:
+                # Substitution dictionaries changed, so every cached rendering is stale
+                self.content_cache.clear()
+                self._cached_dictionary_versions = versions
+
+        # A rendering still being processed for the old versions may be stored
+        # after the clear; keying on the versions means it is never served
+        key = (subject, complexity_level, learning_speed.lower(), versions)
+        processed_content = self.content_cache.get(key)
+        if processed_content is None:
+            content = self.content_database[subject][complexity_level]
+            processed_content = self.process_content(content, learning_speed)
+            self.content_cache.put(key, processed_content)
+        return processed_content
+
+    def warm_up_cache(self, learning_speeds=('slow', 'medium', 'fast')):
+        """Precompute processed content for every subject and learning speed."""
+        for subject in self.get_available_subjects():
+            for speed in learning_speeds:
+                self.generate_adaptive_content(subject, speed)
+
+    def cache_stats(self):
+        """Return hit/miss/eviction counters of the processed content cache."""
+        return self.content_cache.stats()
+
     def process_content(self, content, learning_speed):
         """Process content to match the student's learning speed."""
         try:
-            sentences = sent_tokenize(content)
+            sentences = sentence_tokenize(content)
             if not sentences:
                 sentences = [content]
         except Exception as e:
@@ -184,21 +243,14 @@ class AdaptiveLearningContentGenerator:
 
     def simplify_sentence(self, sentence):
         """Simplify a sentence by reducing complex words."""
-        result = sentence.lower()
-        for complex_word, simple_word in self.simple_words.items():
-            complex_word_lower = complex_word.lower()
-            if complex_word_lower in result:
-                result = result.replace(complex_word_lower, simple_word)
+        result = self.simple_words.substitute(sentence.lower())
         if result:
             result = result[0].upper() + result[1:]
         return result
 
     def enhance_sentence(self, sentence):
         """Enhance a sentence by adding complexity and details."""
-        result = sentence
-        for simple_word, enhanced_word in self.enhanced_words.items():
-            result = result.replace(simple_word, enhanced_word)
-        return result
+        return self.enhanced_words.substitute(sentence)
 
     def get_available_subjects(self):
         """Return a list of available subjects in the content database."""
@@ -211,6 +263,7 @@ class AdaptiveLearningContentGenerator:
             "intermediate": intermediate_content,
             "advanced": advanced_content
         }
+        self.content_cache.clear()
         print(f"Added subject '{subject}' to the content database.")
 
 def main():
@@ -232,5 +285,7 @@ def main():
             except Exception as e:
                 print(f"Error generating content for subject '{subject}' at speed '{speed}': {e}")
 
+    print(f"\nContent cache: {generator.cache_stats()}")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
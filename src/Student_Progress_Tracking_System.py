@@ -1,32 +1,360 @@
 # Student_Progress_Tracking_System.py
+import atexit
+import json
+import os
+import threading
+import weakref
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+
 import pandas as pd
-from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+PROGRESS_FILE = "student_progress.csv"
+PROGRESS_COLUMNS = ["student_id", "subject", "completion_rate", "average_score", "completed_materials"]
+MATERIALS_PER_SUBJECT = 10.0  # Assuming 10 materials per subject
+
+# (student_id, subject) -> (completion_rate, average_score, "|"-joined completed materials)
+ProgressRecords = Dict[Tuple, Tuple]
+
+
+def _file_signature(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+@contextmanager
+def _file_lock(lock_path: str, shared: bool = False):
+    """
+    Hold an inter-process lock on lock_path.
+
+    Shared locks are only available through fcntl; on Windows every lock
+    is exclusive.
+    """
+    with open(lock_path, "a+") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _read_snapshot(path: str) -> ProgressRecords:
+    progress_df = pd.read_csv(path, dtype={"student_id": str, "subject": str})
+    # The first row for a (student_id, subject) pair wins
+    progress_df = progress_df.drop_duplicates(["student_id", "subject"], keep="first")
+    keys = zip(progress_df["student_id"].tolist(), progress_df["subject"].tolist())
+    values = zip(
+        progress_df["completion_rate"].tolist(),
+        progress_df["average_score"].tolist(),
+        progress_df["completed_materials"].tolist()
+    )
+    return dict(zip(keys, values))
+
+
+def _write_snapshot(path: str, records: ProgressRecords) -> None:
+    """Write records to path atomically through a temporary file."""
+    rows = [(student_id, subject) + record for (student_id, subject), record in records.items()]
+    tmp_path = f"{path}.tmp"
+    pd.DataFrame(rows, columns=PROGRESS_COLUMNS).to_csv(tmp_path, index=False)
+    with open(tmp_path, "rb") as tmp_file:
+        os.fsync(tmp_file.fileno())
+    os.replace(tmp_path, path)
+
+
+def _json_default(value):
+    # numpy scalars, e.g. a score taken from a DataFrame
+    if hasattr(value, "item"):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _apply_progress_event(record: Optional[Tuple], event: Dict) -> Tuple:
+    """Return a progress record updated with one score event."""
+    if record is None:
+        return (1 / MATERIALS_PER_SUBJECT, event["score"], event["completed_material"])
+
+    completed_materials = record[2]
+    has_materials = isinstance(completed_materials, str) and completed_materials
+    completed = dict.fromkeys(completed_materials.split("|") if has_materials else [])
+    completed[event["completed_material"]] = None
+    return (len(completed) / MATERIALS_PER_SUBJECT, event["score"], "|".join(completed))
+
+
+def _replay_log(log_path: str, records: ProgressRecords, offset: int = 0) -> int:
+    """
+    Apply the log's events from byte offset onwards to records.
+
+    Returns:
+        Offset just past the last complete event read
+    """
+    try:
+        with open(log_path, "rb") as log_file:
+            log_file.seek(offset)
+            data = log_file.read()
+    except FileNotFoundError:
+        return 0
+
+    # A writer in another process may be halfway through a line
+    complete = data[:data.rfind(b"\n") + 1]
+    for line in complete.splitlines():
+        event = json.loads(line)
+        key = (str(event["student_id"]), str(event["subject"]))
+        records[key] = _apply_progress_event(records.get(key), event)
+    return offset + len(complete)
+
+
+# Event logs whose queued events are written when the interpreter exits
+_open_logs = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_logs() -> None:
+    for log in list(_open_logs):
+        try:
+            log.flush()
+        except Exception as e:
+            print(f"Error writing progress log {log.log_path}: {e}")
+
+
+class ProgressEventLog:
+    """
+    Append-only log of progress updates next to the progress snapshot CSV.
+
+    Events are buffered and written in groups, once flush_every events are
+    waiting or flush_interval_ms after the first one arrived. Every
+    compact_every events the log is folded into a new snapshot that
+    replaces the CSV atomically. Writes and compaction hold an exclusive
+    file lock, so several worker processes can record progress safely.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str = PROGRESS_FILE,
+        flush_every: int = 64,
+        flush_interval_ms: float = 50,
+        compact_every: int = 10_000
+    ):
+        self.snapshot_path = snapshot_path
+        self.log_path = f"{snapshot_path}.log"
+        self.lock_path = f"{snapshot_path}.lock"
+        self.flush_every = flush_every
+        self.flush_interval_ms = flush_interval_ms
+        self.compact_every = compact_every
+
+        # (event, serialized log line) in arrival order
+        self._pending: List[Tuple[Dict, str]] = []
+        self._pending_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._events_since_compaction = 0
+        _open_logs.add(self)
+
+    def append(self, event: Dict) -> None:
+        """
+        Queue an event; it reaches disk with the next group commit.
+
+        The event is serialized here, so a value that cannot be written
+        raises TypeError to the caller instead of failing the later flush.
+        """
+        event = dict(event, student_id=str(event["student_id"]), subject=str(event["subject"]))
+        line = json.dumps(event, default=_json_default) + "\n"
+        with self._pending_lock:
+            self._pending.append((event, line))
+            flush_now = len(self._pending) >= self.flush_every
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_interval_ms / 1000, self._flush_in_background)
+                self._timer.daemon = True
+                self._timer.start()
+        if flush_now:
+            self.flush()
+
+    def pending_events(self) -> List[Dict]:
+        """Events appended in this process that are not on disk yet."""
+        with self._pending_lock:
+            return [event for event, _ in self._pending]
+
+    def _flush_in_background(self) -> None:
+        try:
+            self.flush()
+        except Exception as e:
+            # The events stay queued for the next flush
+            print(f"Error writing progress log: {e}")
+
+    def flush(self) -> int:
+        """
+        Write all queued events to the log.
+
+        Returns:
+            Number of events written
+        """
+        with self._flush_lock:
+            with self._pending_lock:
+                events, self._pending = self._pending, []
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+            if not events:
+                return 0
+
+            try:
+                with _file_lock(self.lock_path):
+                    with open(self.log_path, "a", encoding="utf-8") as log_file:
+                        log_file.write("".join(line for _, line in events))
+                        log_file.flush()
+                        os.fsync(log_file.fileno())
+            except BaseException:
+                # Requeue ahead of newer events. Replaying an event that did
+                # reach the log before the failure gives the same record.
+                with self._pending_lock:
+                    self._pending[:0] = events
+                raise
+
+            self._events_since_compaction += len(events)
+            if self.compact_every and self._events_since_compaction >= self.compact_every:
+                self._compact()
+        return len(events)
+
+    def compact(self) -> None:
+        """Flush, then fold the log into a new snapshot and empty the log."""
+        self.flush()
+        with self._flush_lock:
+            self._compact()
+
+    def _compact(self) -> None:
+        with _file_lock(self.lock_path):
+            records = _read_snapshot(self.snapshot_path) if os.path.exists(self.snapshot_path) else {}
+            _replay_log(self.log_path, records)
+            _write_snapshot(self.snapshot_path, records)
+            open(self.log_path, "w").close()
+        self._events_since_compaction = 0
+
+
+class ProgressStore:
+    """
+    In-memory index of student progress keyed by (student_id, subject).
+
+    The snapshot CSV is loaded once and the event log is replayed on top of
+    it. Later calls only read log bytes appended since the last refresh,
+    and reload everything when the snapshot changes, so updates made by
+    other processes still show up.
+    """
+
+    def __init__(self, path: str = PROGRESS_FILE, event_log: Optional[ProgressEventLog] = None):
+        self.path = path
+        self.log_path = f"{path}.log"
+        self.lock_path = f"{path}.lock"
+        self.event_log = event_log
+        self._index: ProgressRecords = {}
+        self._signature = None
+        self._log_offset = 0
+        self._exists = False
+        self._lock = threading.Lock()
+
+    def _signatures(self):
+        return (_file_signature(self.path), _file_signature(self.log_path))
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the snapshot and log files."""
+        signature = self._signatures()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            if signature == (None, None):
+                self._index, self._log_offset, self._exists = {}, 0, False
+                self._signature = signature
+                return
+
+            # Compaction swaps the snapshot and empties the log under this lock
+            with _file_lock(self.lock_path, shared=True):
+                snapshot_signature, log_signature = signature = self._signatures()
+                log_size = log_signature[1] if log_signature else 0
+                if self._signature is None or snapshot_signature != self._signature[0] or log_size < self._log_offset:
+                    self._index = _read_snapshot(self.path) if snapshot_signature else {}
+                    self._log_offset = 0
+                self._log_offset = _replay_log(self.log_path, self._index, self._log_offset)
+            self._exists = True
+            self._signature = signature
+
+    def get(self, student_id: str, subject: str) -> Optional[Dict]:
+        """
+        Look up progress for a student and subject.
+
+        Returns:
+            Progress dict, or None if no progress has been recorded at all
+        """
+        key = (student_id, subject)
+        return self.get_many([key])[key]
+
+    def get_many(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict]]:
+        """
+        Look up progress for many (student_id, subject) pairs after a single refresh.
+
+        Returns:
+            Progress dict (or None, as in get()) per key, keyed as given;
+            ids are matched as strings, as they are read from the CSV
+        """
+        self.refresh()
+        keys = {key: (str(key[0]), str(key[1])) for key in keys}
+        records = {stored_key: self._index.get(stored_key) for stored_key in keys.values()}
+
+        # Updates from this process that are still waiting for a group commit
+        pending = self.event_log.pending_events() if self.event_log is not None else []
+        for event in pending:
+            stored_key = (event["student_id"], event["subject"])
+            if stored_key in records:
+                records[stored_key] = _apply_progress_event(records[stored_key], event)
+
+        if not self._exists and not pending:
+            return dict.fromkeys(keys)
+        return {key: _progress_dict(records[stored_key]) for key, stored_key in keys.items()}
+
+
+def _progress_dict(record: Optional[Tuple]) -> Dict:
+    if record is None:
+        return {"completion_rate": 0.0, "average_score": 0.0, "completed_materials": []}
+    completion_rate, average_score, completed_materials = record
+    return {
+        "completion_rate": completion_rate,
+        "average_score": average_score,
+        "completed_materials": completed_materials.split("|") if isinstance(completed_materials, str) else []
+    }
+
+
+def _storage_backend():
+    # Imported here because storage_backends builds on the classes above
+    from storage_backends import get_storage_backend
+    return get_storage_backend()
+
 
 def get_student_progress(student_id: str, subject: str) -> Dict[str, float]:
     """
-    Get student progress for a subject from progress tracking CSV.
+    Get student progress for a subject from the active storage backend.
     Returns completion rate and average score.
     """
     try:
-        # Read progress data (create empty DataFrame if file doesn't exist)
-        try:
-            progress_df = pd.read_csv("student_progress.csv")
-        except FileNotFoundError:
+        progress = _storage_backend().get_progress(student_id, subject)
+        if progress is None:
             return {"completion_rate": 0.0, "average_score": 0.0}
-        
-        # Filter by student and subject
-        student_progress = progress_df[
-            (progress_df["student_id"] == student_id) & 
-            (progress_df["subject"] == subject)
-        ]
-        
-        if not student_progress.empty:
-            return {
-                "completion_rate": student_progress["completion_rate"].values[0],
-                "average_score": student_progress["average_score"].values[0],
-                "completed_materials": student_progress["completed_materials"].values[0].split("|")
-            }
-        return {"completion_rate": 0.0, "average_score": 0.0, "completed_materials": []}
+        return progress
     
     except Exception as e:
         print(f"Error reading progress: {e}")
@@ -34,42 +362,19 @@ def get_student_progress(student_id: str, subject: str) -> Dict[str, float]:
 
 def update_progress(student_id: str, subject: str, score: float, completed_material: str):
     """
-    Update or create student progress record
+    Update or create student progress record.
+
+    With the CSV backend the update is appended to the progress event log
+    and written to disk with the next group commit.
     """
     try:
-        # Try to read existing data
-        try:
-            progress_df = pd.read_csv("student_progress.csv")
-        except FileNotFoundError:
-            progress_df = pd.DataFrame(columns=[
-                "student_id", "subject", "completion_rate", 
-                "average_score", "completed_materials"
-            ])
-        
-        # Update or add record
-        mask = (progress_df["student_id"] == student_id) & (progress_df["subject"] == subject)
-        if mask.any():
-            # Update existing
-            idx = mask.idxmax()
-            progress_df.at[idx, "average_score"] = score
-            completed = set(progress_df.at[idx, "completed_materials"].split("|"))
-            completed.add(completed_material)
-            progress_df.at[idx, "completed_materials"] = "|".join(completed)
-            progress_df.at[idx, "completion_rate"] = len(completed) / 10.0  # Assuming 10 materials per subject
-        else:
-            # Add new
-            new_record = {
-                "student_id": student_id,
-                "subject": subject,
-                "average_score": score,
-                "completed_materials": completed_material,
-                "completion_rate": 0.1  # 1/10 completed
-            }
-            progress_df = progress_df.append(new_record, ignore_index=True)
-        
-        progress_df.to_csv("student_progress.csv", index=False)
+        _storage_backend().update_progress(student_id, subject, score, completed_material)
         return True
     
     except Exception as e:
         print(f"Error updating progress: {e}")
-        return False
\ No newline at end of file
+        return False
+
+def flush_progress(compact: bool = False) -> None:
+    """Write queued progress updates now, optionally compacting the log into the CSV."""
+    _storage_backend().flush(compact=compact)
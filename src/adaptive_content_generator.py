@@ -1,11 +1,34 @@
-import nltk
-import re
+from concurrent.futures import ProcessPoolExecutor
+from tokenization import regex_sentence_tokenize
 
-# Ensure these are downloaded
-try:
-    nltk.download('punkt', quiet=True)
-except:
-    pass
+# Added in front of sentences that are too short
+FILLER_WORDS = ['is', 'are', 'a', 'the', 'of', 'in']
+
+# Allowed word lengths (inclusive) for each vocabulary complexity
+WORD_LENGTH_LIMITS = {
+    'simple': (0, 6),
+    'moderate': (4, 8)
+}
+
+
+def _filler_prefix(current_length, min_length):
+    """
+    Filler words that pad a sentence of current_length words up to min_length.
+
+    Equivalent to repeatedly inserting FILLER_WORDS[len(words) % len(FILLER_WORDS)]
+    at the front, but built in linear time.
+    """
+    return [
+        FILLER_WORDS[length % len(FILLER_WORDS)]
+        for length in range(min_length - 1, current_length - 1, -1)
+    ]
+
+
+def _simplify_chunk(complexity_levels, texts, levels):
+    """Process pool entry point for AdaptiveLearningContentGenerator.simplify_batch."""
+    generator = AdaptiveLearningContentGenerator()
+    generator.complexity_levels = complexity_levels
+    return generator.simplify_batch(texts, levels)
 
 class AdaptiveLearningContentGenerator:
     def __init__(self):
@@ -38,8 +61,7 @@ class AdaptiveLearningContentGenerator:
         list: List of sentences
         """
         # Split text into sentences using regex
-        sentences = re.split(r'(?<!\w\.\w.)(?<![A-Z][a-z]\.)(?<=\.|\?)\s', text)
-        return [sentence.strip() for sentence in sentences if sentence.strip()]
+        return regex_sentence_tokenize(text)
     
     def simplify_content(self, text, learning_level):
         """
@@ -79,9 +101,7 @@ class AdaptiveLearningContentGenerator:
             # Truncate or pad to meet length requirements
             if len(words) < min_length:
                 # Add simple filler words
-                filler_words = ['is', 'are', 'a', 'the', 'of', 'in']
-                while len(words) < min_length:
-                    words.insert(0, filler_words[len(words) % len(filler_words)])
+                words = _filler_prefix(len(words), min_length) + words
             
             if len(words) > max_length:
                 words = words[:max_length]
@@ -92,6 +112,82 @@ class AdaptiveLearningContentGenerator:
         
         return ' '.join(simplified_sentences)
     
+    def simplify_batch(self, texts, levels, workers=None, chunk_size=2000):
+        """
+        Simplify many texts at once
+
+        Level parameters and filler prefixes are resolved once per batch
+        instead of once per sentence. The output matches simplify_content.
+
+        Args:
+        texts (list): Original texts
+        levels (str or list): One learning level for all texts, or one per text
+        workers (int, optional): Process pool size for large batches
+        chunk_size (int): Number of texts handed to each worker at a time
+
+        Returns:
+        list: Simplified texts, in input order
+        """
+        texts = list(texts)
+        if isinstance(levels, str):
+            levels = [levels] * len(texts)
+        else:
+            levels = list(levels)
+            if len(levels) != len(texts):
+                raise ValueError(f"Got {len(texts)} texts but {len(levels)} levels")
+
+        unknown_levels = set(levels) - set(self.complexity_levels)
+        if unknown_levels:
+            raise ValueError(
+                f"Unknown learning levels: {', '.join(sorted(map(str, unknown_levels)))}. "
+                f"Available levels: {', '.join(self.complexity_levels)}"
+            )
+
+        if workers and workers > 1 and len(texts) > chunk_size:
+            starts = range(0, len(texts), chunk_size)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                chunks = executor.map(
+                    _simplify_chunk,
+                    [self.complexity_levels] * len(starts),
+                    [texts[start:start + chunk_size] for start in starts],
+                    [levels[start:start + chunk_size] for start in starts]
+                )
+                return [text for chunk in chunks for text in chunk]
+
+        return self._simplify_batch_serial(texts, levels)
+
+    def _simplify_batch_serial(self, texts, levels):
+        # Resolve each level's parameters once for the whole batch
+        level_params = {}
+        for name, complexity in self.complexity_levels.items():
+            min_length, max_length = complexity['sentence_length']
+            word_limits = WORD_LENGTH_LIMITS.get(complexity['vocabulary_complexity'])
+            level_params[name] = (word_limits, min_length, max_length)
+
+        # Filler prefixes are shared by every sentence with the same (length, min_length)
+        prefixes = {}
+        results = []
+        for text, level in zip(texts, levels):
+            word_limits, min_length, max_length = level_params[level]
+            simplified_sentences = []
+            for sentence in self._custom_sentence_tokenize(text):
+                words = sentence.split()
+                if word_limits is not None:
+                    shortest, longest = word_limits
+                    words = [word for word in words if shortest <= len(word) <= longest]
+
+                n_words = len(words)
+                if n_words < min_length:
+                    prefix = prefixes.get((n_words, min_length))
+                    if prefix is None:
+                        prefix = prefixes[(n_words, min_length)] = _filler_prefix(n_words, min_length)
+                    words = prefix + words
+                if len(words) > max_length:
+                    del words[max_length:]
+                simplified_sentences.append(' '.join(words))
+            results.append(' '.join(simplified_sentences))
+        return results
+
     def generate_adaptive_content(self, original_content, learning_level):
         """
         Generate adaptive content for different learning levels
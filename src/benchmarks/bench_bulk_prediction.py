@@ -0,0 +1,75 @@
+# benchmarks/bench_bulk_prediction.py
+"""
+Throughput of predict_next_levels_bulk against calling
+streamlit_app.predict_next_level row by row, then streaming predictions
+over data/intel.csv replicated to 10M rows.
+
+Run from the src directory (row count can be overridden):
+    python benchmarks/bench_bulk_prediction.py [10000000]
+"""
+import os
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from level_prediction import iter_predict_next_levels_csv, predict_next_levels_bulk
+from model_training import EqualFeatureImportanceClassifier
+from streamlit_app import predict_next_level
+
+# The pickled model refers to the class through __main__
+sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier
+
+DEFAULT_ROWS = 10_000_000
+ROW_BY_ROW = 500
+CHUNK_SIZE = 1_000_000
+
+
+def main():
+    total_rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    model = joblib.load(os.path.join(SRC_DIR, "models", "student_performance_model.pkl"))
+    encoders = joblib.load(os.path.join(SRC_DIR, "models", "label_encoders.pkl"))
+    intel = pd.read_csv(os.path.join(SRC_DIR, "data", "intel.csv"))
+
+    rows = intel[['Age', 'Last_Test_Score', 'Knowledge_Level', 'Learning_Speed']].head(ROW_BY_ROW)
+    start = time.perf_counter()
+    expected = [predict_next_level(model, encoders, row) for row in rows.to_dict('records')]
+    row_rate = ROW_BY_ROW / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    bulk = predict_next_levels_bulk(model, encoders, intel)
+    bulk_rate = len(intel) / (time.perf_counter() - start)
+    assert list(bulk[:ROW_BY_ROW]) == expected
+
+    print(f"{'method':<36} {'rows/s':>14}")
+    print(f"{'predict_next_level, row by row':<36} {row_rate:>14,.0f}")
+    print(f"{f'bulk, {len(intel):,} rows in memory':<36} {bulk_rate:>14,.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "intel_large.csv")
+        repeats = -(-total_rows // len(intel))
+        for i in range(repeats):
+            intel.to_csv(path, index=False, mode="w" if i == 0 else "a", header=i == 0)
+        size_mb = os.path.getsize(path) / 1e6
+
+        predicted = 0
+        counts = {}
+        start = time.perf_counter()
+        for chunk, levels in iter_predict_next_levels_csv(model, encoders, path, chunk_size=CHUNK_SIZE):
+            predicted += len(levels)
+            values, value_counts = np.unique(levels, return_counts=True)
+            for value, count in zip(values, value_counts):
+                counts[value] = counts.get(value, 0) + int(count)
+        stream_rate = predicted / (time.perf_counter() - start)
+        print(f"{f'streamed, {predicted:,} rows ({size_mb:,.0f} MB)':<36} {stream_rate:>14,.0f}")
+        print(f"predicted levels: {counts}")
+
+
+if __name__ == "__main__":
+    main()
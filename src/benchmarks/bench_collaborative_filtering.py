@@ -0,0 +1,108 @@
+# benchmarks/bench_collaborative_filtering.py
+"""
+Offline evaluation of the item-item collaborative filtering model on
+synthetic progress data: precision@k against a popularity baseline,
+training time and per-request latency.
+
+Each synthetic student mostly completes materials from one preferred
+topic and scores better there. For a sample of students, 20% of their
+completed materials are hidden from training and must be recovered.
+
+Run from the src directory (student count can be overridden):
+    python benchmarks/bench_collaborative_filtering.py [1000000]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from collaborative_filtering import precision_at_k, train_item_item_model
+
+DEFAULT_STUDENTS = 1_000_000
+N_TOPICS = 100
+MATERIALS_PER_TOPIC = 50
+MEAN_COMPLETED = 10
+OFF_TOPIC_SHARE = 0.2
+N_EVAL_STUDENTS = 10_000
+HOLDOUT_SHARE = 0.2
+K = 10
+
+
+def synthetic_interactions(n_students, rng):
+    n_items = N_TOPICS * MATERIALS_PER_TOPIC
+    topics = rng.integers(0, N_TOPICS, n_students)
+    counts = rng.poisson(MEAN_COMPLETED - 2, n_students) + 2
+    students = np.repeat(np.arange(n_students, dtype=np.int64), counts)
+    off_topic = rng.random(len(students)) < OFF_TOPIC_SHARE
+    items = np.where(
+        off_topic,
+        rng.integers(0, n_items, len(students)),
+        topics[students] * MATERIALS_PER_TOPIC + rng.integers(0, MATERIALS_PER_TOPIC, len(students))
+    )
+    # One interaction per (student, material)
+    keys = np.unique(students * n_items + items)
+    students, items = keys // n_items, keys % n_items
+    on_topic = items // MATERIALS_PER_TOPIC == topics[students]
+    scores = np.where(on_topic, rng.uniform(0.6, 1.0, len(items)), rng.uniform(0.2, 0.7, len(items)))
+    return students, items, scores.astype(np.float32), n_items
+
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    rng = np.random.default_rng(0)
+
+    start = time.perf_counter()
+    students, items, scores, n_items = synthetic_interactions(n_students, rng)
+    materials = [f"https://example.com/material/{item}" for item in range(n_items)]
+    print(f"{n_students:,} students, {n_items:,} materials, {len(items):,} completions "
+          f"(generated in {time.perf_counter() - start:.1f}s)")
+
+    # Hide part of each evaluated student's history from training
+    eval_students = rng.choice(n_students, N_EVAL_STUDENTS, replace=False)
+    evaluated = np.isin(students, eval_students)
+    hidden = evaluated & (rng.random(len(items)) < HOLDOUT_SHARE)
+    train = ~hidden
+
+    start = time.perf_counter()
+    model = train_item_item_model(students[train].astype(np.int32), items[train].astype(np.int32),
+                                  scores[train], materials)
+    train_seconds = time.perf_counter() - start
+    print(f"trained in {train_seconds:.1f}s, {len(model.indices):,} neighbour entries "
+          f"({(model.indices.nbytes + model.similarities.nbytes) / 1e6:.1f} MB)")
+
+    histories, held_out = [], []
+    order = np.argsort(students[evaluated], kind='stable')
+    eval_rows = np.flatnonzero(evaluated)[order]
+    boundaries = np.flatnonzero(np.diff(students[eval_rows])) + 1
+    for rows in np.split(eval_rows, boundaries):
+        train_rows, hidden_rows = rows[train[rows]], rows[hidden[rows]]
+        if len(train_rows) and len(hidden_rows):
+            histories.append({materials[item]: float(score)
+                              for item, score in zip(items[train_rows], scores[train_rows])})
+            held_out.append([materials[item] for item in items[hidden_rows]])
+
+    popular = [materials[item] for item in np.argsort(-model.popularity, kind='stable')]
+
+    def popularity_baseline(history, k):
+        return [(url, 0.0) for url in popular if url not in history][:k]
+
+    print(f"\nevaluated students with hidden materials: {len(histories):,}")
+    print(f"{'model':<24} {f'precision@{K}':>14}")
+    print(f"{'popularity':<24} {precision_at_k(popularity_baseline, histories, held_out, K):>14.4f}")
+    print(f"{'item-item':<24} {precision_at_k(model.recommend, histories, held_out, K):>14.4f}")
+
+    latencies = []
+    for history in histories:
+        start = time.perf_counter()
+        model.recommend(history, K)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1e6
+    print(f"\nrecommend latency: mean {latencies.mean():.0f} us, p50 {np.percentile(latencies, 50):.0f} us, "
+          f"p99 {np.percentile(latencies, 99):.0f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# benchmarks/bench_compiled_tree.py
+"""
+Single-row prediction latency and startup time of the compiled decision
+tree against the pickled scikit-learn model. Also checks that both give
+identical predictions on data/intel.csv and on a dense grid of inputs.
+
+Run from the src directory:
+    python benchmarks/bench_compiled_tree.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from compiled_tree import CompiledTree, save_compiled_tree
+from level_prediction import FEATURE_COLUMNS, BulkFeatureEncoder
+from model_training import EqualFeatureImportanceClassifier
+
+# The pickled model refers to the class through __main__
+sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier
+warnings.simplefilter("ignore")
+
+MODEL_PATH = os.path.join(SRC_DIR, "models", "student_performance_model.pkl")
+ENCODERS_PATH = os.path.join(SRC_DIR, "models", "label_encoders.pkl")
+N_CALLS = 5_000
+STARTUP_REPEATS = 5
+
+
+def per_call_us(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return (time.perf_counter() - start) * 1e6 / len(rows)
+
+
+def startup_ms(code):
+    timings = []
+    for _ in range(STARTUP_REPEATS):
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c",
+             "import time\n_start = time.perf_counter()\n" + code +
+             "\nprint((time.perf_counter() - _start) * 1000)"],
+            cwd=SRC_DIR, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    model = joblib.load(MODEL_PATH)
+    encoders = joblib.load(ENCODERS_PATH)
+    intel = pd.read_csv(os.path.join(SRC_DIR, "data", "intel.csv"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tree_path = os.path.join(tmp, "tree.npz")
+        save_compiled_tree(model, tree_path)
+        compiled = CompiledTree.load(tree_path)
+
+        # Verification: every intel.csv row plus a dense grid around the data
+        features = BulkFeatureEncoder(encoders).transform(intel)
+        grid = np.array(np.meshgrid(
+            np.linspace(-4, 4, 161), np.linspace(-4, 4, 161), [0, 1, 2], [0, 1, 2]
+        )).reshape(4, -1).T
+        for name, X in (("intel.csv", features), ("grid", grid)):
+            X = pd.DataFrame(X, columns=FEATURE_COLUMNS)
+            print(f"predictions match on {name} ({len(X):,} rows): {compiled.matches(model, X)}")
+
+        rows = features[:N_CALLS]
+        row_frames = [pd.DataFrame([row], columns=FEATURE_COLUMNS) for row in rows]
+        row_lists = rows.tolist()
+        print(f"\n{'single-row predict':<36} {'us/call':>10}")
+        print(f"{'sklearn model.predict(DataFrame)':<36} {per_call_us(model.predict, row_frames):>10.1f}")
+        print(f"{'CompiledTree.predict(array)':<36} "
+              f"{per_call_us(compiled.predict, [row[None, :] for row in rows]):>10.1f}")
+        print(f"{'CompiledTree.predict_one(list)':<36} {per_call_us(compiled.predict_one, row_lists):>10.2f}")
+
+        print(f"\n{'startup (fresh interpreter)':<36} {'ms':>10}")
+        sklearn_startup = startup_ms(
+            "import sys, joblib\n"
+            "from model_training import EqualFeatureImportanceClassifier\n"
+            "sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier\n"
+            f"joblib.load({MODEL_PATH!r})"
+        )
+        compiled_startup = startup_ms(f"from compiled_tree import CompiledTree\nCompiledTree.load({tree_path!r})")
+        print(f"{'import sklearn + joblib.load':<36} {sklearn_startup:>10.1f}")
+        print(f"{'import numpy + CompiledTree.load':<36} {compiled_startup:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# benchmarks/bench_level_predictor.py
+"""
+Queries/sec of StudentLevelPredictor when every query retrains the model
+(the old behaviour), when the trained model is reused from the cache, and
+when queries are batched into one predict_student_levels call. Also times
+loading the persisted model in a new process against training it there.
+
+Run from the src directory:
+    python benchmarks/bench_level_predictor.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import numpy as np
+
+from ml_model_integration import StudentLevelPredictor, create_sample_dataset, train_student_level_model
+
+warnings.simplefilter("ignore")
+
+RETRAIN_QUERIES = 50
+CACHED_QUERIES = 5_000
+BATCH_ROWS = 100_000
+STARTUP_REPEATS = 5
+
+
+def queries_per_second(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(*row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def retrain_and_predict(*row):
+    model, scaler = train_student_level_model()
+    features = scaler.transform(np.array([row]))
+    return model.classes_[np.argmax(model.predict_proba(features)[0])]
+
+
+def construct_ms(cache_dir, clear_cache):
+    """Time StudentLevelPredictor() in a fresh process, after the imports."""
+    code = (
+        "import shutil, time\n"
+        "from ml_model_integration import StudentLevelPredictor\n"
+        "_start = time.perf_counter()\n"
+        f"StudentLevelPredictor(cache_dir={cache_dir!r})\n"
+        "print((time.perf_counter() - _start) * 1000)\n"
+        + (f"shutil.rmtree({cache_dir!r})\n" if clear_cache else "")
+    )
+    timings = []
+    for _ in range(STARTUP_REPEATS):
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", code],
+            cwd=SRC_DIR, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    X, _ = create_sample_dataset(n_samples=BATCH_ROWS, seed=7)
+    rows = X.tolist()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        predictor = StudentLevelPredictor(cache_dir=cache_dir)
+        batch = predictor.predict_student_levels(X)
+        singles = np.array([predictor.predict_student_level(*row) for row in rows[:CACHED_QUERIES]])
+        print(f"batch matches single-row predictions: {bool((batch[:CACHED_QUERIES] == singles).all())}\n")
+
+        print(f"{'mode':<40} {'queries/s':>12}")
+        print(f"{'retrain per query (before)':<40} "
+              f"{queries_per_second(retrain_and_predict, rows[:RETRAIN_QUERIES]):>12,.0f}")
+        cached = queries_per_second(
+            lambda *row: StudentLevelPredictor(cache_dir=cache_dir).predict_student_level(*row),
+            rows[:CACHED_QUERIES]
+        )
+        print(f"{'cached predictor, one query per call':<40} {cached:>12,.0f}")
+        start = time.perf_counter()
+        predictor.predict_student_levels(X)
+        print(f"{'predict_student_levels batch':<40} {BATCH_ROWS / (time.perf_counter() - start):>12,.0f}")
+
+        print(f"\n{'StudentLevelPredictor() in a new process':<40} {'ms':>12}")
+        train_ms = construct_ms(os.path.join(cache_dir, "empty"), clear_cache=True)
+        load_ms = construct_ms(cache_dir, clear_cache=False)
+        print(f"{'no cache file: train and persist':<40} {train_ms:>12.1f}")
+        print(f"{'load persisted model':<40} {load_ms:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
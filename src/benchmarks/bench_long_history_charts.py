@@ -0,0 +1,75 @@
+# benchmarks/bench_long_history_charts.py
+"""
+Render time and output size of the comprehensive analysis charts for
+long daily test histories, drawing every score with markers against the
+down-sampled score line, as PNG, SVG and HTML.
+
+Run from the src directory (history lengths can be overridden):
+    python benchmarks/bench_long_history_charts.py [1000,10000,100000]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+
+import progress_visualization_enhanced
+from bench_progress_report import history_rows
+from progress_visualization_enhanced import REPORT_CHART_CONFIG, ReportFigure
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+REPEATS = 3
+
+
+def daily_history(n_rows, rng):
+    df = history_rows(0, n_rows, rng)
+    df['date'] = pd.Timestamp('2000-01-01') + pd.to_timedelta(np.arange(n_rows), unit='D')
+    return df
+
+
+def render_seconds(df, path):
+    """Best of REPEATS renders with one reused figure, after a first render that lays it out."""
+    figure = ReportFigure()
+    figure.render(df, path)
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        figure.render(df, path)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(',')] if len(sys.argv) > 1 else DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+    max_points = REPORT_CHART_CONFIG['max_score_points']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'tests':>8} {'score line':<22} {'format':<6} {'render ms':>10} {'size KB':>9}")
+        for n_rows in sizes:
+            df = daily_history(n_rows, rng)
+            for label, points in (("every test, markers", None), (f"down-sampled to {max_points}", max_points)):
+                if points is None and n_rows <= max_points:
+                    continue
+                # ReportFigure reads the config on every draw
+                progress_visualization_enhanced.REPORT_CHART_CONFIG = dict(
+                    REPORT_CHART_CONFIG, max_score_points=points or n_rows
+                )
+                try:
+                    for output_format in ('png', 'svg', 'html'):
+                        path = os.path.join(tmp, f'report.{output_format}')
+                        seconds = render_seconds(df, path)
+                        print(f"{n_rows:>8,} {label:<22} {output_format:<6} {seconds * 1000:>10.0f} "
+                              f"{os.path.getsize(path) / 1024:>9.0f}")
+                finally:
+                    progress_visualization_enhanced.REPORT_CHART_CONFIG = REPORT_CHART_CONFIG
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# benchmarks/bench_material_index.py
+"""
+Recommendation query latency at catalog sizes of 12, 100k and 5M
+materials: the old boolean-mask + sample + to_dict path against
+MaterialIndex filtered queries and BM25-ranked queries.
+
+The 12-row catalog is data/study_materials_database.csv. Larger ones are
+synthetic, with names and tags drawn from a generated vocabulary.
+
+Run from the src directory (sizes can be overridden):
+    python benchmarks/bench_material_index.py [12,100000,5000000]
+"""
+import os
+import random
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import numpy as np
+import pandas as pd
+
+from material_index import MaterialIndex
+
+DEFAULT_SIZES = [12, 100_000, 5_000_000]
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+SUBJECTS = ['Math', 'Science', 'English']
+TYPES = ['Video', 'Book', 'Article', 'Quiz']
+VOCABULARY_SIZE = 5_000
+N_QUERIES = 200
+
+
+def synthetic_catalog(n_rows):
+    rng = np.random.default_rng(0)
+    # Zipf-distributed words so some terms are common and most are rare
+    words = np.array([f"w{i}" for i in range(VOCABULARY_SIZE)], dtype=object)
+    weights = 1 / np.arange(1, VOCABULARY_SIZE + 1)
+    weights /= weights.sum()
+
+    def phrases(n_phrases, n_words, sep):
+        picks = rng.choice(words, size=(n_phrases, n_words), p=weights)
+        return np.array([sep.join(row) for row in picks], dtype=object)
+
+    # Rows share phrase objects from bounded pools, as in a real catalog with repeats
+    names = phrases(min(n_rows, 200_000), 3, " ")
+    tags = phrases(min(n_rows, 200_000), 2, ", ")
+    return pd.DataFrame({
+        'level': np.array(LEVELS, dtype=object)[rng.integers(0, 3, n_rows)],
+        'subject': np.array(SUBJECTS, dtype=object)[rng.integers(0, 3, n_rows)],
+        'material_type': np.array(TYPES, dtype=object)[rng.integers(0, 4, n_rows)],
+        'resource_name': names[rng.integers(0, len(names), n_rows)],
+        'difficulty': 'Medium',
+        'link': 'https://example.com/material',
+        'tags': tags[rng.integers(0, len(tags), n_rows)],
+    })
+
+
+def mask_query(df, level, subject, k=3):
+    """The previous StudyMaterialRecommender.get_recommendations body."""
+    filtered = df[df['level'] == level]
+    if subject:
+        filtered = filtered[filtered['subject'] == subject]
+    if not filtered.empty:
+        if len(filtered) > k:
+            filtered = filtered.sample(n=k)
+        return filtered.to_dict('records')
+    return None
+
+
+def per_query_us(func, queries):
+    start = time.perf_counter()
+    for query in queries:
+        func(*query)
+    return (time.perf_counter() - start) * 1e6 / len(queries)
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_SIZES
+    rng = random.Random(0)
+    print(f"{'materials':>10} {'build s':>8} {'mask+sample':>12} {'index filter':>13} "
+          f"{'bm25 1 term':>12} {'bm25 3 terms':>13}   (us/query)")
+
+    for size in sizes:
+        if size == 12:
+            df = pd.read_csv(os.path.join(SRC_DIR, "data", "study_materials_database.csv"))
+        else:
+            df = synthetic_catalog(size)
+
+        start = time.perf_counter()
+        index = MaterialIndex(df)
+        build_seconds = time.perf_counter() - start
+
+        filters = [(rng.choice(LEVELS), rng.choice(SUBJECTS + [None])) for _ in range(N_QUERIES)]
+        terms = list(index.vocabulary)
+        # Mix of frequent and rare terms
+        single = [(rng.choice(terms[:50] + terms[-50:]), level, subject) for level, subject in filters]
+        multi = [(" ".join(rng.sample(terms[:200], min(3, len(terms[:200])))), level, subject)
+                 for level, subject in filters]
+
+        mask_us = per_query_us(lambda level, subject: mask_query(df, level, subject),
+                               filters[:max(N_QUERIES // 10, 1)] if size > 1_000_000 else filters)
+        filter_us = per_query_us(lambda level, subject: index.search(level=level, subject=subject), filters)
+        single_us = per_query_us(lambda q, level, subject: index.search(q, level=level, subject=subject), single)
+        multi_us = per_query_us(lambda q, level, subject: index.search(q, level=level, subject=subject), multi)
+        print(f"{size:>10,} {build_seconds:>8.2f} {mask_us:>12.1f} {filter_us:>13.1f} "
+              f"{single_us:>12.1f} {multi_us:>13.1f}")
+        del df, index
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# benchmarks/bench_model_artifact.py
+"""
+Model load time for the pickle-free artifact against the joblib pickles.
+
+Cold start runs in a fresh interpreter (imports included), which is what a
+new Streamlit worker pays. Per-rerun load is measured in-process and is
+what every script rerun paid before the loader was cached.
+
+Run from the src directory:
+    python benchmarks/bench_model_artifact.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import warnings
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from level_prediction import FEATURE_COLUMNS, BulkFeatureEncoder, predict_next_levels_bulk
+from model_artifact import load_model_artifact, read_model_artifact, save_model_artifact
+from model_training import EqualFeatureImportanceClassifier
+
+# The pickled model refers to the class through __main__
+sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier
+warnings.simplefilter("ignore")
+
+MODEL_PATH = os.path.join(SRC_DIR, "models", "student_performance_model.pkl")
+ENCODERS_PATH = os.path.join(SRC_DIR, "models", "label_encoders.pkl")
+N_LOADS = 200
+STARTUP_REPEATS = 5
+
+
+def per_call_ms(func, repeats=N_LOADS):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def startup_ms(code):
+    timings = []
+    for _ in range(STARTUP_REPEATS):
+        result = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c",
+             "import time\n_start = time.perf_counter()\n" + code +
+             "\nprint((time.perf_counter() - _start) * 1000)"],
+            cwd=SRC_DIR, capture_output=True, text=True, check=True
+        )
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return statistics.median(timings)
+
+
+def main():
+    model = joblib.load(MODEL_PATH)
+    encoders = joblib.load(ENCODERS_PATH)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        base_path = os.path.join(tmp, "student_performance_model")
+        save_model_artifact(model, encoders, base_path)
+        artifact = load_model_artifact(base_path)
+
+        # Verification on random feature rows around the training data
+        rng = np.random.default_rng(0)
+        X = np.column_stack([
+            rng.integers(5, 12, 100_000), rng.uniform(0, 100, 100_000),
+            rng.choice(encoders['knowledge_encoder'].classes_, 100_000),
+            rng.choice(encoders['learning_encoder'].classes_, 100_000),
+        ])
+        data = pd.DataFrame(X, columns=FEATURE_COLUMNS).astype({'Age': int, 'Last_Test_Score': float})
+        expected = predict_next_levels_bulk(model, encoders, data)
+        actual = predict_next_levels_bulk(artifact.model, artifact.encoders, data,
+                                          BulkFeatureEncoder(artifact.encoders))
+        print(f"predictions match on {len(data):,} rows: {bool((expected == actual).all())}")
+
+        print(f"\n{'per-rerun load (in-process)':<40} {'ms':>10}")
+        print(f"{'joblib.load model + encoders':<40} "
+              f"{per_call_ms(lambda: (joblib.load(MODEL_PATH), joblib.load(ENCODERS_PATH))):>10.3f}")
+        print(f"{'read_model_artifact (uncached)':<40} {per_call_ms(lambda: read_model_artifact(base_path)):>10.3f}")
+        print(f"{'load_model_artifact (cached)':<40} {per_call_ms(lambda: load_model_artifact(base_path)):>10.4f}")
+
+        print(f"\n{'cold start (fresh interpreter)':<40} {'ms':>10}")
+        joblib_startup = startup_ms(
+            "import sys, joblib\n"
+            "from model_training import EqualFeatureImportanceClassifier\n"
+            "sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier\n"
+            f"joblib.load({MODEL_PATH!r})\njoblib.load({ENCODERS_PATH!r})"
+        )
+        artifact_startup = startup_ms(
+            f"from model_artifact import load_model_artifact\nload_model_artifact({base_path!r})"
+        )
+        print(f"{'import sklearn + joblib.load':<40} {joblib_startup:>10.1f}")
+        print(f"{'import numpy + load_model_artifact':<40} {artifact_startup:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/bench_out_of_core_training.py
+"""
+Throughput and peak memory of train_out_of_core against loading the whole
+CSV into pandas, on a synthetic intel.csv-style file.
+
+The file is built by repeating data/intel.csv (with jittered scores) and
+each trainer runs in its own interpreter so peak RSS is measured separately.
+
+Run from the src directory:
+    python benchmarks/bench_out_of_core_training.py [rows]
+"""
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_ROWS = 5_000_000
+WRITE_CHUNK = 500_000
+
+IN_MEMORY = """
+import json, sys, time
+import pandas as pd
+from model_training import EqualFeatureImportanceClassifier, _encode_training_data, _peak_rss_mb
+start = time.perf_counter()
+X, y, encoders = _encode_training_data(pd.read_csv(sys.argv[1]))
+EqualFeatureImportanceClassifier(max_depth=5, class_weight='balanced', random_state=42).fit(X, y)
+seconds = time.perf_counter() - start
+print(json.dumps({'rows': len(y), 'seconds': seconds, 'peak_rss_mb': _peak_rss_mb()}))
+"""
+
+OUT_OF_CORE = """
+import contextlib, io, json, sys
+from model_training import train_out_of_core
+with contextlib.redirect_stdout(io.StringIO()):
+    model, encoders, report = train_out_of_core(sys.argv[1], output_dir=sys.argv[2])
+print(json.dumps({'rows': report['rows'], 'seconds': report['total_seconds'],
+                  'peak_rss_mb': report['peak_rss_mb']}))
+"""
+
+
+def write_dataset(path, rows):
+    base = pd.read_csv(os.path.join(SRC_DIR, "data", "intel.csv"))
+    rng = np.random.default_rng(0)
+    written = 0
+    while written < rows:
+        n = min(WRITE_CHUNK, rows - written)
+        chunk = base.sample(n, replace=True, random_state=written).reset_index(drop=True)
+        chunk['Student_ID'] = np.arange(written + 1, written + n + 1)
+        chunk['Last_Test_Score'] = np.clip(chunk['Last_Test_Score'] + rng.integers(-2, 3, n), 0, 100)
+        chunk.to_csv(path, mode='a', header=written == 0, index=False)
+        written += n
+
+
+def run(code, *args):
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code, *args],
+                            cwd=SRC_DIR, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "students.csv")
+        start = time.perf_counter()
+        write_dataset(csv_path, rows)
+        size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+        print(f"generated {rows:,} rows ({size_mb:.0f} MB) in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'trainer':<24} {'seconds':>10} {'rows/s':>12} {'peak RSS MB':>12}")
+        for name, code, args in (
+            ("pandas in memory", IN_MEMORY, (csv_path,)),
+            ("train_out_of_core", OUT_OF_CORE, (csv_path, tmp)),
+        ):
+            result = run(code, *args)
+            print(f"{name:<24} {result['seconds']:>10.1f} "
+                  f"{result['rows'] / result['seconds']:>12,.0f} {result['peak_rss_mb']:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
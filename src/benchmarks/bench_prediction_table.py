@@ -0,0 +1,115 @@
+# benchmarks/bench_prediction_table.py
+"""
+Single-student prediction latency with and without the precomputed lookup
+tables, for the next-level model (streamlit_app.predict_next_level) and for
+StudentLevelPredictor. Before timing, checks that every table entry agrees
+with the model.
+
+Run from the src directory:
+    python benchmarks/bench_prediction_table.py
+"""
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from level_prediction import build_next_level_table, predict_next_levels_bulk
+from ml_model_integration import LOOKUP_AXES, StudentLevelPredictor
+from model_training import EqualFeatureImportanceClassifier
+from streamlit_app import predict_next_level
+
+# The pickled model refers to the class through __main__
+sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier
+warnings.simplefilter("ignore")
+
+MODEL_PATH = os.path.join(SRC_DIR, "models", "student_performance_model.pkl")
+ENCODERS_PATH = os.path.join(SRC_DIR, "models", "label_encoders.pkl")
+N_CALLS = 2_000
+N_PREDICTOR_CHECKS = 500_000
+
+
+def per_call_us(func, rows):
+    start = time.perf_counter()
+    for row in rows:
+        func(row)
+    return (time.perf_counter() - start) * 1e6 / len(rows)
+
+
+def grid_rows(table):
+    """Every grid point of a table as a DataFrame, in table order."""
+    values = [np.arange(axis[0], axis[1] + 1) if isinstance(axis[0], int) else np.array(axis, dtype=object)
+              for axis in table.axes]
+    index = np.unravel_index(np.arange(table.table.size), table.table.shape)
+    return pd.DataFrame({column: axis_values[i] for column, axis_values, i in zip(table.columns, values, index)})
+
+
+def next_level_section(rng):
+    model = joblib.load(MODEL_PATH)
+    encoders = joblib.load(ENCODERS_PATH)
+
+    start = time.perf_counter()
+    table = build_next_level_table(model, encoders)
+    print(f"next-level table: {table.table.size:,} entries, {table.table.nbytes / 1024:.0f} KB, "
+          f"built in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    grid = grid_rows(table)
+    expected = predict_next_levels_bulk(model, encoders, grid)
+    looked_up = [table.lookup(*row) for row in grid.itertuples(index=False)]
+    print(f"  every entry matches model.predict: {bool((np.asarray(looked_up) == expected).all())}")
+
+    sample = grid.iloc[rng.choice(len(grid), N_CALLS, replace=False)].to_dict("records")
+    single = [predict_next_level(model, encoders, row) for row in sample]
+    print(f"  per-row predict_next_level matches table on {N_CALLS:,} inputs: "
+          f"{single == [predict_next_level(model, encoders, row, table) for row in sample]}")
+
+    model_us = per_call_us(lambda row: predict_next_level(model, encoders, row), sample)
+    table_us = per_call_us(lambda row: predict_next_level(model, encoders, row, table), sample)
+    print(f"\n  {'predict_next_level':<36} {'us/call':>10}")
+    print(f"  {'model':<36} {model_us:>10.1f}")
+    print(f"  {'lookup table':<36} {table_us:>10.2f}")
+
+
+def level_predictor_section(rng):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        predictor = StudentLevelPredictor(cache_dir=cache_dir)
+        start = time.perf_counter()
+        table = predictor.precompute_lookup_table()
+        build_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        StudentLevelPredictor(cache_dir=cache_dir, precompute=True)
+        load_ms = (time.perf_counter() - start) * 1000
+        model_only = StudentLevelPredictor(cache_dir=cache_dir)
+    print(f"\nStudentLevelPredictor table: {table.table.size:,} entries, {table.table.nbytes / 1e6:.1f} MB, "
+          f"built in {build_seconds:.1f} s, reloaded in {load_ms:.0f} ms")
+
+    # Random grid points, checked against the model in one batch
+    rows = np.column_stack([rng.integers(low, high + 1, N_PREDICTOR_CHECKS) for low, high in LOOKUP_AXES])
+    expected = predictor.predict_student_levels(rows)
+    looked_up = np.asarray([table.lookup(*row) for row in rows.tolist()])
+    print(f"  table matches model on {N_PREDICTOR_CHECKS:,} random grid points: "
+          f"{bool((looked_up == expected).all())}")
+
+    sample = rows[:N_CALLS].tolist()
+    model_us = per_call_us(lambda row: model_only.predict_student_level(*row), sample)
+    table_us = per_call_us(lambda row: predictor.predict_student_level(*row), sample)
+    print(f"\n  {'predict_student_level':<36} {'us/call':>10}")
+    print(f"  {'model':<36} {model_us:>10.1f}")
+    print(f"  {'lookup table':<36} {table_us:>10.2f}")
+
+
+def main():
+    rng = np.random.default_rng(0)
+    next_level_section(rng)
+    level_predictor_section(rng)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# benchmarks/bench_progress_report.py
+"""
+Run time of the progress report for histories of 10, 100k and 10M rows:
+the statistics part of comprehensive_progress_analysis (read the whole
+CSV, parse dates, polyfit, mean, correlation; charts not included)
+against EnhancedProgressVisualizer.progress_report on a cold start and
+after appending 1 and 1,000 rows.
+
+Run from the src directory (sizes can be overridden):
+    python benchmarks/bench_progress_report.py [10,100000,10000000]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from progress_visualization_enhanced import EnhancedProgressVisualizer
+from storage_backends import get_storage_backend
+
+DEFAULT_SIZES = [10, 100_000, 10_000_000]
+CHUNK_ROWS = 1_000_000
+LEVELS = np.array(['Beginner', 'Intermediate', 'Advanced'], dtype=object)
+SUBJECTS = np.array(['Math', 'Math, Science', 'English, Science', 'English'], dtype=object)
+
+
+def history_rows(first, count, rng):
+    return pd.DataFrame({
+        'date': (pd.Timestamp('2000-01-01') + pd.to_timedelta(np.arange(first, first + count), unit='min')).astype(str),
+        'test_score': rng.uniform(30, 100, count).round(1),
+        'predicted_level': LEVELS[rng.integers(0, len(LEVELS), count)],
+        'subjects_tested': SUBJECTS[rng.integers(0, len(SUBJECTS), count)],
+        'time_spent_studying': rng.uniform(0, 6, count).round(2),
+    })
+
+
+def write_history(path, n_rows, rng):
+    for first in range(0, n_rows, CHUNK_ROWS):
+        history_rows(first, min(CHUNK_ROWS, n_rows - first), rng).to_csv(
+            path, index=False, mode='w' if first == 0 else 'a', header=first == 0
+        )
+
+
+def full_report(visualizer):
+    """comprehensive_progress_analysis without the charts."""
+    df = get_storage_backend().get_progress_history(visualizer.student_id)
+    df['date'] = pd.to_datetime(df['date'])
+    np.polyfit(range(len(df)), df['test_score'], 1)
+    return {
+        'total_tests': len(df),
+        'average_score': df['test_score'].mean(),
+        'score_improvement': visualizer.calculate_score_improvement(df),
+        'study_time_correlation': visualizer.calculate_study_time_correlation(df)
+    }
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - start) * 1000, result
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_SIZES
+    rng = np.random.default_rng(0)
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CSV backend reads student_progress_<id>.csv from the working directory
+        os.chdir(tmp)
+        try:
+            print(f"{'rows':>11} {'full':>10} {'incr. cold':>11} {'+1 row':>9} {'+1k rows':>9}   (ms)")
+            for size in sizes:
+                visualizer = EnhancedProgressVisualizer(f"ST{size}")
+                write_history(visualizer.progress_file, size, rng)
+
+                full_ms, expected = timed(lambda: full_report(visualizer))
+                cold_ms, report = timed(visualizer.progress_report)
+                assert np.allclose(list(expected.values()), list(report.values()))
+
+                appended = []
+                for count in (1, 1_000):
+                    history_rows(size, count, rng).to_csv(visualizer.progress_file, index=False, mode='a', header=False)
+                    size += count
+                    elapsed, report = timed(visualizer.progress_report)
+                    assert report['total_tests'] == size
+                    appended.append(elapsed)
+                print(f"{size - 1_001:>11,} {full_ms:>10.1f} {cold_ms:>11.1f} {appended[0]:>9.2f} {appended[1]:>9.2f}")
+                os.remove(visualizer.progress_file)
+        finally:
+            os.chdir(previous_dir)
+
+
+if __name__ == "__main__":
+    main()
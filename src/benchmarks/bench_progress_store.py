@@ -0,0 +1,80 @@
+# benchmarks/bench_progress_store.py
+"""
+Progress lookups through ProgressStore against the old per-call
+pd.read_csv + boolean mask, on a 1,000,000-row progress file.
+
+Run from the src directory:
+    python benchmarks/bench_progress_store.py
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from Student_Progress_Tracking_System import ProgressStore
+
+N_ROWS = 1_000_000
+SUBJECTS = ['Mathematics', 'Science', 'English', 'History', 'Geography']
+N_LOOKUPS = 100_000
+N_LEGACY_LOOKUPS = 3
+
+
+def write_progress_file(path, n_rows):
+    rng = np.random.default_rng(0)
+    n_students = n_rows // len(SUBJECTS)
+    pd.DataFrame({
+        "student_id": np.repeat([f"ST{i:07d}" for i in range(n_students)], len(SUBJECTS)),
+        "subject": SUBJECTS * n_students,
+        "completion_rate": rng.random(n_rows).round(2),
+        "average_score": rng.uniform(0, 100, n_rows).round(1),
+        "completed_materials": "https://example.com/a|https://example.com/b"
+    }).to_csv(path, index=False)
+    return n_students
+
+
+def legacy_lookup(path, student_id, subject):
+    progress_df = pd.read_csv(path)
+    student_progress = progress_df[
+        (progress_df["student_id"] == student_id) &
+        (progress_df["subject"] == subject)
+    ]
+    return student_progress["average_score"].values[0]
+
+
+def main():
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "student_progress.csv")
+        n_students = write_progress_file(path, N_ROWS)
+        queries = [(f"ST{rng.randrange(n_students):07d}", rng.choice(SUBJECTS)) for _ in range(N_LOOKUPS)]
+
+        start = time.perf_counter()
+        for student_id, subject in queries[:N_LEGACY_LOOKUPS]:
+            legacy_lookup(path, student_id, subject)
+        legacy_ms = (time.perf_counter() - start) * 1000 / N_LEGACY_LOOKUPS
+
+        store = ProgressStore(path)
+        start = time.perf_counter()
+        store.refresh()
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        for student_id, subject in queries:
+            store.get(student_id, subject)
+        store_us = (time.perf_counter() - start) * 1e6 / N_LOOKUPS
+
+        print(f"{N_ROWS:,} progress rows")
+        print(f"legacy read_csv + mask per lookup: {legacy_ms:10.1f} ms")
+        print(f"ProgressStore initial load:        {load_ms:10.1f} ms")
+        print(f"ProgressStore lookup (incl. stat): {store_us:10.2f} us")
+        print(f"speedup per lookup:                {legacy_ms * 1000 / store_us:10,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+# benchmarks/bench_progress_updates.py
+"""
+Events per second for update_progress through ProgressEventLog, against
+the old read-modify-rewrite of the whole CSV, plus several processes
+writing to one log at once.
+
+Run from the src directory:
+    python benchmarks/bench_progress_updates.py
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd
+
+from Student_Progress_Tracking_System import PROGRESS_COLUMNS, ProgressEventLog, ProgressStore
+
+SNAPSHOT_ROWS = 10_000
+LEGACY_EVENTS = 50
+EVENTS = 20_000
+PROCESSES = 4
+EVENTS_PER_PROCESS = 5_000
+
+
+def event(i, worker=0):
+    return {
+        "student_id": f"ST{(i * 7919 + worker) % SNAPSHOT_ROWS:05d}",
+        "subject": "Mathematics",
+        "score": i % 100,
+        "completed_material": f"https://example.com/{worker}/{i % 10}"
+    }
+
+
+def write_snapshot(path):
+    pd.DataFrame({
+        "student_id": [f"ST{i:05d}" for i in range(SNAPSHOT_ROWS)],
+        "subject": "Mathematics",
+        "completion_rate": 0.1,
+        "average_score": 50.0,
+        "completed_materials": "https://example.com/start"
+    }, columns=PROGRESS_COLUMNS).to_csv(path, index=False)
+
+
+def legacy_update(path, e):
+    """The old update_progress, with pd.concat standing in for the removed DataFrame.append."""
+    progress_df = pd.read_csv(path)
+    mask = (progress_df["student_id"] == e["student_id"]) & (progress_df["subject"] == e["subject"])
+    if mask.any():
+        idx = mask.idxmax()
+        progress_df.at[idx, "average_score"] = e["score"]
+        completed = set(progress_df.at[idx, "completed_materials"].split("|"))
+        completed.add(e["completed_material"])
+        progress_df.at[idx, "completed_materials"] = "|".join(completed)
+        progress_df.at[idx, "completion_rate"] = len(completed) / 10.0
+    else:
+        progress_df = pd.concat([progress_df, pd.DataFrame([e])], ignore_index=True)
+    progress_df.to_csv(path, index=False)
+
+
+def write_events(path, worker, n_events, flush_every):
+    log = ProgressEventLog(path, flush_every=flush_every, compact_every=0)
+    for i in range(n_events):
+        log.append(event(i, worker))
+    log.flush()
+    return n_events
+
+
+def rate(n_events, func):
+    start = time.perf_counter()
+    func()
+    return n_events / (time.perf_counter() - start)
+
+
+def main():
+    print(f"snapshot of {SNAPSHOT_ROWS:,} rows")
+    print(f"{'writer':<40} {'events/s':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "student_progress.csv")
+
+        write_snapshot(path)
+        legacy_rate = rate(LEGACY_EVENTS, lambda: [legacy_update(path, event(i)) for i in range(LEGACY_EVENTS)])
+        print(f"{'legacy rewrite per event':<40} {legacy_rate:>12,.0f}")
+
+        for flush_every in (1, 64, 512):
+            write_snapshot(path)
+            if os.path.exists(f"{path}.log"):
+                os.remove(f"{path}.log")
+            event_rate = rate(EVENTS, lambda: write_events(path, 0, EVENTS, flush_every))
+            print(f"{f'event log, flush every {flush_every}':<40} {event_rate:>12,.0f}")
+
+        log = ProgressEventLog(path, compact_every=0)
+        start = time.perf_counter()
+        log.compact()
+        print(f"compaction of {EVENTS:,} events into snapshot: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        write_snapshot(path)
+        with ProcessPoolExecutor(max_workers=PROCESSES) as executor:
+            start = time.perf_counter()
+            written = sum(executor.map(
+                write_events, [path] * PROCESSES, range(PROCESSES),
+                [EVENTS_PER_PROCESS] * PROCESSES, [64] * PROCESSES
+            ))
+            elapsed = time.perf_counter() - start
+        with open(f"{path}.log", "rb") as log_file:
+            logged = sum(1 for _ in log_file)
+        print(f"{f'{PROCESSES} processes, flush every 64':<40} {written / elapsed:>12,.0f}"
+              f"  ({logged:,}/{written:,} events in log)")
+
+        sample = event(EVENTS_PER_PROCESS - 1, PROCESSES - 1)
+        progress = ProgressStore(path).get(sample["student_id"], sample["subject"])
+        print(f"store after concurrent writes, {sample['student_id']}: {progress}")
+
+
+if __name__ == "__main__":
+    main()
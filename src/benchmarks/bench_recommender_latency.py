@@ -0,0 +1,48 @@
+# benchmarks/bench_recommender_latency.py
+"""
+Latency of recommend_materials on a cold process-wide recommender (first
+call builds it) versus warm calls, compared with building a fresh
+StudyMaterialRecommender per request as main1.py used to do.
+
+Run from the src directory:
+    python benchmarks/bench_recommender_latency.py
+"""
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from recommendation_engine import StudyMaterialRecommender, get_recommender
+
+N_CALLS = 2_000
+SUBJECTS = ['Mathematics', 'Science', 'English']
+SPEEDS = ['slow', 'medium', 'fast']
+
+
+def request(i, recommender_factory):
+    start = time.perf_counter()
+    recommender = recommender_factory()
+    recommender.recommend_materials(
+        subject=SUBJECTS[i % len(SUBJECTS)],
+        learning_speed=SPEEDS[(i // len(SUBJECTS)) % len(SPEEDS)]
+    )
+    return (time.perf_counter() - start) * 1e6
+
+
+def report(name, timings):
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1] if len(timings) > 1 else timings[0]
+    print(f"{name:<32} {statistics.median(timings):>12.1f} {p99:>12.1f}")
+
+
+def main():
+    print(f"{'scenario':<32} {'median (us)':>12} {'p99 (us)':>12}")
+    report("cold get_recommender()", [request(0, get_recommender)])
+    report("warm get_recommender()", [request(i, get_recommender) for i in range(N_CALLS)])
+    report("new recommender per request", [request(i, StudyMaterialRecommender) for i in range(N_CALLS)])
+
+
+if __name__ == "__main__":
+    main()
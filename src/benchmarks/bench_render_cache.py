@@ -0,0 +1,63 @@
+# benchmarks/bench_render_cache.py
+"""
+render_reports over the same students three times: a cold run that
+draws every chart into the render cache, a warm run where no history
+changed, and a run after one test was appended to a tenth of the
+histories.
+
+Histories are synthetic student_progress_<id>.csv files in a temporary
+directory.
+
+Run from the src directory (the student count can be overridden):
+    python benchmarks/bench_render_cache.py [200]
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+from bench_progress_report import history_rows
+from progress_visualization_enhanced import get_render_cache, render_reports
+
+DEFAULT_STUDENTS = 200
+TESTS_PER_STUDENT = (10, 120)
+
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    rng = np.random.default_rng(0)
+    student_ids = [f"ST{i:05d}" for i in range(n_students)]
+    lengths = {student_id: int(rng.integers(*TESTS_PER_STUDENT)) for student_id in student_ids}
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CSV backend reads student_progress_<id>.csv from the working directory
+        os.chdir(tmp)
+        try:
+            for student_id in student_ids:
+                history_rows(0, lengths[student_id], rng).to_csv(f"student_progress_{student_id}.csv", index=False)
+
+            print(f"{n_students} students, 1 process")
+            print(f"{'run':<22} {'seconds':>9} {'reports/s':>10} {'hits':>6} {'misses':>7}")
+            for run in ("cold", "warm", "10% changed"):
+                if run == "10% changed":
+                    for student_id in student_ids[::10]:
+                        history_rows(lengths[student_id], 1, rng).to_csv(
+                            f"student_progress_{student_id}.csv", mode='a', header=False, index=False
+                        )
+                summary = render_reports(student_ids, workers=1)
+                assert not summary['failed']
+                print(f"{run:<22} {summary['total_seconds']:>9.2f} {summary['reports_per_second']:>10.1f} "
+                      f"{summary['cache_hits']:>6} {summary['cache_misses']:>7}")
+            print(f"cache: {get_render_cache().stats()}")
+        finally:
+            os.chdir(previous_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# benchmarks/bench_render_reports.py
+"""
+Throughput of rendering comprehensive_analysis_<id>.png for many
+students: the previous pyplot code run serially against render_reports
+with one process and with a process pool.
+
+Histories are synthetic student_progress_<id>.csv files in a temporary
+directory.
+
+Run from the src directory (students and workers can be overridden):
+    python benchmarks/bench_render_reports.py [200] [4]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from bench_progress_report import history_rows
+from progress_visualization_enhanced import render_reports
+from storage_backends import get_storage_backend
+
+DEFAULT_STUDENTS = 200
+TESTS_PER_STUDENT = (10, 120)
+
+
+def pyplot_report(student_id):
+    """The previous comprehensive_progress_analysis charts, drawn through pyplot."""
+    df = get_storage_backend().get_progress_history(student_id)
+    df['date'] = pd.to_datetime(df['date'])
+    plt.figure(figsize=(15, 10))
+    plt.subplot(2, 2, 1)
+    plt.plot(df['date'], df['test_score'], marker='o')
+    plt.title('Test Score Progression')
+    plt.xlabel('Date')
+    plt.ylabel('Test Score')
+    plt.xticks(rotation=45)
+    z = np.polyfit(range(len(df)), df['test_score'], 1)
+    plt.plot(df['date'], np.poly1d(z)(range(len(df))), "r--", label='Trend Line')
+    plt.subplot(2, 2, 2)
+    subject_counts = df['subjects_tested'].str.split(', ', expand=True).stack().value_counts()
+    plt.pie(subject_counts, labels=subject_counts.index, autopct='%1.1f%%')
+    plt.title('Subjects Tested Distribution')
+    plt.subplot(2, 2, 3)
+    plt.scatter(df['time_spent_studying'], df['test_score'])
+    plt.title('Study Time vs Test Score')
+    plt.xlabel('Time Spent Studying (Hours)')
+    plt.ylabel('Test Score')
+    plt.subplot(2, 2, 4)
+    df['predicted_level'].value_counts().plot(kind='bar')
+    plt.title('Learning Level Progression')
+    plt.xlabel('Learning Level')
+    plt.ylabel('Number of Tests')
+    plt.tight_layout()
+    plt.savefig(f'progress_visualizations/comprehensive_analysis_{student_id}.png')
+    plt.close()
+
+
+def report(name, seconds, total_seconds):
+    seconds = np.array(seconds) * 1000
+    print(f"{name:<28} {len(seconds) / total_seconds:>10.2f} {np.median(seconds):>11.0f} "
+          f"{np.percentile(seconds, 95):>9.0f}")
+
+
+def main():
+    n_students = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_STUDENTS
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    rng = np.random.default_rng(0)
+    student_ids = [f"ST{i:05d}" for i in range(n_students)]
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CSV backend reads student_progress_<id>.csv from the working directory
+        os.chdir(tmp)
+        try:
+            for student_id in student_ids:
+                history_rows(0, int(rng.integers(*TESTS_PER_STUDENT)), rng).to_csv(
+                    f"student_progress_{student_id}.csv", index=False
+                )
+            os.makedirs('progress_visualizations', exist_ok=True)
+
+            print(f"{n_students} students")
+            print(f"{'method':<28} {'reports/s':>10} {'median ms':>11} {'p95 ms':>9}")
+            seconds = []
+            start = time.perf_counter()
+            for student_id in student_ids:
+                student_start = time.perf_counter()
+                pyplot_report(student_id)
+                seconds.append(time.perf_counter() - student_start)
+            report("pyplot, serial", seconds, time.perf_counter() - start)
+
+            for run_workers in sorted({1, workers}):
+                # force, so every run draws instead of reusing the render cache
+                summary = render_reports(student_ids, workers=run_workers, force=True)
+                assert not summary['failed']
+                report(f"render_reports, {run_workers} process{'es' if run_workers > 1 else ''}",
+                       list(summary['render_seconds'].values()), summary['total_seconds'])
+        finally:
+            os.chdir(previous_dir)
+
+
+if __name__ == "__main__":
+    main()
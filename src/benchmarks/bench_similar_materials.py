@@ -0,0 +1,89 @@
+# benchmarks/bench_similar_materials.py
+"""
+Recall@k and query latency of the IVF similar-materials index, at a few
+probe counts, against brute-force cosine similarity over the same hashed
+TF-IDF vectors, plus build time and load time of the persisted index.
+
+The corpus is synthetic: each material's title and description mix words
+from one topic vocabulary with words from a shared background vocabulary.
+
+Run from the src directory (corpus size can be overridden):
+    python benchmarks/bench_similar_materials.py [100000]
+"""
+import os
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import numpy as np
+
+from similar_materials import SimilarMaterialsIndex
+
+DEFAULT_MATERIALS = 100_000
+N_TOPICS = 500
+TOPIC_WORDS = 30
+BACKGROUND_WORDS = 5_000
+WORDS_PER_MATERIAL = 20
+TOPIC_SHARE = 0.6
+N_QUERIES = 500
+K = 10
+PROBES = [2, 4, 8, 16]
+
+
+def synthetic_documents(n_materials, rng):
+    topics = rng.integers(0, N_TOPICS, n_materials)
+    on_topic = rng.random((n_materials, WORDS_PER_MATERIAL)) < TOPIC_SHARE
+    topic_words = topics[:, None] * TOPIC_WORDS + rng.integers(0, TOPIC_WORDS, (n_materials, WORDS_PER_MATERIAL))
+    background = rng.integers(0, BACKGROUND_WORDS, (n_materials, WORDS_PER_MATERIAL))
+    documents = []
+    for material in range(n_materials):
+        words = [f"t{word}" if topic else f"b{other}"
+                 for topic, word, other in zip(on_topic[material], topic_words[material], background[material])]
+        url = f"https://example.com/material/{material}"
+        documents.append((url, " ".join(words[:4]), " ".join(words)))
+    return documents
+
+
+def main():
+    n_materials = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_MATERIALS
+    rng = np.random.default_rng(0)
+    documents = synthetic_documents(n_materials, rng)
+
+    start = time.perf_counter()
+    index = SimilarMaterialsIndex.build(documents)
+    build_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "similar_materials.npz")
+        index.save(path)
+        start = time.perf_counter()
+        SimilarMaterialsIndex.load(path)
+        load_seconds = time.perf_counter() - start
+        size_mb = os.path.getsize(path) / 1e6
+    print(f"{n_materials:,} materials: built in {build_seconds:.1f}s, "
+          f"loaded in {load_seconds * 1000:.0f} ms ({size_mb:.1f} MB on disk)")
+
+    queries = [documents[position][0] for position in rng.choice(n_materials, N_QUERIES, replace=False)]
+    start = time.perf_counter()
+    exact = [index.exact_similar_to(url, K) for url in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    print(f"\n{len(index.centroids)} lists")
+    print(f"{'method':<14} {'ms/query':>9} {f'recall@{K}':>10} {'scanned':>9}")
+    print(f"{'brute force':<14} {exact_ms:>9.2f} {1.0:>10.3f} {n_materials:>9,}")
+    for n_probe in PROBES:
+        start = time.perf_counter()
+        approximate = [index.similar_to(url, K, n_probe=n_probe) for url in queries]
+        ivf_ms = (time.perf_counter() - start) * 1000 / len(queries)
+        recall = np.mean([
+            len({url for url, _ in found} & {url for url, _ in truth}) / max(len(truth), 1)
+            for found, truth in zip(approximate, exact)
+        ])
+        scanned = np.mean([len(index.candidates(index.positions[url], n_probe)) for url in queries])
+        print(f"{f'ivf probe {n_probe}':<14} {ivf_ms:>9.2f} {recall:>10.3f} {scanned:>9,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# benchmarks/bench_standalone_recommendations.py
+"""
+Calls/sec of the standalone get_recommendations / print_recommendations
+functions with the shared catalog, against building a new
+StudyMaterialRecommender per call as they used to. Runs on the 12-row
+catalog from data/ and on a 100k-row catalog made by repeating it.
+
+Run from the src directory:
+    python benchmarks/bench_standalone_recommendations.py
+"""
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+import pandas as pd
+
+import study_material_recommender
+from study_material_recommender import StudyMaterialRecommender
+
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+SUBJECTS = [None, 'Math', 'Science', 'English']
+SIZES = [12, 100_000]
+MIN_SECONDS = 1.0
+
+
+def calls_per_second(func):
+    calls = [(level, subject) for level in LEVELS for subject in SUBJECTS]
+    done = 0
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        while time.perf_counter() - start < MIN_SECONDS:
+            for level, subject in calls:
+                func(level, subject)
+            done += len(calls)
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    base = pd.read_csv(os.path.join(SRC_DIR, "data", "study_materials_database.csv"))
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CSV backend reads study_materials_database.csv from the working directory
+        os.chdir(tmp)
+        try:
+            print(f"{'materials':>10} {'function':<24} {'new recommender':>16} {'shared catalog':>16}   (calls/s)")
+            for size in SIZES:
+                catalog = pd.concat([base] * (size // len(base) + 1), ignore_index=True).iloc[:size]
+                catalog.to_csv("study_materials_database.csv", index=False)
+                study_material_recommender.reload_catalog()
+
+                for name in ("get_recommendations", "print_recommendations"):
+                    before = calls_per_second(
+                        lambda level, subject: getattr(StudyMaterialRecommender(), name)(level, subject)
+                    )
+                    after = calls_per_second(getattr(study_material_recommender, name))
+                    print(f"{size:>10,} {name:<24} {before:>16,.0f} {after:>16,.0f}")
+        finally:
+            os.chdir(previous_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_startup.py
+"""
+Import and construction time of the content generators and the
+recommendation engine, each measured in a fresh interpreter.
+
+The "eager" rows reproduce the old startup path, which imported NLTK
+and looked up (or downloaded) punkt before any request was served.
+
+Run from the src directory:
+    python benchmarks/bench_startup.py
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPEATS = 5
+
+EAGER_NLTK = """
+import nltk
+try:
+    nltk.data.find('tokenizers/punkt')
+except LookupError:
+    pass
+"""
+
+SCENARIOS = [
+    ("import adaptive_content_generator", "import adaptive_content_generator"),
+    ("import Adaptive_Learning_Content_Generator", "import Adaptive_Learning_Content_Generator"),
+    ("AdaptiveLearningContentGenerator()",
+     "from Adaptive_Learning_Content_Generator import AdaptiveLearningContentGenerator\n"
+     "AdaptiveLearningContentGenerator()"),
+    ("StudyMaterialRecommender()",
+     "from recommendation_engine import StudyMaterialRecommender\n"
+     "StudyMaterialRecommender()"),
+    ("eager: StudyMaterialRecommender()",
+     EAGER_NLTK +
+     "from recommendation_engine import StudyMaterialRecommender\n"
+     "StudyMaterialRecommender()"),
+]
+
+
+def time_snippet(code):
+    """Run code in a fresh interpreter and return its wall time in ms."""
+    timed = (
+        "import time\n"
+        "_start = time.perf_counter()\n"
+        + code +
+        "\nprint((time.perf_counter() - _start) * 1000)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", timed],
+        cwd=SRC_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'scenario':<45} {'median (ms)':>12} {'min (ms)':>10}")
+    for name, code in SCENARIOS:
+        timings = [time_snippet(code) for _ in range(REPEATS)]
+        print(f"{name:<45} {statistics.median(timings):>12.1f} {min(timings):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# benchmarks/bench_storage_backends.py
+"""
+Progress lookup and update latency for the CSV and SQLite storage
+backends at 10k, 1M and 10M progress rows.
+
+Run from the src directory (row counts can be overridden):
+    python benchmarks/bench_storage_backends.py [10000,1000000,10000000]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from storage_backends import CSVStorageBackend, import_csv_data
+
+DEFAULT_SIZES = [10_000, 1_000_000, 10_000_000]
+SUBJECTS = ['Mathematics', 'Science', 'English', 'History', 'Geography']
+N_LOOKUPS = 20_000
+N_UPDATES = 2_000
+
+
+def write_progress_file(path, n_rows):
+    rng = np.random.default_rng(0)
+    n_students = n_rows // len(SUBJECTS)
+    chunk_students = 200_000
+    for first in range(0, n_students, chunk_students):
+        count = min(chunk_students, n_students - first)
+        rows = count * len(SUBJECTS)
+        pd.DataFrame({
+            "student_id": np.repeat([f"ST{i:08d}" for i in range(first, first + count)], len(SUBJECTS)),
+            "subject": SUBJECTS * count,
+            "completion_rate": rng.random(rows).round(2),
+            "average_score": rng.uniform(0, 100, rows).round(1),
+            "completed_materials": "https://example.com/a|https://example.com/b"
+        }).to_csv(path, index=False, mode="w" if first == 0 else "a", header=first == 0)
+    return n_students
+
+
+def per_call_us(func, calls):
+    start = time.perf_counter()
+    for args in calls:
+        func(*args)
+    return (time.perf_counter() - start) * 1e6 / len(calls)
+
+
+def seconds(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main():
+    sizes = [int(size) for size in sys.argv[1].split(",")] if len(sys.argv) > 1 else DEFAULT_SIZES
+    rng = random.Random(0)
+    print(f"{'rows':>11} {'backend':<8} {'load/import (s)':>16} {'lookup (us)':>12} {'update (us)':>12}")
+    for n_rows in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            progress_path = os.path.join(tmp, "student_progress.csv")
+            n_students = write_progress_file(progress_path, n_rows)
+            lookups = [(f"ST{rng.randrange(n_students):08d}", rng.choice(SUBJECTS)) for _ in range(N_LOOKUPS)]
+            updates = [(student_id, subject, 75.0, "https://example.com/new")
+                       for student_id, subject in lookups[:N_UPDATES]]
+
+            csv_backend = CSVStorageBackend(
+                progress_path,
+                materials_path=os.path.join(tmp, "missing.csv"),
+                history_pattern=os.path.join(tmp, "student_progress_{student_id}.csv")
+            )
+            _, load_s = seconds(csv_backend.progress_store.refresh)
+            lookup_us = per_call_us(csv_backend.get_progress, lookups)
+            update_us = per_call_us(csv_backend.update_progress, updates)
+            csv_backend.flush()
+            print(f"{n_rows:>11,} {'csv':<8} {load_s:>16.2f} {lookup_us:>12.2f} {update_us:>12.2f}")
+
+            sqlite_backend, import_s = seconds(lambda: import_csv_data(
+                os.path.join(tmp, "tutor.db"),
+                progress_path=progress_path,
+                materials_path=os.path.join(tmp, "missing.csv"),
+                history_pattern=os.path.join(tmp, "student_progress_{student_id}.csv")
+            ))
+            lookup_us = per_call_us(sqlite_backend.get_progress, lookups)
+            update_us = per_call_us(sqlite_backend.update_progress, updates)
+            sqlite_backend.close()
+            print(f"{n_rows:>11,} {'sqlite':<8} {import_s:>16.2f} {lookup_us:>12.2f} {update_us:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+# benchmarks/bench_subject_masks.py
+"""
+Subject counts and subject filters over a long test history: the
+subjects_tested string path used by the pie chart (split, stack,
+value_counts; str.contains for filters) against multi-hot masks from
+subject_masks, in memory and read back from the CSV backend's persisted
+masks.
+
+Run from the src directory (the history length can be overridden):
+    python benchmarks/bench_subject_masks.py [10000000]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+import pandas as pd
+
+from bench_progress_report import write_history
+from storage_backends import CSVStorageBackend
+from subject_masks import encode_subjects, subject_counts, subjects_filter
+
+DEFAULT_ROWS = 10_000_000
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def string_counts(subjects):
+    return subjects.str.split(', ', expand=True).stack().value_counts()
+
+
+def main():
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_ROWS
+    rng = np.random.default_rng(0)
+
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # The CSV backend reads student_progress_<id>.csv from the working directory
+        os.chdir(tmp)
+        try:
+            write_history("student_progress_BENCH.csv", n_rows, rng)
+            subjects = pd.read_csv("student_progress_BENCH.csv", usecols=["subjects_tested"])["subjects_tested"]
+            print(f"{n_rows:,} rows")
+
+            (masks, vocabulary), encode_seconds = timed(lambda: encode_subjects(subjects))
+            print(f"  encode once: {encode_seconds:.2f}s; column size "
+                  f"{subjects.memory_usage(deep=True) / 1e6:,.0f} MB as strings, "
+                  f"{masks.nbytes / 1e6:,.0f} MB as {masks.dtype} masks")
+
+            print(f"  {'operation':<30} {'strings s':>10} {'masks s':>10} {'speedup':>8}")
+            runs = [
+                ("subject counts", lambda: string_counts(subjects), lambda: subject_counts(masks, vocabulary)),
+                ("rows with Science", lambda: subjects.str.contains('Science', regex=False),
+                 lambda: subjects_filter(masks, vocabulary, ['Science'])),
+                ("rows with Math and Science",
+                 lambda: subjects.str.contains('Math', regex=False) & subjects.str.contains('Science', regex=False),
+                 lambda: subjects_filter(masks, vocabulary, ['Math', 'Science'], require_all=True)),
+            ]
+            for name, with_strings, with_masks in runs:
+                expected, string_seconds = timed(with_strings)
+                result, mask_seconds = timed(with_masks)
+                if name == "subject counts":
+                    assert expected.to_dict() == result.to_dict()
+                else:
+                    assert (np.asarray(expected) == result).all()
+                print(f"  {name:<30} {string_seconds:>10.3f} {mask_seconds:>10.4f} "
+                      f"{string_seconds / mask_seconds:>7.0f}x")
+
+            backend = CSVStorageBackend()
+            _, cold_seconds = timed(lambda: backend.get_subject_masks("BENCH"))
+            (masks, vocabulary), warm_seconds = timed(lambda: backend.get_subject_masks("BENCH"))
+            _, read_strings_seconds = timed(lambda: string_counts(
+                pd.read_csv("student_progress_BENCH.csv", usecols=["subjects_tested"])["subjects_tested"]
+            ))
+            _, counts_seconds = timed(lambda: subject_counts(masks, vocabulary))
+            print(f"  from disk: read CSV + string counts {read_strings_seconds:.2f}s; "
+                  f"persisted masks first call {cold_seconds:.2f}s, "
+                  f"later calls {warm_seconds:.3f}s + counts {counts_seconds:.4f}s")
+        finally:
+            os.chdir(previous_dir)
+
+
+if __name__ == "__main__":
+    main()
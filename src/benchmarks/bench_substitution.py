@@ -0,0 +1,86 @@
+# benchmarks/bench_substitution.py
+"""
+Throughput of the compiled SubstitutionEngine against the old
+per-entry str.replace loop, for dictionaries of 50, 5,000 and 50,000 terms.
+
+Run from the src directory:
+    python benchmarks/bench_substitution.py
+"""
+import os
+import random
+import string
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from substitution_engine import SubstitutionEngine
+
+DICTIONARY_SIZES = [50, 5_000, 50_000]
+N_SENTENCES = 2_000
+
+
+def make_dictionary(n_terms, rng):
+    """Generate n_terms random one- and two-word phrases."""
+    dictionary = {}
+    while len(dictionary) < n_terms:
+        words = [
+            ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+            for _ in range(rng.choice([1, 1, 1, 2]))
+        ]
+        dictionary[' '.join(words)] = 'simple'
+    return dictionary
+
+
+def make_sentences(dictionary, n_sentences, rng):
+    """Generate sentences mixing filler words with dictionary terms."""
+    terms = list(dictionary)
+    filler = ['the', 'plant', 'uses', 'light', 'to', 'make', 'food', 'and', 'grow']
+    sentences = []
+    for _ in range(n_sentences):
+        words = rng.choices(filler, k=12) + rng.choices(terms, k=3)
+        rng.shuffle(words)
+        sentences.append(' '.join(words) + '.')
+    return sentences
+
+
+def legacy_substitute(sentence, dictionary):
+    """The original simplify_sentence loop."""
+    result = sentence
+    for complex_word, simple_word in dictionary.items():
+        if complex_word in result:
+            result = result.replace(complex_word, simple_word)
+    return result
+
+
+def timed(func, sentences):
+    start = time.perf_counter()
+    for sentence in sentences:
+        func(sentence)
+    return time.perf_counter() - start
+
+
+def main():
+    rng = random.Random(42)
+    print(f"{'terms':>8} {'build (ms)':>12} {'engine (sent/s)':>16} {'legacy (sent/s)':>16} {'speedup':>8}")
+    for n_terms in DICTIONARY_SIZES:
+        dictionary = make_dictionary(n_terms, rng)
+        sentences = make_sentences(dictionary, N_SENTENCES, rng)
+
+        start = time.perf_counter()
+        engine = SubstitutionEngine(dictionary)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        engine_time = timed(engine.substitute, sentences)
+        # The legacy loop is too slow to run over every sentence at large sizes
+        legacy_sample = sentences[:max(20, N_SENTENCES * 50 // n_terms)]
+        legacy_time = timed(lambda s: legacy_substitute(s, dictionary), legacy_sample)
+
+        engine_rate = len(sentences) / engine_time
+        legacy_rate = len(legacy_sample) / legacy_time
+        print(f"{n_terms:>8} {build_ms:>12.1f} {engine_rate:>16,.0f} {legacy_rate:>16,.0f} "
+              f"{engine_rate / legacy_rate:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,278 @@
+# collaborative_filtering.py
+import json
+import sys
+from typing import Iterable, List, Mapping, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+# Neighbours kept per material after training
+DEFAULT_NEIGHBOURS = 50
+# Materials whose similarities are computed per sparse product
+TRAIN_BLOCK_SIZE = 1024
+
+# A student's history: completed material URLs, optionally with a weight each
+History = Union[Mapping[str, float], Iterable[str]]
+
+
+def interactions_from_progress(progress: pd.DataFrame):
+    """
+    Turn progress records into weighted (student, material) interactions.
+
+    Each completed material is weighted by the student's average score in
+    that subject (0-100 scaled to 0-1), so materials completed by students
+    who did well count more. A material seen in several subjects keeps the
+    highest weight.
+
+    Args:
+        progress: Rows with student_id, average_score and completed_materials
+            ('|'-separated URLs), as in the progress snapshot
+
+    Returns:
+        (student_codes, material_codes, weights, students, materials)
+    """
+    completed = progress['completed_materials'].fillna('').astype(str).str.split('|')
+    pairs = pd.DataFrame({
+        'student_id': progress['student_id'].astype(str).to_numpy(),
+        'weight': (pd.to_numeric(progress['average_score'], errors='coerce').fillna(0) / 100).clip(0, 1),
+        'material': completed
+    }).explode('material')
+    pairs = pairs[pairs['material'].notna() & (pairs['material'] != '')]
+    pairs = pairs.groupby(['student_id', 'material'], sort=False)['weight'].max().reset_index()
+
+    student_codes, students = pd.factorize(pairs['student_id'])
+    material_codes, materials = pd.factorize(pairs['material'])
+    return (student_codes.astype(np.int32), material_codes.astype(np.int32),
+            pairs['weight'].to_numpy(dtype=np.float32), list(students), list(materials))
+
+
+def _top_neighbours(block: sparse.csr_matrix, first_item: int, neighbours: int):
+    """Keep the strongest neighbours of each row of a similarity block, dropping self-similarity."""
+    indptr = [0]
+    indices = []
+    values = []
+    for row in range(block.shape[0]):
+        start, end = block.indptr[row], block.indptr[row + 1]
+        columns = block.indices[start:end]
+        scores = block.data[start:end]
+        keep = (columns != first_item + row) & (scores > 0)
+        columns, scores = columns[keep], scores[keep]
+        if len(scores) > neighbours:
+            top = np.argpartition(-scores, neighbours - 1)[:neighbours]
+            columns, scores = columns[top], scores[top]
+        order = np.argsort(-scores, kind='stable')
+        indices.append(columns[order])
+        values.append(scores[order])
+        indptr.append(indptr[-1] + len(order))
+    return np.array(indptr[1:], dtype=np.int64), indices, values
+
+
+class ItemItemModel:
+    """
+    Item-item collaborative filtering over completed study materials.
+
+    For every material the model keeps its most similar materials (cosine
+    similarity of their score-weighted student columns) as CSR arrays. A
+    student's candidates are scored by summing the neighbour lists of the
+    materials they completed, so a request touches only those lists.
+    """
+
+    def __init__(self, materials: Sequence[str], indptr: np.ndarray, indices: np.ndarray,
+                 similarities: np.ndarray, popularity: np.ndarray):
+        """
+        Args:
+            materials: Material URL per item id
+            indptr: CSR row offsets, one row of neighbours per item
+            indices: Neighbour item ids
+            similarities: Neighbour similarity, aligned with indices
+            popularity: Summed interaction weight per item, for cold starts
+        """
+        self.materials = list(materials)
+        self.material_ids = {material: item for item, material in enumerate(self.materials)}
+        self.indptr = indptr
+        self.indices = indices
+        self.similarities = similarities
+        self.popularity = popularity
+        # Most popular first, for filling short or empty recommendation lists
+        self._popular_order = np.argsort(-popularity, kind='stable')
+
+    def _history_items(self, history: History) -> Tuple[np.ndarray, np.ndarray]:
+        if isinstance(history, Mapping):
+            pairs = [(self.material_ids[url], weight) for url, weight in history.items() if url in self.material_ids]
+        else:
+            pairs = [(self.material_ids[url], 1.0) for url in history if url in self.material_ids]
+        if not pairs:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+        items, weights = zip(*pairs)
+        return np.array(items, dtype=np.int32), np.array(weights, dtype=np.float32)
+
+    def _neighbour_scores(self, items: np.ndarray, weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Summed, weighted similarity for every neighbour of the history items."""
+        if len(items) == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float64)
+        starts, ends = self.indptr[items], self.indptr[items + 1]
+        lengths = ends - starts
+        positions = np.repeat(starts - np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths) \
+            + np.arange(lengths.sum())
+        neighbours = self.indices[positions]
+        scores = self.similarities[positions] * np.repeat(weights, lengths)
+        neighbours, inverse = np.unique(neighbours, return_inverse=True)
+        return neighbours, np.bincount(inverse, weights=scores)
+
+    def recommend(self, history: History, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        Top-k materials for a student, excluding ones already completed.
+
+        Materials similar to the history come first; popular materials fill
+        the list when the history is empty or has few neighbours.
+
+        Args:
+            history: Completed material URLs, or URL -> weight (e.g. score / 100)
+            k: Number of recommendations
+
+        Returns:
+            (material URL, score) pairs, best first; popularity fillers score 0
+        """
+        items, weights = self._history_items(history)
+        neighbours, scores = self._neighbour_scores(items, weights)
+        keep = ~np.isin(neighbours, items)
+        neighbours, scores = neighbours[keep], scores[keep]
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            neighbours, scores = neighbours[top], scores[top]
+        order = np.lexsort((neighbours, -scores))
+        results = [(self.materials[item], float(score)) for item, score in zip(neighbours[order], scores[order])]
+
+        if len(results) < k:
+            seen = set(items.tolist()) | set(neighbours.tolist())
+            for item in self._popular_order:
+                if len(results) == k:
+                    break
+                if item not in seen:
+                    results.append((self.materials[item], 0.0))
+        return results
+
+    def score_candidates(self, history: History, candidates: Sequence[str]) -> np.ndarray:
+        """
+        Collaborative score of each candidate URL for a student.
+
+        Unknown candidates score 0. Use this to rank a fixed list, such as
+        the materials for the student's level.
+        """
+        neighbours, scores = self._neighbour_scores(*self._history_items(history))
+        lookup = dict(zip(neighbours.tolist(), scores.tolist()))
+        return np.array([lookup.get(self.material_ids.get(url, -1), 0.0) for url in candidates])
+
+    def save(self, path: str) -> None:
+        """Write the model to an .npz file with a JSON list of materials next to it."""
+        np.savez(path, indptr=self.indptr, indices=self.indices, similarities=self.similarities,
+                 popularity=self.popularity)
+        with open(_materials_path(path), 'w') as f:
+            json.dump(self.materials, f)
+
+    @classmethod
+    def load(cls, path: str) -> 'ItemItemModel':
+        """Read a model written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {name: data[name] for name in ('indptr', 'indices', 'similarities', 'popularity')}
+        with open(_materials_path(path)) as f:
+            materials = json.load(f)
+        return cls(materials, **arrays)
+
+
+def _materials_path(path: str) -> str:
+    base = path[:-4] if path.endswith('.npz') else path
+    return base + '.materials.json'
+
+
+def train_item_item_model(student_codes: np.ndarray, material_codes: np.ndarray, weights: np.ndarray,
+                          materials: Sequence[str], neighbours: int = DEFAULT_NEIGHBOURS,
+                          block_size: int = TRAIN_BLOCK_SIZE) -> ItemItemModel:
+    """
+    Train the item-item model from weighted interactions.
+
+    The student x material matrix is column-normalized and multiplied with
+    itself one block of materials at a time; only the top neighbours of each
+    material are kept, so memory stays bounded by the block size.
+
+    Args:
+        student_codes: Student id per interaction
+        material_codes: Item id per interaction, indexing materials
+        weights: Interaction weight, e.g. average score / 100
+        materials: Material URL per item id
+        neighbours: Neighbours kept per material
+        block_size: Materials per sparse product
+
+    Returns:
+        Trained model
+    """
+    if not len(student_codes) == len(material_codes) == len(weights):
+        raise ValueError("student_codes, material_codes and weights must have the same length")
+    n_students = int(student_codes.max()) + 1 if len(student_codes) else 0
+    n_items = len(materials)
+
+    ratings = sparse.csr_matrix(
+        (weights.astype(np.float32), (student_codes, material_codes)), shape=(n_students, n_items)
+    )
+    ratings.sum_duplicates()
+    norms = np.sqrt(np.asarray(ratings.multiply(ratings).sum(axis=0)).ravel())
+    normalized = ratings.multiply(1 / np.maximum(norms, 1e-12)).tocsc()
+    transposed = normalized.T.tocsr()
+
+    indptr = [np.zeros(1, dtype=np.int64)]
+    indices, similarities = [], []
+    total = 0
+    for first in range(0, n_items, block_size):
+        block = (transposed[first:first + block_size] @ normalized).tocsr()
+        block_indptr, block_indices, block_values = _top_neighbours(block, first, neighbours)
+        indptr.append(block_indptr + total)
+        indices.extend(block_indices)
+        similarities.extend(block_values)
+        total += int(block_indptr[-1]) if len(block_indptr) else 0
+
+    return ItemItemModel(
+        materials,
+        np.concatenate(indptr),
+        np.concatenate(indices).astype(np.int32) if indices else np.empty(0, dtype=np.int32),
+        np.concatenate(similarities).astype(np.float32) if similarities else np.empty(0, dtype=np.float32),
+        np.bincount(material_codes, weights=weights, minlength=n_items).astype(np.float32)
+    )
+
+
+def precision_at_k(recommend, histories: Sequence[History], held_out: Sequence[Iterable[str]],
+                   k: int = 10) -> float:
+    """
+    Mean fraction of each student's top-k that is in their held-out materials.
+
+    Args:
+        recommend: Function (history, k) -> [(url, score), ...]
+        histories: Training history per evaluated student
+        held_out: Materials hidden from training, per student
+        k: Cutoff
+
+    Returns:
+        Precision@k averaged over students
+    """
+    if not histories:
+        raise ValueError("No students to evaluate")
+    hits = 0
+    for history, hidden in zip(histories, held_out):
+        hidden = set(hidden)
+        hits += sum(1 for url, _ in recommend(history, k) if url in hidden)
+    return hits / (k * len(histories))
+
+
+def main():
+    # python collaborative_filtering.py <progress.csv> <model.npz>
+    progress_path, output_path = sys.argv[1:3]
+    student_codes, material_codes, weights, students, materials = interactions_from_progress(
+        pd.read_csv(progress_path, dtype={'student_id': str})
+    )
+    model = train_item_item_model(student_codes, material_codes, weights, materials)
+    model.save(output_path)
+    print(f"Trained on {len(students):,} students and {len(materials):,} materials, saved to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
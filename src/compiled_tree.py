@@ -0,0 +1,124 @@
+# compiled_tree.py
+"""
+Flattened decision tree for serving without scikit-learn.
+
+export_tree() turns a fitted DecisionTreeClassifier into a handful of
+NumPy arrays; CompiledTree evaluates them and gives the same predictions
+as the original model. Nothing here imports scikit-learn.
+"""
+import sys
+from typing import Dict, Sequence
+
+import numpy as np
+
+TREE_LEAF = -1
+
+
+def export_tree(model) -> Dict[str, np.ndarray]:
+    """
+    Flatten a fitted scikit-learn decision tree into NumPy arrays.
+
+    Returns:
+        Dict with feature, threshold, children_left, children_right and
+        leaf_class (the predicted class of every node), plus classes
+    """
+    tree = model.tree_
+    # predict() takes the argmax of the node's (weighted) class distribution
+    leaf_class = np.argmax(tree.value[:, 0, :], axis=1)
+    return {
+        "feature": tree.feature.astype(np.int32),
+        "threshold": tree.threshold.astype(np.float64),
+        "children_left": tree.children_left.astype(np.int32),
+        "children_right": tree.children_right.astype(np.int32),
+        "leaf_class": leaf_class.astype(np.int32),
+        "classes": np.asarray(model.classes_)
+    }
+
+
+def save_compiled_tree(model, path: str) -> None:
+    """Export a fitted tree and write it to an .npz file."""
+    np.savez(path, **export_tree(model))
+
+
+class CompiledTree:
+    """Evaluates an exported decision tree; a drop-in for the model's predict()."""
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.feature = np.asarray(arrays["feature"], dtype=np.intp)
+        self.threshold = np.asarray(arrays["threshold"], dtype=np.float64)
+        self.children_left = np.asarray(arrays["children_left"], dtype=np.intp)
+        self.children_right = np.asarray(arrays["children_right"], dtype=np.intp)
+        self.leaf_class = np.asarray(arrays["leaf_class"], dtype=np.intp)
+        self.classes_ = np.asarray(arrays["classes"])
+        self.max_depth = self._depth()
+
+        # Plain lists are faster than array indexing for one row at a time
+        self._nodes = list(zip(
+            self.feature.tolist(), self.threshold.tolist(),
+            self.children_left.tolist(), self.children_right.tolist()
+        ))
+        self._leaf_labels = self.classes_[self.leaf_class].tolist()
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledTree":
+        with np.load(path, allow_pickle=False) as arrays:
+            return cls(dict(arrays))
+
+    def _depth(self) -> int:
+        depth = np.zeros(len(self.feature), dtype=np.intp)
+        for node in range(len(self.feature)):
+            for child in (self.children_left[node], self.children_right[node]):
+                if child != TREE_LEAF:
+                    depth[child] = depth[node] + 1
+        return int(depth.max()) if len(depth) else 0
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict classes for a 2-D array or DataFrame of encoded features.
+
+        Like scikit-learn, features are compared as float32 values.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        rows = np.arange(len(X))
+        node = np.zeros(len(X), dtype=np.intp)
+        for _ in range(self.max_depth):
+            feature = self.feature[node]
+            internal = self.children_left[node] != TREE_LEAF
+            go_left = X[rows, np.where(internal, feature, 0)] <= self.threshold[node]
+            node = np.where(
+                internal,
+                np.where(go_left, self.children_left[node], self.children_right[node]),
+                node
+            )
+        return self.classes_[self.leaf_class[node]]
+
+    def predict_one(self, features: Sequence[float]):
+        """Predict the class of a single row of encoded features."""
+        nodes = self._nodes
+        feature, threshold, left, right = nodes[0]
+        node = 0
+        while left != TREE_LEAF:
+            # scikit-learn compares float32 features against float64 thresholds
+            node = left if float(np.float32(features[feature])) <= threshold else right
+            feature, threshold, left, right = nodes[node]
+        return self._leaf_labels[node]
+
+    def matches(self, model, X) -> bool:
+        """Check that this tree predicts exactly what the original model does."""
+        return bool(np.array_equal(self.predict(X), model.predict(X)))
+
+
+def main():
+    # Export the saved pickle: python compiled_tree.py model.pkl tree.npz
+    import joblib
+    from model_training import EqualFeatureImportanceClassifier
+
+    # The pickle refers to the class through __main__
+    sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier
+    model_path, output_path = sys.argv[1:3]
+    save_compiled_tree(joblib.load(model_path), output_path)
+    print(f"Compiled tree written to {output_path}")
+
+
+if __name__ == "__main__":
+    main()
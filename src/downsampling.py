@@ -0,0 +1,108 @@
+# downsampling.py
+import numpy as np
+
+DOWNSAMPLING_METHODS = ('lttb', 'min_max')
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of n_points that keep the shape of a line.
+
+    The first and last points are always kept. The points in between are
+    split into n_points - 2 buckets, and each bucket keeps the point that
+    forms the largest triangle with the point kept before it and the mean
+    of the next bucket, so peaks and troughs survive.
+
+    Args:
+        x: Ascending x values, e.g. dates as matplotlib date numbers
+        y: Values; must not contain NaN
+        n_points: Points to keep, at least 3
+
+    Returns:
+        Ascending positions into x and y; all of them if there are at most n_points
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_points < 3:
+        raise ValueError("n_points must be at least 3")
+    if n <= n_points:
+        return np.arange(n)
+
+    # Bucket i covers [edges[i], edges[i + 1]); every bucket has at least one point
+    edges = np.linspace(1, n - 1, n_points - 1).astype(np.int64)
+    sizes = np.diff(edges)
+    mean_x = np.add.reduceat(x[1:n - 1], edges[:-1] - 1) / sizes
+    mean_y = np.add.reduceat(y[1:n - 1], edges[:-1] - 1) / sizes
+    # The last bucket looks ahead to the final point
+    mean_x = np.append(mean_x[1:], x[-1])
+    mean_y = np.append(mean_y[1:], y[-1])
+
+    selected = np.empty(n_points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(n_points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        previous_x, previous_y = x[previous], y[previous]
+        # Twice the triangle area; the constant factor does not change the argmax
+        area = np.abs(
+            (previous_x - mean_x[bucket]) * (y[start:end] - previous_y)
+            - (previous_x - x[start:end]) * (mean_y[bucket] - previous_y)
+        )
+        previous = start + int(area.argmax())
+        selected[bucket + 1] = previous
+    return selected
+
+
+def min_max_indices(y: np.ndarray, n_points: int) -> np.ndarray:
+    """
+    Positions of the minimum and maximum of each of about n_points / 2 equal buckets.
+
+    Cheaper than LTTB and keeps every extreme value, but ignores x spacing.
+    The first and last points are always kept.
+
+    Args:
+        y: Values; must not contain NaN
+        n_points: Upper bound on the points kept, at least 4
+
+    Returns:
+        Ascending positions into y; all of them if there are at most n_points
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_points < 4:
+        raise ValueError("n_points must be at least 4")
+    if n <= n_points:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, (n_points - 2) // 2 + 1).astype(np.int64)
+    selected = [np.array([0, n - 1])]
+    for start, end in zip(edges[:-1], edges[1:]):
+        bucket = y[start:end]
+        selected.append(np.array([start + bucket.argmin(), start + bucket.argmax()]))
+    return np.unique(np.concatenate(selected))
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, n_points: int, method: str = 'lttb') -> np.ndarray:
+    """
+    Positions of the points to draw for a long series, skipping NaN values.
+
+    Args:
+        x: Ascending x values
+        y: Values, may contain NaN
+        n_points: Display points to keep
+        method: 'lttb' or 'min_max'
+
+    Returns:
+        Ascending positions; all of them when there are at most n_points
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"method must be one of {', '.join(DOWNSAMPLING_METHODS)}")
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) <= n_points:
+        return np.arange(len(y))
+    finite = np.flatnonzero(np.isfinite(x) & np.isfinite(y))
+    if method == 'lttb':
+        return finite[lttb_indices(x[finite], y[finite], n_points)]
+    return finite[min_max_indices(y[finite], n_points)]
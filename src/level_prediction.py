@@ -0,0 +1,154 @@
+# level_prediction.py
+from typing import Dict, Iterator, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from prediction_table import PredictionTable
+
+FEATURE_COLUMNS = ['Age', 'Last_Test_Score', 'Knowledge_Level', 'Learning_Speed']
+NUMERIC_COLUMNS = ['Age', 'Last_Test_Score']
+CATEGORICAL_ENCODERS = {
+    'Knowledge_Level': 'knowledge_encoder',
+    'Learning_Speed': 'learning_encoder'
+}
+# Inclusive integer ranges the prediction table covers (the app's input limits)
+TABLE_RANGES = {
+    'Age': (0, 100),
+    'Last_Test_Score': (0, 100)
+}
+
+
+class BulkFeatureEncoder:
+    """
+    Vectorized replacement for the per-row LabelEncoder / StandardScaler transforms.
+
+    Category codes come from a precomputed lookup built from each encoder's
+    classes_, and scaling uses the scaler's mean_ and scale_ directly, so a
+    whole column is encoded in one array operation.
+    """
+
+    def __init__(self, encoders: Dict):
+        self.categories = {
+            column: pd.Index(encoders[encoder_name].classes_)
+            for column, encoder_name in CATEGORICAL_ENCODERS.items()
+        }
+        scaler = encoders['scaler']
+        self.mean = np.asarray(scaler.mean_, dtype=np.float64)
+        self.scale = np.asarray(scaler.scale_, dtype=np.float64)
+        self.target_classes = np.asarray(encoders['target_encoder'].classes_)
+
+    def encode_column(self, column: str, values) -> np.ndarray:
+        """Map category labels to their encoder codes."""
+        categories = self.categories[column]
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            # Look up each distinct category once, then gather by code
+            lookup = np.append(categories.get_indexer(values.cat.categories), -1)
+            codes = lookup[values.cat.codes.to_numpy()]
+        else:
+            codes = categories.get_indexer(np.asarray(values, dtype=object))
+        if (codes < 0).any():
+            unseen = pd.unique(np.asarray(values, dtype=object)[codes < 0])
+            raise ValueError(f"{column} contains previously unseen labels: {list(unseen)}")
+        return codes
+
+    def transform(self, data: Union[pd.DataFrame, Dict[str, np.ndarray]]) -> np.ndarray:
+        """
+        Build the model's feature matrix.
+
+        Args:
+            data: DataFrame or dict of arrays with the FEATURE_COLUMNS
+
+        Returns:
+            float64 array of shape (n_rows, 4) in FEATURE_COLUMNS order
+        """
+        n_rows = len(data[FEATURE_COLUMNS[0]])
+        features = np.empty((n_rows, len(FEATURE_COLUMNS)), dtype=np.float64)
+        for i, column in enumerate(NUMERIC_COLUMNS):
+            features[:, i] = data[column]
+        features[:, :len(NUMERIC_COLUMNS)] -= self.mean
+        features[:, :len(NUMERIC_COLUMNS)] /= self.scale
+        for i, column in enumerate(CATEGORICAL_ENCODERS, start=len(NUMERIC_COLUMNS)):
+            features[:, i] = self.encode_column(column, data[column])
+        return features
+
+    def decode(self, predictions: np.ndarray) -> np.ndarray:
+        """Map encoded predictions back to level names."""
+        return self.target_classes[predictions]
+
+
+def predict_next_levels_bulk(model, encoders, data, feature_encoder: BulkFeatureEncoder = None) -> np.ndarray:
+    """
+    Predict the next level for many students in one vectorized call.
+
+    Args:
+        model: Fitted classifier
+        encoders: Dict with knowledge/learning/target encoders and the scaler
+        data: DataFrame or dict of arrays with Age, Last_Test_Score,
+            Knowledge_Level and Learning_Speed
+        feature_encoder: Optional prebuilt BulkFeatureEncoder to reuse
+
+    Returns:
+        Array of predicted level names, one per row
+    """
+    if feature_encoder is None:
+        feature_encoder = BulkFeatureEncoder(encoders)
+    features = feature_encoder.transform(data)
+    if len(features) == 0:
+        return feature_encoder.target_classes[:0]
+    # The model was fitted on a DataFrame, so keep the feature names
+    predictions = model.predict(pd.DataFrame(features, columns=FEATURE_COLUMNS, copy=False))
+    return feature_encoder.decode(predictions)
+
+
+def iter_predict_next_levels_csv(
+    model,
+    encoders,
+    csv_path: str,
+    chunk_size: int = 1_000_000
+) -> Iterator[Tuple[pd.DataFrame, np.ndarray]]:
+    """
+    Stream predictions for a CSV too large to load at once.
+
+    Only the feature columns are read, with the categorical ones as pandas
+    categories, chunk_size rows at a time.
+
+    Yields:
+        (chunk, predicted levels) for each chunk of the file
+    """
+    feature_encoder = BulkFeatureEncoder(encoders)
+    dtypes = {
+        'Age': np.float64,
+        'Last_Test_Score': np.float64,
+        'Knowledge_Level': 'category',
+        'Learning_Speed': 'category'
+    }
+    for chunk in pd.read_csv(csv_path, usecols=FEATURE_COLUMNS, dtype=dtypes, chunksize=chunk_size):
+        yield chunk, predict_next_levels_bulk(model, encoders, chunk, feature_encoder)
+
+
+def build_next_level_table(model, encoders, ranges: Dict[str, Tuple[int, int]] = None) -> PredictionTable:
+    """
+    Precompute next-level predictions for every integer age and score.
+
+    With the default ranges this is 101 x 101 x 3 x 3 grid points, stored as
+    int8 class codes (about 90 KB) and built with one bulk prediction pass.
+
+    Args:
+        model: Fitted model (scikit-learn or CompiledTree)
+        encoders: Encoders dict saved alongside the model
+        ranges: Inclusive integer range per numeric column, defaults to TABLE_RANGES
+
+    Returns:
+        Table indexed by (age, score, knowledge level, learning speed)
+    """
+    ranges = ranges or TABLE_RANGES
+    feature_encoder = BulkFeatureEncoder(encoders)
+    axes = [
+        ranges[column] if column in ranges else tuple(feature_encoder.categories[column])
+        for column in FEATURE_COLUMNS
+    ]
+    return PredictionTable.build(
+        FEATURE_COLUMNS, axes, feature_encoder.target_classes,
+        lambda grid: predict_next_levels_bulk(model, encoders, grid, feature_encoder)
+    )
@@ -1,5 +1,5 @@
 from Adaptive_Learning_Content_Generator import AdaptiveLearningContentGenerator
-from recommendation_engine import StudyMaterialRecommender
+from recommendation_engine import get_recommender
 
 def get_user_input():
     """Gets subject and learning speed from user."""
@@ -18,8 +18,8 @@ def main():
     # Get user input
     subject, learning_speed = get_user_input()
     
-    # Initialize the recommender
-    recommender = StudyMaterialRecommender()
+    # Get the shared recommender
+    recommender = get_recommender()
     
     # Get recommendations
     recommendation = recommender.recommend_materials(subject, learning_speed)
@@ -1,22 +1,15 @@
+import os
 import streamlit as st
-import joblib
-from recommendation_engine import StudyMaterialRecommender
+from model_artifact import load_model_artifact
+from recommendation_engine import get_recommender
 
-# Define the missing class (Required for loading the model)
-class EqualFeatureImportanceClassifier:
-    def __init__(self):
-        pass
+MODEL_BASE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "student_performance_model")
 
-    def predict(self, X):
-        return ["Intermediate"]  # Dummy prediction
-
-# Load the trained model
+# Load the trained model (pickle-free artifact, mapped once per process)
 @st.cache_resource
 def load_model():
     try:
-        model_path = r"C:\Users\Lovepreet\OneDrive\Documents\copy\src\models\student_performance_model.pkl"
-        model = joblib.load(model_path)
-        return model
+        return load_model_artifact(MODEL_BASE_PATH)
     except Exception as e:
         st.error(f"Error loading model: {e}")
         return None
@@ -24,9 +17,8 @@ def load_model():
 # Function to predict the student's next level
 def predict_next_level(model, age, test_score, learning_speed, knowledge_level):
     if model:
-        input_data = [[age, test_score, learning_speed, knowledge_level]]
-        predicted_level = model.predict(input_data)[0]
-        return predicted_level
+        # The model was trained on capitalized speeds (Slow, Medium, Fast)
+        return model.predict_level(age, test_score, knowledge_level, learning_speed.capitalize())
     return "Error: Model could not be loaded."
 
 # Function to provide study material based on subject & level
@@ -96,8 +88,8 @@ def main():
                     # Get study material
                     study_material = get_study_material(subject, predicted_level)
                     
-                    # Initialize the recommendation engine
-                    recommender = StudyMaterialRecommender()
+                    # Shared recommendation engine, built once per process
+                    recommender = get_recommender()
                     
                     # Get recommendations
                     recommendations = recommender.recommend_materials(
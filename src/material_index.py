@@ -0,0 +1,265 @@
+# material_index.py
+import random
+import re
+from collections.abc import Mapping
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from lru_cache import LRUCache
+
+# Columns with exact-match postings
+FIELD_COLUMNS = ['level', 'subject', 'material_type']
+# Columns whose tokens are ranked with BM25
+TEXT_COLUMNS = ['tags', 'resource_name']
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Filter combinations whose matching rows are kept per index
+FILTER_CACHE_SIZE = 256
+
+
+def tokenize(text) -> List[str]:
+    """Lowercase word tokens of a text; missing values have none."""
+    if not isinstance(text, str):
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _group_postings(codes: np.ndarray, n_groups: int):
+    """
+    Split row numbers into one sorted int32 array per code.
+
+    Returns:
+        (order, offsets): rows of code c are order[offsets[c]:offsets[c + 1]]
+    """
+    order = np.argsort(codes, kind='stable').astype(np.int32)
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_groups), out=offsets[1:])
+    return order, offsets
+
+
+class MaterialRecord(Mapping):
+    """
+    Read-only view of one catalog row.
+
+    Values are read from the index's column arrays on access, so returning
+    a page of results does not copy any row into a dict.
+    """
+
+    __slots__ = ('_columns', '_row')
+
+    def __init__(self, columns: Dict[str, np.ndarray], row: int):
+        self._columns = columns
+        self._row = row
+
+    @property
+    def row(self) -> int:
+        """Row number of the material in the catalog."""
+        return self._row
+
+    def __getitem__(self, key):
+        return self._columns[key][self._row]
+
+    def __iter__(self):
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    def __repr__(self) -> str:
+        return f"MaterialRecord({dict(self)!r})"
+
+
+class MaterialIndex:
+    """
+    Inverted index over a study materials catalog.
+
+    Level, subject and material type map each value to a sorted int32 array
+    of row numbers. Tokens of tags and resource_name map to postings of
+    (row, BM25 impact), with the impact precomputed at build time, so a
+    ranked query only sums the impacts of its terms' postings.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        """
+        Args:
+            df: Catalog with at least the FIELD_COLUMNS and resource_name
+        """
+        self.size = len(df)
+        self.columns = {column: df[column].to_numpy() for column in df.columns}
+
+        # Exact-match fields: value -> postings, plus one code per row for filtering
+        self.field_values: Dict[str, Dict[str, int]] = {}
+        self.field_codes: Dict[str, np.ndarray] = {}
+        self._field_postings: Dict[str, tuple] = {}
+        for column in FIELD_COLUMNS:
+            codes, uniques = pd.factorize(df[column])
+            codes = codes.astype(np.int32)
+            self.field_values[column] = {value: code for code, value in enumerate(uniques)}
+            self.field_codes[column] = codes
+            # Missing values get code -1 and are left out of the postings
+            present = codes >= 0
+            rows = np.flatnonzero(present).astype(np.int32)
+            order, offsets = _group_postings(codes[present], len(uniques))
+            self._field_postings[column] = (rows[order], offsets)
+
+        self._build_text_index(df)
+        # The catalog never changes under an index, so filter results can be reused
+        self._filter_cache = LRUCache(maxsize=FILTER_CACHE_SIZE)
+
+    def _build_text_index(self, df: pd.DataFrame) -> None:
+        term_ids: Dict[str, int] = {}
+        pair_terms = []
+        pair_rows = []
+
+        for column in TEXT_COLUMNS:
+            if column not in df.columns:
+                continue
+            # Tokenize each distinct text once, then expand to the rows that use it
+            text_codes, texts = pd.factorize(df[column])
+            token_lists = [[term_ids.setdefault(token, len(term_ids)) for token in tokenize(text)]
+                           for text in texts]
+            lengths = np.array([len(tokens) for tokens in token_lists] + [0], dtype=np.int64)
+            flat_tokens = np.fromiter((token for tokens in token_lists for token in tokens),
+                                      dtype=np.int32, count=int(lengths.sum()))
+            starts = np.concatenate([[0], np.cumsum(lengths[:-1])])
+
+            # Missing texts (code -1) point at the trailing empty entry
+            row_lengths = lengths[text_codes]
+            rows = np.repeat(np.arange(self.size, dtype=np.int64), row_lengths)
+            row_starts = np.repeat(starts[text_codes] - np.concatenate([[0], np.cumsum(row_lengths)[:-1]]),
+                                   row_lengths)
+            pair_terms.append(flat_tokens[np.arange(len(rows)) + row_starts])
+            pair_rows.append(rows)
+
+        self.vocabulary = term_ids
+        n_terms = len(term_ids)
+        terms = np.concatenate(pair_terms) if pair_terms else np.empty(0, dtype=np.int32)
+        rows = np.concatenate(pair_rows) if pair_rows else np.empty(0, dtype=np.int64)
+
+        # Term frequency per (term, row) pair, sorted by term then row
+        keys, tf = np.unique(terms.astype(np.int64) * max(self.size, 1) + rows, return_counts=True)
+        posting_terms = keys // max(self.size, 1)
+        posting_rows = (keys % max(self.size, 1)).astype(np.int32)
+
+        doc_lengths = np.bincount(rows, minlength=self.size).astype(np.float32)
+        average_length = float(doc_lengths.mean()) if self.size else 0.0
+        df_counts = np.bincount(posting_terms, minlength=n_terms)
+        idf = np.log1p((self.size - df_counts + 0.5) / (df_counts + 0.5)).astype(np.float32)
+
+        norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths[posting_rows] / (average_length or 1.0))
+        self._text_rows = posting_rows
+        self._text_impacts = (idf[posting_terms] * tf * (BM25_K1 + 1) / (tf + norm)).astype(np.float32)
+        self._text_offsets = np.zeros(n_terms + 1, dtype=np.int64)
+        np.cumsum(df_counts, out=self._text_offsets[1:])
+
+    def record(self, row: int) -> MaterialRecord:
+        """Return a view of one catalog row."""
+        return MaterialRecord(self.columns, row)
+
+    def postings(self, column: str, value) -> np.ndarray:
+        """Sorted row numbers whose column equals value (empty if none)."""
+        code = self.field_values[column].get(value)
+        if code is None:
+            return np.empty(0, dtype=np.int32)
+        rows, offsets = self._field_postings[column]
+        return rows[offsets[code]:offsets[code + 1]]
+
+    def matching_rows(self, **filters) -> Optional[np.ndarray]:
+        """Sorted rows matching every filter, or None when there are no filters."""
+        if not filters:
+            return None
+        key = tuple(sorted(filters.items()))
+        candidates = self._filter_cache.get(key)
+        if candidates is None:
+            candidates = self._match_filters(filters)
+            self._filter_cache.put(key, candidates)
+        return candidates
+
+    def _match_filters(self, filters: Dict[str, object]) -> np.ndarray:
+        # Start from the shortest postings and check the other fields per row
+        by_length = sorted(filters.items(), key=lambda item: len(self.postings(*item)))
+        candidates = self.postings(*by_length[0])
+        if len(candidates) == 0:
+            return candidates
+        for column, value in by_length[1:]:
+            candidates = candidates[self.field_codes[column][candidates] == self.field_values[column][value]]
+        return candidates
+
+    def search(self, query: Optional[str] = None, k: int = 3, sample: bool = True,
+               **filters) -> List[MaterialRecord]:
+        """
+        Find materials matching the filters, ranked by BM25 when there is a query.
+
+        Args:
+            query: Free text matched against tags and resource_name
+            k: Maximum number of results
+            sample: Without a query, return a random k of the matches
+                (like DataFrame.sample) instead of the first k
+            **filters: Exact values for level, subject or material_type
+
+        Returns:
+            Up to k record views, best match first when ranked
+        """
+        unknown = set(filters) - set(FIELD_COLUMNS)
+        if unknown:
+            raise ValueError(f"Cannot filter on: {', '.join(sorted(unknown))}")
+        filters = {column: value for column, value in filters.items() if value is not None}
+        if k <= 0:
+            return []
+
+        terms = [self.vocabulary[token] for token in set(tokenize(query))
+                 if token in self.vocabulary] if query else []
+        if query and not terms:
+            return []
+
+        if not terms:
+            rows = self.matching_rows(**filters)
+            if rows is None:
+                rows = np.arange(self.size, dtype=np.int32)
+            if len(rows) > k:
+                positions = random.sample(range(len(rows)), k) if sample else range(k)
+                rows = rows[list(positions)]
+            return [MaterialRecord(self.columns, int(row)) for row in rows]
+
+        codes = []
+        for column, value in filters.items():
+            code = self.field_values[column].get(value)
+            if code is None:
+                return []
+            codes.append((self.field_codes[column], code))
+
+        # Filter each term's postings before merging them
+        row_parts, impact_parts = [], []
+        for term in terms:
+            rows = self._text_rows[self._text_offsets[term]:self._text_offsets[term + 1]]
+            impacts = self._text_impacts[self._text_offsets[term]:self._text_offsets[term + 1]]
+            for field_codes, code in codes:
+                keep = field_codes[rows] == code
+                rows, impacts = rows[keep], impacts[keep]
+            row_parts.append(rows)
+            impact_parts.append(impacts)
+        rows = np.concatenate(row_parts)
+        impacts = np.concatenate(impact_parts)
+
+        if len(terms) > 1 and len(rows):
+            # Each part is sorted by row, so a stable sort only merges the runs
+            order = np.argsort(rows, kind='stable')
+            rows, impacts = rows[order], impacts[order]
+            starts = np.flatnonzero(np.concatenate([[True], rows[1:] != rows[:-1]]))
+            rows, impacts = rows[starts], np.add.reduceat(impacts, starts)
+
+        if len(rows) > k:
+            # Keep everything tied with the k-th best score so ties resolve by row below
+            threshold = np.partition(impacts, len(impacts) - k)[len(impacts) - k]
+            keep = impacts >= threshold
+            rows, impacts = rows[keep], impacts[keep]
+        # Highest score first, ties by catalog order
+        order = np.lexsort((rows, -impacts))[:k]
+        return [MaterialRecord(self.columns, int(row)) for row in rows[order]]
+
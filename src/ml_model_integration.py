@@ -1,13 +1,41 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import joblib
 import numpy as np
+import sklearn
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 from sklearn.linear_model import LogisticRegression
+from prediction_table import PredictionTable
 from study_material_recommender import print_recommendations
 
-def create_sample_dataset():
+# Everything that determines the trained predictor; changing any value retrains it
+TRAINING_CONFIG = {
+    'n_samples': 1000,
+    'seed': 42,
+    'test_size': 0.2,
+    'split_random_state': 42,
+    'max_iter': 1000,
+}
+
+# Inclusive integer ranges accepted by get_student_input, used by the lookup table
+LOOKUP_COLUMNS = ['current_score', 'study_hours', 'attendance', 'assignments']
+LOOKUP_AXES = [(0, 100), (0, 20), (60, 100), (0, 100)]
+
+MODEL_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+
+# Trained (model, scaler) pairs by config hash, shared within the process
+_trained_models = {}
+_trained_models_lock = threading.Lock()
+_shared_predictor = None
+_shared_predictor_lock = threading.Lock()
+
+def create_sample_dataset(n_samples=1000, seed=42):
     """Generate synthetic student data with improved features"""
-    np.random.seed(42)
-    n_samples = 1000
+    np.random.seed(seed)
     
     # New features - no duplicates
     current_test = np.random.uniform(0, 100, n_samples)  # Latest exam score
@@ -29,29 +57,177 @@ def create_sample_dataset():
     X = np.column_stack([current_test, study_hours, attendance, assignments])
     return X, np.array(y)
 
-def train_student_level_model():
+def train_student_level_model(config=None):
     """Train the classification model"""
-    X, y = create_sample_dataset()
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+    config = config or TRAINING_CONFIG
+    X, y = create_sample_dataset(config['n_samples'], config['seed'])
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=config['test_size'], random_state=config['split_random_state']
+    )
     
     scaler = StandardScaler()
     X_train_scaled = scaler.fit_transform(X_train)
     
-    model = LogisticRegression(multi_class='multinomial', max_iter=1000)
+    # lbfgs fits a multinomial model for multi-class targets
+    model = LogisticRegression(max_iter=config['max_iter'])
     model.fit(X_train_scaled, y_train)
     
     return model, scaler
 
+def config_hash(config=None):
+    """
+    Content hash of a training config
+
+    The scikit-learn version is included because the cached pickle
+    is only valid for the version that wrote it.
+
+    Args:
+    config (dict, optional): Training config, defaults to TRAINING_CONFIG
+
+    Returns:
+    str: Hex digest identifying the trained model
+    """
+    payload = json.dumps({'config': config or TRAINING_CONFIG, 'sklearn': sklearn.__version__},
+                         sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+def load_student_level_model(config=None, cache_dir=None):
+    """
+    Return the trained (model, scaler) for a config, training at most once
+
+    Models are kept in memory per process and persisted under cache_dir
+    named by config hash, so other processes load the file instead of
+    retraining. A changed config gets a new hash and is trained afresh.
+
+    Args:
+    config (dict, optional): Training config, defaults to TRAINING_CONFIG
+    cache_dir (str, optional): Directory for cached models, defaults to models/
+
+    Returns:
+    tuple: (model, scaler)
+    """
+    config = config or TRAINING_CONFIG
+    cache_dir = cache_dir or MODEL_CACHE_DIR
+    digest = config_hash(config)
+    cache_path = os.path.join(cache_dir, f"student_level_predictor_{digest}.joblib")
+    key = (digest, os.path.abspath(cache_path))
+    
+    trained = _trained_models.get(key)
+    if trained is not None:
+        return trained
+    
+    with _trained_models_lock:
+        trained = _trained_models.get(key)
+        if trained is None:
+            try:
+                trained = joblib.load(cache_path)
+            except FileNotFoundError:
+                trained = None
+            except Exception as e:
+                print(f"Ignoring unreadable model cache {cache_path}: {e}")
+                trained = None
+            
+            if trained is None:
+                trained = train_student_level_model(config)
+                try:
+                    os.makedirs(cache_dir, exist_ok=True)
+                    # Write to a temporary file first so readers never see a partial model
+                    fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                    os.close(fd)
+                    try:
+                        joblib.dump(trained, tmp_path)
+                        os.replace(tmp_path, cache_path)
+                    except BaseException:
+                        os.remove(tmp_path)
+                        raise
+                except OSError as e:
+                    print(f"Could not save model cache {cache_path}: {e}")
+            
+            _trained_models[key] = trained
+    return trained
+
 class StudentLevelPredictor:
-    def __init__(self):
-        self.model, self.scaler = train_student_level_model()
+    def __init__(self, config=None, cache_dir=None, precompute=False):
+        self.config_hash = config_hash(config)
+        self.cache_dir = cache_dir or MODEL_CACHE_DIR
+        self.model, self.scaler = load_student_level_model(config, cache_dir)
+        self.lookup_table = None
+        if precompute:
+            self.precompute_lookup_table()
+    
+    def precompute_lookup_table(self):
+        """
+        Evaluate the model on every integer input in LOOKUP_AXES
+        
+        The table (about 8.8M int8 entries) is saved next to the cached model
+        under the same config hash, so it is built once per config. Afterwards
+        predict_student_level answers integer inputs with an array index.
+        
+        Returns:
+        PredictionTable: The loaded or newly built table
+        """
+        table_path = os.path.join(self.cache_dir, f"student_level_table_{self.config_hash}.npz")
+        try:
+            self.lookup_table = PredictionTable.load(table_path)
+            return self.lookup_table
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Ignoring unreadable lookup table {table_path}: {e}")
+        
+        table = PredictionTable.build(
+            LOOKUP_COLUMNS, LOOKUP_AXES, self.model.classes_,
+            lambda grid: self.predict_student_levels(grid.to_numpy(dtype=np.float64))
+        )
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".npz")
+            os.close(fd)
+            try:
+                table.save(tmp_path)
+                os.replace(tmp_path, table_path)
+            except BaseException:
+                os.remove(tmp_path)
+                raise
+        except OSError as e:
+            print(f"Could not save lookup table {table_path}: {e}")
+        self.lookup_table = table
+        return table
+    
+    def predict_student_levels(self, features):
+        """
+        Predict levels for many students with a single predict_proba call
+        
+        Args:
+        features (array-like): Rows of (current_score, study_hours, attendance, assignments)
+        
+        Returns:
+        ndarray: Predicted level per row
+        """
+        features = np.asarray(features, dtype=np.float64)
+        if features.ndim != 2 or features.shape[1] != 4:
+            raise ValueError(f"Expected an array of shape (n, 4), got {features.shape}")
+        probabilities = self.model.predict_proba(self.scaler.transform(features))
+        return self.model.classes_[np.argmax(probabilities, axis=1)]
     
     def predict_student_level(self, current_score, study_hours, attendance, assignments):
         """Predict level using all 4 features"""
-        features = np.array([[current_score, study_hours, attendance, assignments]])
-        features_scaled = self.scaler.transform(features)
-        probabilities = self.model.predict_proba(features_scaled)[0]
-        return self.model.classes_[np.argmax(probabilities)]
+        if self.lookup_table is not None:
+            level = self.lookup_table.lookup(current_score, study_hours, attendance, assignments)
+            if level is not None:
+                return level
+        return self.predict_student_levels([[current_score, study_hours, attendance, assignments]])[0]
+
+def get_student_level_predictor():
+    """Return the process-wide predictor for TRAINING_CONFIG, loading it on first use."""
+    global _shared_predictor
+    predictor = _shared_predictor
+    if predictor is None:
+        with _shared_predictor_lock:
+            if _shared_predictor is None:
+                _shared_predictor = StudentLevelPredictor()
+            predictor = _shared_predictor
+    return predictor
 
 def get_student_input():
     """Interactive input for student data"""
@@ -90,7 +266,7 @@ def recommend_materials_for_student():
     current_score, study_hours, attendance, assignments = get_student_input()
     
     # Make prediction
-    predictor = StudentLevelPredictor()
+    predictor = get_student_level_predictor()
     level = predictor.predict_student_level(current_score, study_hours, attendance, assignments)
     
     # Show results
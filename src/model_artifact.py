@@ -0,0 +1,206 @@
+# model_artifact.py
+"""
+Pickle-free model artifact: an uncompressed .npz holding the flattened
+tree and scaler arrays, and a JSON manifest with the format version,
+feature layout and encoder class lists.
+
+The .npz is memory-mapped when loaded, and load_model_artifact() keeps
+one mapped artifact per path for the life of the process. Nothing here
+imports scikit-learn.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import threading
+import zipfile
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from compiled_tree import CompiledTree, export_tree
+from level_prediction import CATEGORICAL_ENCODERS, FEATURE_COLUMNS, NUMERIC_COLUMNS
+
+ARTIFACT_FORMAT = "student-level-model"
+ARTIFACT_VERSION = 1
+
+# Zip local file header: fixed 30 bytes, name and extra field lengths at offset 26
+_ZIP_LOCAL_HEADER = struct.Struct("<HH")
+
+
+def save_model_artifact(model, encoders: Dict, base_path: str) -> Dict:
+    """
+    Write base_path.npz and base_path.json for a fitted tree and its encoders.
+
+    Returns:
+        The manifest
+    """
+    scaler = encoders['scaler']
+    arrays = {f"tree_{name}": array for name, array in export_tree(model).items() if name != "classes"}
+    arrays["scaler_mean"] = np.asarray(scaler.mean_, dtype=np.float64)
+    arrays["scaler_scale"] = np.asarray(scaler.scale_, dtype=np.float64)
+    np.savez(f"{base_path}.npz", **arrays)
+
+    digest = _file_sha256(f"{base_path}.npz")
+
+    manifest = {
+        "format": ARTIFACT_FORMAT,
+        "version": ARTIFACT_VERSION,
+        "model_type": "decision_tree",
+        "feature_columns": FEATURE_COLUMNS,
+        "numeric_columns": NUMERIC_COLUMNS,
+        "categories": {
+            column: [str(label) for label in encoders[encoder_name].classes_]
+            for column, encoder_name in CATEGORICAL_ENCODERS.items()
+        },
+        # The tree predicts encoded targets, i.e. indices into target_classes
+        "tree_classes": np.asarray(model.classes_).tolist(),
+        "target_classes": [str(label) for label in encoders['target_encoder'].classes_],
+        "arrays": {name: {"dtype": array.dtype.str, "shape": list(array.shape)} for name, array in arrays.items()},
+        "sha256": digest
+    }
+    with open(f"{base_path}.json", "w", encoding="utf-8") as manifest_file:
+        json.dump(manifest, manifest_file, indent=2)
+    return manifest
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _map_npz(path: str) -> Dict[str, np.ndarray]:
+    """Memory-map every array of an uncompressed .npz file."""
+    with open(path, "rb") as npz_file:
+        buffer = mmap.mmap(npz_file.fileno(), 0, access=mmap.ACCESS_READ)
+        arrays = {}
+        with zipfile.ZipFile(npz_file) as archive:
+            for info in archive.infolist():
+                if info.compress_type != zipfile.ZIP_STORED:
+                    raise ValueError(f"{path}: {info.filename} is compressed and cannot be memory-mapped")
+                name_length, extra_length = _ZIP_LOCAL_HEADER.unpack_from(buffer, info.header_offset + 26)
+                npz_file.seek(info.header_offset + 30 + name_length + extra_length)
+                if np.lib.format.read_magic(npz_file) == (1, 0):
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(npz_file)
+                else:
+                    shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(npz_file)
+                arrays[info.filename[:-len(".npy")]] = np.ndarray(
+                    shape, dtype=dtype, buffer=buffer, offset=npz_file.tell(),
+                    order="F" if fortran_order else "C"
+                )
+    return arrays
+
+
+class ArtifactLabelEncoder:
+    """The parts of LabelEncoder the apps use, backed by a class list."""
+
+    def __init__(self, classes):
+        self.classes_ = np.asarray(classes, dtype=object)
+        self._index = pd.Index(self.classes_)
+
+    def transform(self, values) -> np.ndarray:
+        codes = self._index.get_indexer(np.asarray(values, dtype=object))
+        if (codes < 0).any():
+            raise ValueError(f"y contains previously unseen labels: {list(np.asarray(values)[codes < 0])}")
+        return codes
+
+    def inverse_transform(self, codes) -> np.ndarray:
+        return self.classes_[np.asarray(codes, dtype=np.intp)]
+
+
+class ArtifactScaler:
+    """The parts of StandardScaler the apps use, backed by mean/scale arrays."""
+
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    def transform(self, X) -> np.ndarray:
+        return (np.asarray(X, dtype=np.float64) - self.mean_) / self.scale_
+
+
+class ModelArtifact:
+    """A loaded artifact: the compiled tree plus encoder stand-ins."""
+
+    def __init__(self, manifest: Dict, arrays: Dict[str, np.ndarray]):
+        self.manifest = manifest
+        self.model = CompiledTree({
+            "feature": arrays["tree_feature"],
+            "threshold": arrays["tree_threshold"],
+            "children_left": arrays["tree_children_left"],
+            "children_right": arrays["tree_children_right"],
+            "leaf_class": arrays["tree_leaf_class"],
+            "classes": np.asarray(manifest["tree_classes"])
+        })
+        categories = manifest["categories"]
+        self.encoders = {
+            encoder_name: ArtifactLabelEncoder(categories[column])
+            for column, encoder_name in CATEGORICAL_ENCODERS.items()
+        }
+        self.encoders['target_encoder'] = ArtifactLabelEncoder(manifest["target_classes"])
+        self.encoders['scaler'] = ArtifactScaler(arrays["scaler_mean"], arrays["scaler_scale"])
+
+        # Scalar lookups for predict_level
+        self._category_codes = {column: {label: code for code, label in enumerate(labels)}
+                                for column, labels in categories.items()}
+        self._mean = arrays["scaler_mean"].tolist()
+        self._scale = arrays["scaler_scale"].tolist()
+        self._target_classes = manifest["target_classes"]
+
+    def predict_level(self, age, last_test_score, knowledge_level, learning_speed) -> str:
+        """Predict the next level for one student."""
+        try:
+            knowledge_code = self._category_codes['Knowledge_Level'][knowledge_level]
+            learning_code = self._category_codes['Learning_Speed'][learning_speed]
+        except KeyError as e:
+            raise ValueError(f"Unknown category label: {e}") from None
+        features = [
+            (age - self._mean[0]) / self._scale[0],
+            (last_test_score - self._mean[1]) / self._scale[1],
+            knowledge_code,
+            learning_code
+        ]
+        return self._target_classes[self.model.predict_one(features)]
+
+
+def read_model_artifact(base_path: str) -> ModelArtifact:
+    """Read an artifact from disk, checking its format, version and checksum."""
+    with open(f"{base_path}.json", encoding="utf-8") as manifest_file:
+        manifest = json.load(manifest_file)
+    if manifest.get("format") != ARTIFACT_FORMAT:
+        raise ValueError(f"{base_path}.json is not a {ARTIFACT_FORMAT} manifest")
+    if manifest.get("version") != ARTIFACT_VERSION:
+        raise ValueError(
+            f"Unsupported model artifact version {manifest.get('version')} (expected {ARTIFACT_VERSION}). "
+            "Re-run model_training.py to regenerate it."
+        )
+
+    if _file_sha256(f"{base_path}.npz") != manifest.get("sha256"):
+        raise ValueError(f"{base_path}.npz does not match the checksum in its manifest")
+    arrays = _map_npz(f"{base_path}.npz")
+    for name, spec in manifest["arrays"].items():
+        array = arrays.get(name)
+        if array is None or array.dtype.str != spec["dtype"] or list(array.shape) != spec["shape"]:
+            raise ValueError(f"{base_path}.npz does not match its manifest (array {name})")
+    return ModelArtifact(manifest, arrays)
+
+
+_loaded_artifacts: Dict[str, ModelArtifact] = {}
+_loaded_artifacts_lock = threading.Lock()
+
+
+def load_model_artifact(base_path: str) -> ModelArtifact:
+    """Return the artifact at base_path, mapping it only once per process."""
+    key = os.path.abspath(base_path)
+    artifact = _loaded_artifacts.get(key)
+    if artifact is None:
+        with _loaded_artifacts_lock:
+            artifact = _loaded_artifacts.get(key)
+            if artifact is None:
+                artifact = _loaded_artifacts[key] = read_model_artifact(base_path)
+    return artifact
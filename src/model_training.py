@@ -1,10 +1,44 @@
 import pandas as pd
 import numpy as np
 import os
+import sys
+import json
+import time
+import tempfile
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from sklearn.tree import DecisionTreeClassifier
 from sklearn.preprocessing import StandardScaler, LabelEncoder
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedKFold, ParameterGrid, ParameterSampler
+from sklearn.metrics import get_scorer
 import joblib
+from model_artifact import save_model_artifact
+from level_prediction import FEATURE_COLUMNS
+
+# Default search space for search_hyperparameters
+PARAM_GRID = {
+    'max_depth': [3, 4, 5, 6, 8, 10, None],
+    'min_samples_leaf': [1, 5, 20, 50],
+    'criterion': ['gini', 'entropy'],
+    'class_weight': ['balanced', None],
+}
+
+# Compact dtypes for streaming intel.csv-style files; categories become int8 codes
+CHUNK_DTYPES = {
+    'Age': 'int16',
+    'Last_Test_Score': 'float32',
+    'Knowledge_Level': 'category',
+    'Learning_Speed': 'category',
+    'Next_Level': 'category',
+}
+
+# Set in each search worker by _init_search_worker
+_SHARED_FEATURES = None
+_SHARED_TARGET = None
+_SHARED_FOLDS = None
 
 class EqualFeatureImportanceClassifier(DecisionTreeClassifier):
     def __init__(self, **kwargs):
@@ -26,31 +60,54 @@ class EqualFeatureImportanceClassifier(DecisionTreeClassifier):
     def feature_importances_(self):
         return self._feature_importances
 
-def train_and_save_model():
-    # Ensure the script is run from the correct directory
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    
-    # Load the dataset
-    df = pd.read_csv(os.path.join(script_dir, "intel.csv"))
-    
-    # Prepare features and target
-    X = df[['Age', 'Last_Test_Score', 'Knowledge_Level', 'Learning_Speed']].copy()
-    y = df['Next_Level']
+def _encode_training_data(df):
+    """
+    Encode and scale the training columns of intel.csv
+
+    Args:
+    df (DataFrame): Training data with FEATURE_COLUMNS and Next_Level
+
+    Returns:
+    tuple: (features DataFrame, encoded target, encoders dict)
+    """
+    X = df[FEATURE_COLUMNS].copy()
     
-    # Encode categorical variables
     le_knowledge = LabelEncoder()
     le_learning = LabelEncoder()
     le_target = LabelEncoder()
     
-    # Properly transform categorical columns
     X['Knowledge_Level'] = le_knowledge.fit_transform(X['Knowledge_Level'])
     X['Learning_Speed'] = le_learning.fit_transform(X['Learning_Speed'])
-    y = le_target.fit_transform(y)
+    y = le_target.fit_transform(df['Next_Level'])
     
-    # Normalize numerical features
     scaler = StandardScaler()
     X[['Age', 'Last_Test_Score']] = scaler.fit_transform(X[['Age', 'Last_Test_Score']])
     
+    return X, y, {
+        'knowledge_encoder': le_knowledge,
+        'learning_encoder': le_learning,
+        'target_encoder': le_target,
+        'scaler': scaler
+    }
+
+def _save_model(model, encoders, output_dir):
+    """Write the pickled model and encoders plus the pickle-free artifact."""
+    joblib.dump(model, os.path.join(output_dir, "student_performance_model.pkl"))
+    joblib.dump(encoders, os.path.join(output_dir, "label_encoders.pkl"))
+
+    # Pickle-free copy (tree arrays, encoder classes, scaler) for serving without scikit-learn
+    save_model_artifact(model, encoders, os.path.join(output_dir, "student_performance_model"))
+
+def train_and_save_model():
+    # Ensure the script is run from the correct directory
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    
+    # Load the dataset
+    df = pd.read_csv(os.path.join(script_dir, "intel.csv"))
+    
+    # Encode categorical variables and normalize numerical features
+    X, y, encoders = _encode_training_data(df)
+    
     # Split the data
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
     
@@ -65,23 +122,355 @@ def train_and_save_model():
     model.fit(X_train, y_train)
     
     # Save the model and encoders
-    joblib.dump(model, os.path.join(script_dir, "student_performance_model.pkl"))
-    joblib.dump({
-        'knowledge_encoder': le_knowledge,
-        'learning_encoder': le_learning,
-        'target_encoder': le_target,
-        'scaler': scaler
-    }, os.path.join(script_dir, "label_encoders.pkl"))
+    _save_model(model, encoders, script_dir)
     
     print("Model and encoders saved successfully!")
     
-    return model, {
+    return model, encoders
+
+def _init_search_worker(features_path, target_path, folds_path):
+    """Open the cached feature arrays once per worker process."""
+    global _SHARED_FEATURES, _SHARED_TARGET, _SHARED_FOLDS
+    _SHARED_FEATURES = np.load(features_path, mmap_mode='r')
+    _SHARED_TARGET = np.load(target_path, mmap_mode='r')
+    _SHARED_FOLDS = np.load(folds_path, mmap_mode='r')
+
+def _evaluate_fold(candidate_id, params, fold, scoring, random_state):
+    """
+    Fit one candidate on every fold but one and score it on the held-out fold
+
+    Returns:
+    dict: Per-fold report row
+    """
+    start = time.perf_counter()
+    test_mask = _SHARED_FOLDS == fold
+    model = EqualFeatureImportanceClassifier(random_state=random_state, **params)
+    model.fit(_SHARED_FEATURES[~test_mask], _SHARED_TARGET[~test_mask])
+    fit_seconds = time.perf_counter() - start
+    
+    score = get_scorer(scoring)(model, _SHARED_FEATURES[test_mask], _SHARED_TARGET[test_mask])
+    return {
+        'candidate': candidate_id,
+        'params': params,
+        'fold': fold,
+        'score': float(score),
+        'fit_seconds': fit_seconds,
+        'score_seconds': time.perf_counter() - start - fit_seconds,
+        'worker_pid': os.getpid()
+    }
+
+def search_hyperparameters(data_path=None, param_grid=None, n_iter=None, n_splits=5,
+                           scoring='accuracy', workers=None, time_budget=None,
+                           output_dir=None, random_state=42):
+    """
+    Tune the decision tree with stratified k-fold cross-validation on a process pool
+
+    Features are encoded once and cached as .npy files that every worker
+    memory-maps, so intel.csv is read and encoded a single time. Each
+    (candidate, fold) pair is one task. When the time budget runs out no new
+    tasks are started; only candidates with every fold scored are ranked.
+    The best candidate is refit on all rows and saved like train_and_save_model.
+
+    Args:
+    data_path (str, optional): Training CSV, defaults to data/intel.csv
+    param_grid (dict, optional): Parameter lists, defaults to PARAM_GRID
+    n_iter (int, optional): Sample this many candidates instead of the full grid
+    n_splits (int): Number of stratified folds
+    scoring (str): scikit-learn scorer name
+    workers (int, optional): Process pool size, defaults to the CPU count
+    time_budget (float, optional): Seconds after which no new fits start
+    output_dir (str, optional): Where the model and report go, defaults to this directory
+    random_state (int): Seed for fold assignment, sampling and the trees
+
+    Returns:
+    tuple: (best model, encoders, report dict)
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_path = data_path or os.path.join(script_dir, "data", "intel.csv")
+    output_dir = output_dir or script_dir
+    param_grid = param_grid or PARAM_GRID
+    workers = workers or os.cpu_count() or 1
+    if n_splits < 2:
+        raise ValueError(f"n_splits must be at least 2, got {n_splits}")
+    if time_budget is not None and time_budget <= 0:
+        raise ValueError(f"time_budget must be positive, got {time_budget}")
+    
+    if n_iter:
+        candidates = list(ParameterSampler(param_grid, n_iter=n_iter, random_state=random_state))
+    else:
+        candidates = list(ParameterGrid(param_grid))
+    
+    start = time.perf_counter()
+    X, y, encoders = _encode_training_data(pd.read_csv(data_path))
+    features = X.to_numpy(dtype=np.float64)
+    
+    # Fold number of every row, so workers only need the cached arrays
+    folds = np.empty(len(y), dtype=np.int8)
+    splitter = StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=random_state)
+    for fold, (_, test_index) in enumerate(splitter.split(features, y)):
+        folds[test_index] = fold
+    encode_seconds = time.perf_counter() - start
+    
+    tasks = [(candidate_id, params, fold, scoring, random_state)
+             for candidate_id, params in enumerate(candidates)
+             for fold in range(n_splits)]
+    fold_results = []
+    stopped_early = False
+    
+    with tempfile.TemporaryDirectory(prefix="feature_cache_") as cache_dir:
+        cache_paths = []
+        for name, array in (("features", features), ("target", y), ("folds", folds)):
+            path = os.path.join(cache_dir, f"{name}.npy")
+            np.save(path, array)
+            cache_paths.append(path)
+        
+        def budget_left():
+            return time_budget is None or time.perf_counter() - start < time_budget
+        
+        if workers == 1:
+            _init_search_worker(*cache_paths)
+            for task in tasks:
+                if not budget_left():
+                    stopped_early = True
+                    break
+                fold_results.append(_evaluate_fold(*task))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker,
+                                     initargs=tuple(cache_paths)) as executor:
+                pending = set()
+                next_task = 0
+                # Keep the pool just full so the budget check gates every new fit
+                while next_task < len(tasks) or pending:
+                    while next_task < len(tasks) and len(pending) < workers and not stopped_early:
+                        if budget_left():
+                            pending.add(executor.submit(_evaluate_fold, *tasks[next_task]))
+                            next_task += 1
+                        else:
+                            stopped_early = True
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    fold_results.extend(future.result() for future in done)
+    
+    # Rank the candidates that were scored on every fold
+    scores_by_candidate = {}
+    for row in fold_results:
+        scores_by_candidate.setdefault(row['candidate'], []).append(row['score'])
+    summaries = [
+        {
+            'candidate': candidate_id,
+            'params': candidates[candidate_id],
+            'mean_score': float(np.mean(scores)),
+            'std_score': float(np.std(scores))
+        }
+        for candidate_id, scores in scores_by_candidate.items()
+        if len(scores) == n_splits
+    ]
+    if not summaries:
+        raise ValueError(
+            f"Time budget of {time_budget}s ran out before any candidate finished all {n_splits} folds"
+        )
+    summaries.sort(key=lambda summary: (-summary['mean_score'], summary['candidate']))
+    best = summaries[0]
+    
+    model = EqualFeatureImportanceClassifier(random_state=random_state, **best['params'])
+    model.fit(X, y)
+    _save_model(model, encoders, output_dir)
+    
+    report = {
+        'data_path': data_path,
+        'rows': int(len(y)),
+        'scoring': scoring,
+        'n_splits': n_splits,
+        'workers': workers,
+        'time_budget': time_budget,
+        'stopped_early': stopped_early,
+        'candidates_total': len(candidates),
+        'candidates_completed': len(summaries),
+        'encode_seconds': encode_seconds,
+        'total_seconds': time.perf_counter() - start,
+        'best': best,
+        'candidates': summaries,
+        'folds': sorted(fold_results, key=lambda row: (row['candidate'], row['fold']))
+    }
+    report_path = os.path.join(output_dir, "training_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    
+    print(f"Best {scoring} {best['mean_score']:.4f} (+/- {best['std_score']:.4f}) with {best['params']}")
+    print(f"{len(summaries)}/{len(candidates)} candidates completed in {report['total_seconds']:.1f}s, "
+          f"report saved to {report_path}")
+    
+    return model, encoders, report
+
+def _peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def _chunk_codes(values, vocabulary):
+    """
+    Map a categorical chunk column to provisional int8 codes
+
+    New labels are appended to the vocabulary in order of appearance, so
+    codes stay stable across chunks and are remapped once at the end.
+    """
+    categories = values.cat.categories
+    for label in categories:
+        if label not in vocabulary:
+            if len(vocabulary) == np.iinfo(np.int8).max:
+                raise ValueError(f"Too many distinct values in column {values.name}")
+            vocabulary[label] = len(vocabulary)
+    codes = values.cat.codes.to_numpy()
+    if (codes < 0).any():
+        raise ValueError(f"Missing values in column {values.name}")
+    lookup = np.array([vocabulary[label] for label in categories], dtype=np.int8)
+    return lookup[codes]
+
+def _fitted_label_encoder(vocabulary):
+    """
+    Build a LabelEncoder from an incrementally collected vocabulary
+
+    Returns:
+    tuple: (encoder, int8 array mapping provisional codes to encoder codes)
+    """
+    encoder = LabelEncoder()
+    encoder.classes_ = np.array(sorted(vocabulary), dtype=object)
+    remap = np.empty(len(vocabulary), dtype=np.int8)
+    for code, label in enumerate(encoder.classes_):
+        remap[vocabulary[label]] = code
+    return encoder, remap
+
+def train_out_of_core(data_path=None, chunk_size=500_000, sample_size=1_000_000,
+                      model_params=None, output_dir=None, random_state=42):
+    """
+    Train on a CSV too large for memory by streaming it in chunks
+
+    Each chunk is read with CHUNK_DTYPES, the scaler is updated with
+    partial_fit and the label vocabularies grow as new values appear. A
+    uniform reservoir sample of at most sample_size rows is kept in compact
+    arrays, and the tree is fit on that sample once the file is consumed.
+    Memory is bounded by one chunk plus the reservoir, whatever the file size.
+
+    Args:
+    data_path (str, optional): Training CSV, defaults to data/intel.csv
+    chunk_size (int): Rows read per chunk
+    sample_size (int): Maximum rows the tree is trained on
+    model_params (dict, optional): Tree parameters, defaults to those of train_and_save_model
+    output_dir (str, optional): Where the model and report go, defaults to this directory
+    random_state (int): Seed for the reservoir sample and the tree
+
+    Returns:
+    tuple: (model, encoders, report dict)
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_path = data_path or os.path.join(script_dir, "data", "intel.csv")
+    output_dir = output_dir or script_dir
+    model_params = model_params or {'max_depth': 5, 'class_weight': 'balanced'}
+    if chunk_size < 1 or sample_size < 1:
+        raise ValueError("chunk_size and sample_size must be positive")
+    
+    start = time.perf_counter()
+    rng = np.random.default_rng(random_state)
+    scaler = StandardScaler()
+    vocabularies = {'Knowledge_Level': {}, 'Learning_Speed': {}, 'Next_Level': {}}
+    
+    # Reservoir of unscaled numeric features, provisional category codes and targets
+    sample_numeric = np.empty((sample_size, 2), dtype=np.float32)
+    sample_codes = np.empty((sample_size, 2), dtype=np.int8)
+    sample_target = np.empty(sample_size, dtype=np.int8)
+    rows_seen = 0
+    
+    reader = pd.read_csv(data_path, usecols=list(CHUNK_DTYPES), dtype=CHUNK_DTYPES, chunksize=chunk_size)
+    for chunk in reader:
+        numeric = chunk[['Age', 'Last_Test_Score']].to_numpy(dtype=np.float32)
+        scaler.partial_fit(numeric)
+        codes = np.column_stack([
+            _chunk_codes(chunk['Knowledge_Level'], vocabularies['Knowledge_Level']),
+            _chunk_codes(chunk['Learning_Speed'], vocabularies['Learning_Speed'])
+        ])
+        target = _chunk_codes(chunk['Next_Level'], vocabularies['Next_Level'])
+        
+        # Fill the reservoir first, then replace slots with probability sample_size / row number
+        n = len(chunk)
+        fill = min(max(sample_size - rows_seen, 0), n)
+        if fill:
+            sample_numeric[rows_seen:rows_seen + fill] = numeric[:fill]
+            sample_codes[rows_seen:rows_seen + fill] = codes[:fill]
+            sample_target[rows_seen:rows_seen + fill] = target[:fill]
+        if fill < n:
+            row_numbers = np.arange(rows_seen + fill + 1, rows_seen + n + 1)
+            slots = (rng.random(n - fill) * row_numbers).astype(np.int64)
+            keep = np.flatnonzero(slots < sample_size)
+            # Later rows overwrite earlier ones that drew the same slot
+            slots, last = np.unique(slots[keep][::-1], return_index=True)
+            source = fill + keep[::-1][last]
+            sample_numeric[slots] = numeric[source]
+            sample_codes[slots] = codes[source]
+            sample_target[slots] = target[source]
+        rows_seen += n
+    
+    if rows_seen == 0:
+        raise ValueError(f"No rows found in {data_path}")
+    read_seconds = time.perf_counter() - start
+    
+    le_knowledge, knowledge_remap = _fitted_label_encoder(vocabularies['Knowledge_Level'])
+    le_learning, learning_remap = _fitted_label_encoder(vocabularies['Learning_Speed'])
+    le_target, target_remap = _fitted_label_encoder(vocabularies['Next_Level'])
+    
+    n_sample = min(rows_seen, sample_size)
+    scaled = scaler.transform(sample_numeric[:n_sample]).astype(np.float32)
+    X = pd.DataFrame({
+        'Age': scaled[:, 0],
+        'Last_Test_Score': scaled[:, 1],
+        'Knowledge_Level': knowledge_remap[sample_codes[:n_sample, 0]],
+        'Learning_Speed': learning_remap[sample_codes[:n_sample, 1]]
+    }, columns=FEATURE_COLUMNS)
+    y = target_remap[sample_target[:n_sample]]
+    
+    model = EqualFeatureImportanceClassifier(random_state=random_state, **model_params)
+    model.fit(X, y)
+    encoders = {
         'knowledge_encoder': le_knowledge,
         'learning_encoder': le_learning,
         'target_encoder': le_target,
         'scaler': scaler
     }
+    _save_model(model, encoders, output_dir)
+    
+    total_seconds = time.perf_counter() - start
+    report = {
+        'data_path': data_path,
+        'rows': rows_seen,
+        'sample_rows': n_sample,
+        'chunk_size': chunk_size,
+        'read_seconds': read_seconds,
+        'total_seconds': total_seconds,
+        'rows_per_second': rows_seen / total_seconds,
+        'peak_rss_mb': _peak_rss_mb(),
+        'model_params': model_params
+    }
+    report_path = os.path.join(output_dir, "training_report.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    
+    peak = report['peak_rss_mb']
+    print(f"Trained on {n_sample:,} sampled of {rows_seen:,} rows in {total_seconds:.1f}s "
+          f"({report['rows_per_second']:,.0f} rows/s, peak RSS "
+          f"{'n/a' if peak is None else f'{peak:.0f} MB'}), report saved to {report_path}")
+    
+    return model, encoders, report
 
 # Run the training and save the model
 if __name__ == "__main__":
-    train_and_save_model()
\ No newline at end of file
+    # python model_training.py --search [time_budget_seconds]
+    # python model_training.py --out-of-core <data.csv>
+    if len(sys.argv) > 1 and sys.argv[1] == "--search":
+        search_hyperparameters(time_budget=float(sys.argv[2]) if len(sys.argv) > 2 else None)
+    elif len(sys.argv) > 1 and sys.argv[1] == "--out-of-core":
+        train_out_of_core(sys.argv[2] if len(sys.argv) > 2 else None)
+    else:
+        train_and_save_model()
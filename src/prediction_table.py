@@ -0,0 +1,152 @@
+# prediction_table.py
+import ast
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# An axis is either an inclusive integer range (low, high) or a tuple of labels
+Axis = Union[Tuple[int, int], Tuple[str, ...]]
+
+# Grid rows predicted per call while building a table
+BUILD_BATCH_ROWS = 250_000
+
+
+def _is_range(axis: Axis) -> bool:
+    return len(axis) == 2 and all(isinstance(bound, (int, np.integer)) for bound in axis)
+
+
+class PredictionTable:
+    """
+    Model predictions precomputed over a discretized input grid.
+
+    Each axis is an inclusive integer range or a list of category labels, and
+    the table holds the predicted class code for every grid point. A lookup is
+    a constant-time array index. Inputs outside the grid (fractional values,
+    out-of-range numbers, unknown labels) return None so callers can fall
+    back to the model.
+    """
+
+    def __init__(self, columns: Sequence[str], axes: Sequence[Axis], table: np.ndarray, classes: Sequence[str]):
+        """
+        Args:
+            columns: Input name per axis
+            axes: Integer range or labels per axis
+            table: Class code per grid point, one dimension per axis
+            classes: Label of each class code
+        """
+        if len(columns) != len(axes) or table.ndim != len(axes):
+            raise ValueError("columns, axes and table dimensions must match")
+
+        self.columns = list(columns)
+        self.axes = [
+            (int(axis[0]), int(axis[1])) if _is_range(axis) else tuple(str(label) for label in axis)
+            for axis in axes
+        ]
+        self.table = table
+        self.classes = [str(label) for label in classes]
+
+        # Per axis: (low, high) for ranges, label -> index for categories
+        self._resolvers = []
+        for axis, size in zip(self.axes, table.shape):
+            if _is_range(axis):
+                low, high = axis
+                if high - low + 1 != size:
+                    raise ValueError(f"Axis {axis} does not match table size {size}")
+                self._resolvers.append((low, high))
+            else:
+                if len(axis) != size:
+                    raise ValueError(f"Axis {axis} does not match table size {size}")
+                self._resolvers.append({label: index for index, label in enumerate(axis)})
+
+    @classmethod
+    def build(cls, columns: Sequence[str], axes: Sequence[Axis], classes: Sequence[str],
+              predict: Callable[[pd.DataFrame], Sequence[str]]) -> "PredictionTable":
+        """
+        Evaluate a model over every grid point.
+
+        Args:
+            columns: Input name per axis
+            axes: Integer range or labels per axis
+            classes: All labels the model can predict
+            predict: Function mapping a DataFrame of grid rows to predicted labels
+
+        Returns:
+            The filled table
+        """
+        values = [
+            np.arange(axis[0], axis[1] + 1) if _is_range(axis) else np.array(axis, dtype=object)
+            for axis in axes
+        ]
+        shape = tuple(len(axis_values) for axis_values in values)
+        class_labels = np.array([str(label) for label in classes])
+        if len(class_labels) > np.iinfo(np.int8).max:
+            raise ValueError(f"Too many classes for an int8 table: {len(class_labels)}")
+        # Labels are mapped to codes with a binary search over the sorted classes
+        order = np.argsort(class_labels)
+        sorted_labels = class_labels[order]
+
+        table = np.empty(int(np.prod(shape)), dtype=np.int8)
+        for start in range(0, len(table), BUILD_BATCH_ROWS):
+            flat = np.arange(start, min(start + BUILD_BATCH_ROWS, len(table)))
+            grid = pd.DataFrame({
+                column: axis_values[index]
+                for column, axis_values, index in zip(columns, values, np.unravel_index(flat, shape))
+            })
+            labels = np.asarray(predict(grid)).astype(str)
+            positions = np.minimum(np.searchsorted(sorted_labels, labels), len(sorted_labels) - 1)
+            if (sorted_labels[positions] != labels).any():
+                raise ValueError("Model predicted a label outside classes")
+            table[flat] = order[positions]
+
+        return cls(columns, axes, table.reshape(shape), classes)
+
+    def index(self, *values) -> Optional[Tuple[int, ...]]:
+        """Return the grid index of the inputs, or None if they are off the grid."""
+        if len(values) != len(self._resolvers):
+            raise ValueError(f"Expected {len(self._resolvers)} values, got {len(values)}")
+
+        index = []
+        for value, resolver in zip(values, self._resolvers):
+            if isinstance(resolver, dict):
+                position = resolver.get(value)
+                if position is None:
+                    return None
+            else:
+                try:
+                    position = int(value)
+                except (TypeError, ValueError, OverflowError):
+                    return None
+                if position != value or not resolver[0] <= position <= resolver[1]:
+                    return None
+                position -= resolver[0]
+            index.append(position)
+        return tuple(index)
+
+    def lookup(self, *values) -> Optional[str]:
+        """
+        Return the precomputed prediction for the inputs.
+
+        Args:
+            values: One value per axis, in column order
+
+        Returns:
+            Predicted label, or None if the inputs are off the grid
+        """
+        index = self.index(*values)
+        if index is None:
+            return None
+        return self.classes[self.table[index]]
+
+    def save(self, path: str) -> None:
+        """Write the table to an .npz file."""
+        axes = np.array([repr(axis) for axis in self.axes])
+        np.savez(path, table=self.table, columns=np.array(self.columns), axes=axes,
+                 classes=np.array(self.classes))
+
+    @classmethod
+    def load(cls, path: str) -> "PredictionTable":
+        """Read a table written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            axes = [ast.literal_eval(axis) for axis in data['axes'].tolist()]
+            return cls(data['columns'].tolist(), axes, data['table'], data['classes'].tolist())
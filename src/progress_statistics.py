@@ -0,0 +1,189 @@
+# progress_statistics.py
+import json
+import os
+import tempfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# History columns the running statistics need
+STATISTICS_COLUMNS = ["test_score", "time_spent_studying"]
+
+# (count, mean_x, mean_y, m2_x, m2_y, c_xy): count, means, sums of squared
+# deviations and sum of cross-deviations of (x, y) pairs
+Moments = Tuple[int, float, float, float, float, float]
+EMPTY_MOMENTS: Moments = (0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+def _batch_moments(x: np.ndarray, y: np.ndarray) -> Moments:
+    if len(x) == 0:
+        return EMPTY_MOMENTS
+    mean_x, mean_y = x.mean(), y.mean()
+    dx, dy = x - mean_x, y - mean_y
+    return (len(x), float(mean_x), float(mean_y), float(dx @ dx), float(dy @ dy), float(dx @ dy))
+
+
+def _merge_moments(a: Moments, b: Moments) -> Moments:
+    """Combine the moments of two batches (Chan et al.), without revisiting either batch."""
+    n_a, mean_xa, mean_ya, m2_xa, m2_ya, c_a = a
+    n_b, mean_xb, mean_yb, m2_xb, m2_yb, c_b = b
+    if n_b == 0:
+        return a
+    if n_a == 0:
+        return b
+    n = n_a + n_b
+    delta_x, delta_y = mean_xb - mean_xa, mean_yb - mean_ya
+    weight = n_a * n_b / n
+    return (
+        n,
+        mean_xa + delta_x * n_b / n,
+        mean_ya + delta_y * n_b / n,
+        m2_xa + m2_xb + delta_x * delta_x * weight,
+        m2_ya + m2_yb + delta_y * delta_y * weight,
+        c_a + c_b + delta_x * delta_y * weight
+    )
+
+
+class ProgressStatistics:
+    """
+    Running statistics over a student's test history.
+
+    Holds enough to produce the comprehensive analysis report without the
+    rows themselves: row count, score count and mean, first and last score,
+    and the moments of (study time, score) and (test number, score) pairs
+    for the correlation and the trend line. update() folds in new rows in
+    O(new rows).
+    """
+
+    def __init__(self):
+        self.total_tests = 0
+        self.score_count = 0
+        self.score_mean = 0.0
+        self.first_score: Optional[float] = None
+        self.last_score: Optional[float] = None
+        self.study_time_moments: Moments = EMPTY_MOMENTS
+        self.trend_moments: Moments = EMPTY_MOMENTS
+
+    def update(self, rows: pd.DataFrame) -> None:
+        """
+        Fold history rows appended after the ones already seen into the statistics.
+
+        Args:
+            rows: New rows, oldest first, with test_score and time_spent_studying
+        """
+        if rows.empty:
+            return
+        scores = pd.to_numeric(rows['test_score'], errors='coerce').to_numpy(dtype=np.float64)
+        study_time = pd.to_numeric(rows['time_spent_studying'], errors='coerce').to_numpy(dtype=np.float64)
+        test_numbers = np.arange(self.total_tests, self.total_tests + len(rows), dtype=np.float64)
+
+        if self.first_score is None:
+            self.first_score = float(scores[0])
+        self.last_score = float(scores[-1])
+        self.total_tests += len(rows)
+
+        # NaNs are skipped per statistic, as pandas mean() and corr() do
+        has_score = ~np.isnan(scores)
+        batch_count = int(has_score.sum())
+        if batch_count:
+            self.score_mean += (scores[has_score].mean() - self.score_mean) * batch_count / (self.score_count + batch_count)
+            self.score_count += batch_count
+
+        paired = has_score & ~np.isnan(study_time)
+        self.study_time_moments = _merge_moments(
+            self.study_time_moments, _batch_moments(study_time[paired], scores[paired])
+        )
+        self.trend_moments = _merge_moments(
+            self.trend_moments, _batch_moments(test_numbers[has_score], scores[has_score])
+        )
+
+    def score_improvement(self) -> float:
+        """Percentage change from the first to the last score, 0 with fewer than two tests."""
+        if self.total_tests < 2:
+            return 0
+        return ((np.float64(self.last_score) - self.first_score) / np.float64(self.first_score)) * 100
+
+    def study_time_correlation(self) -> float:
+        """Pearson correlation of study time and score, NaN when undefined."""
+        count, _, _, m2_time, m2_score, cross = self.study_time_moments
+        if count < 2 or m2_time <= 0 or m2_score <= 0:
+            return float('nan')
+        return cross / np.sqrt(m2_time * m2_score)
+
+    def trend(self) -> Tuple[float, float]:
+        """(slope, intercept) of the least-squares line through (test number, score)."""
+        count, mean_x, mean_y, m2_x, _, cross = self.trend_moments
+        if count < 2 or m2_x <= 0:
+            return 0.0, mean_y
+        slope = cross / m2_x
+        return slope, mean_y - slope * mean_x
+
+    def report(self) -> Dict:
+        """The statistical report of EnhancedProgressVisualizer.comprehensive_progress_analysis."""
+        return {
+            'total_tests': self.total_tests,
+            'average_score': self.score_mean if self.score_count else float('nan'),
+            'score_improvement': self.score_improvement(),
+            'study_time_correlation': self.study_time_correlation()
+        }
+
+    def to_dict(self) -> Dict:
+        return {
+            'total_tests': self.total_tests,
+            'score_count': self.score_count,
+            'score_mean': self.score_mean,
+            'first_score': self.first_score,
+            'last_score': self.last_score,
+            'study_time_moments': list(self.study_time_moments),
+            'trend_moments': list(self.trend_moments)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ProgressStatistics':
+        stats = cls()
+        stats.total_tests = data['total_tests']
+        stats.score_count = data['score_count']
+        stats.score_mean = data['score_mean']
+        stats.first_score = data['first_score']
+        stats.last_score = data['last_score']
+        stats.study_time_moments = tuple(data['study_time_moments'])
+        stats.trend_moments = tuple(data['trend_moments'])
+        return stats
+
+
+def load_statistics(path: str, source: str) -> Tuple[ProgressStatistics, Optional[object]]:
+    """
+    Read statistics saved by save_statistics().
+
+    Args:
+        path: Statistics JSON file
+        source: Identifies where the history positions come from, e.g. the backend class
+
+    Returns:
+        (statistics, history position), or empty statistics and None when
+        the file is missing, unreadable or was written for another source
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('source') == source:
+            return ProgressStatistics.from_dict(data['statistics']), data['position']
+    except FileNotFoundError:
+        pass
+    except (ValueError, KeyError, TypeError) as e:
+        print(f"Recomputing progress statistics, could not read {path}: {e}")
+    return ProgressStatistics(), None
+
+
+def save_statistics(path: str, source: str, stats: ProgressStatistics, position) -> None:
+    """Write statistics and the history position they cover, atomically."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump({'source': source, 'position': position, 'statistics': stats.to_dict()}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
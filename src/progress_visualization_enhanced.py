@@ -1,64 +1,275 @@
+import io
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 import pandas as pd
-import matplotlib.pyplot as plt
+import matplotlib
 import seaborn as sns
 import numpy as np
+import matplotlib.dates as mdates
+from matplotlib.figure import Figure
+from storage_backends import get_storage_backend, init_worker_storage_backend, storage_backend_spec
+from progress_statistics import STATISTICS_COLUMNS, ProgressStatistics, load_statistics, save_statistics
+from render_cache import RenderCache
+from subject_masks import encode_subjects, subject_counts
+from downsampling import downsample_indices
 
-class EnhancedProgressVisualizer:
-    def __init__(self, student_id):
-        self.student_id = student_id
-        self.progress_file = f'student_progress_{student_id}.csv'
+REPORTS_DIR = 'progress_visualizations'
+RENDER_CACHE_SUBDIR = 'render_cache'
+# png for files, svg or html (a page around the svg) for embedding in web pages
+REPORT_FORMATS = ('png', 'svg', 'html')
+# Part of every render cache key; bump version when ReportFigure draws differently
+REPORT_CHART_CONFIG = {
+    'chart': 'comprehensive_analysis',
+    'version': 4,
+    'figsize': (15, 10),
+    # Longer score histories are down-sampled to this many display points
+    'max_score_points': 1000,
+    'downsampling': 'lttb',
+    'matplotlib': matplotlib.__version__
+}
+
+
+class ReportFigure:
+    """
+    The four-panel comprehensive analysis figure, reusable across students.
+
+    Uses a Figure with its own Agg canvas instead of pyplot, so there is no
+    global figure state. Titles, axis labels and the line and scatter
+    artists are created once and only their data changes between students;
+    the pie and bar panels are redrawn. The subplot layout is computed on
+    the first render and kept, which saves a layout pass per student.
+
+    Score histories longer than max_score_points are down-sampled for
+    display (LTTB by default, see downsampling.py) and drawn without
+    markers; the trend line is still fitted to every test. The study time
+    scatter then shows an evenly spaced subset of the same size.
+    """
     
-    def comprehensive_progress_analysis(self):
-        """
-        Perform comprehensive progress analysis with multiple visualizations
-        """
-        # Read the progress data
-        df = pd.read_csv(self.progress_file)
+    def __init__(self):
+        self.figure = Figure(figsize=REPORT_CHART_CONFIG['figsize'])
+        self.axes = self.figure.subplots(2, 2).ravel()
+        score_ax, _, study_time_ax, _ = self.axes
         
-        # Convert date column to datetime
-        df['date'] = pd.to_datetime(df['date'])
+        score_ax.set_title('Test Score Progression')
+        score_ax.set_xlabel('Date')
+        score_ax.set_ylabel('Test Score')
+        score_ax.xaxis.axis_date()
+        score_ax.tick_params(axis='x', labelrotation=45)
+        self._score_line, = score_ax.plot([], [], marker='o')
+        self._trend_line, = score_ax.plot([], [], "r--", label='Trend Line')
         
-        # Create a multi-panel visualization
-        plt.figure(figsize=(15, 10))
+        study_time_ax.set_title('Study Time vs Test Score')
+        study_time_ax.set_xlabel('Time Spent Studying (Hours)')
+        study_time_ax.set_ylabel('Test Score')
+        self._study_time_points = study_time_ax.scatter([], [])
+        self._laid_out = False
+    
+    def render(self, df, path, subjects=None):
+        """
+        Draw the charts for one student's history and save them to path atomically.
         
-        # 1. Score Progression with Trend Line
-        plt.subplot(2, 2, 1)
-        plt.plot(df['date'], df['test_score'], marker='o')
-        plt.title('Test Score Progression')
-        plt.xlabel('Date')
-        plt.ylabel('Test Score')
-        plt.xticks(rotation=45)
+        Args:
+            df: Test history with a parsed date column
+            path: File to write; the extension picks the format (.png, .svg or .html)
+            subjects: (masks, vocabulary) of df's subjects_tested, as returned by
+                the storage backend's get_subject_masks(); encoded from df if None
+        """
+        output_format = os.path.splitext(path)[1].lstrip('.').lower()
+        if output_format not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported report format {output_format!r}, use one of {', '.join(REPORT_FORMATS)}")
+        self.draw(df, subjects)
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=f'.{output_format}')
+        try:
+            if output_format == 'png':
+                with os.fdopen(fd, 'wb') as f:
+                    self.figure.savefig(f, format='png')
+            else:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(self._svg() if output_format == 'svg' else self._html())
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    
+    def svg(self, df, subjects=None):
+        """
+        Draw the charts for one student's history and return them as an <svg> element.
+
+        Text is kept as SVG text rather than glyph outlines, so the markup is
+        small enough to embed in a page, e.g. with st.markdown(svg,
+        unsafe_allow_html=True) in the Streamlit apps. subjects is as in render().
+        """
+        self.draw(df, subjects)
+        return self._svg_element()
+    
+    def _svg(self):
+        output = io.StringIO()
+        with matplotlib.rc_context({'svg.fonttype': 'none'}):
+            self.figure.savefig(output, format='svg')
+        return output.getvalue()
+    
+    def _svg_element(self):
+        svg = self._svg()
+        # Drop the XML prolog and DOCTYPE, which are not allowed inside HTML
+        return svg[svg.index('<svg'):]
+    
+    def _html(self):
+        svg = self._svg_element()
+        return (
+            '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+            '<title>Comprehensive Progress Analysis</title>\n</head>\n<body>\n'
+            f'{svg}</body>\n</html>\n'
+        )
+    
+    def draw(self, df, subjects=None):
+        """Update the figure for one student's history (df with a parsed date column)."""
+        score_ax, subjects_ax, study_time_ax, level_ax = self.axes
         
-        # Add trend line
+        # 1. Score Progression with Trend Line
+        dates = mdates.date2num(df['date'])
+        scores = df['test_score'].to_numpy(dtype=float)
         z = np.polyfit(range(len(df)), df['test_score'], 1)
         p = np.poly1d(z)
-        plt.plot(df['date'], p(range(len(df))), "r--", label='Trend Line')
+        shown = downsample_indices(
+            dates, scores, REPORT_CHART_CONFIG['max_score_points'], REPORT_CHART_CONFIG['downsampling']
+        )
+        self._score_line.set_data(dates[shown], scores[shown])
+        # Markers only help while individual tests can be told apart
+        self._score_line.set_marker('o' if len(shown) == len(df) else '')
+        self._trend_line.set_data(dates[shown], p(shown))
+        score_ax.relim()
+        score_ax.autoscale_view()
         
         # 2. Subjects Distribution Pie Chart
-        plt.subplot(2, 2, 2)
-        subjects = df['subjects_tested'].str.split(', ', expand=True).stack()
-        subject_counts = subjects.value_counts()
-        plt.pie(subject_counts, labels=subject_counts.index, autopct='%1.1f%%')
-        plt.title('Subjects Tested Distribution')
+        subjects_ax.clear()
+        if subjects is None or len(subjects[0]) != len(df):
+            # No masks, or rows were appended after df was read
+            subjects = encode_subjects(df['subjects_tested'])
+        masks, vocabulary = subjects
+        counts = subject_counts(masks, vocabulary, df['subjects_tested'])
+        subjects_ax.pie(counts, labels=counts.index, autopct='%1.1f%%')
+        subjects_ax.set_title('Subjects Tested Distribution')
         
         # 3. Study Time vs Test Score Scatter Plot
-        plt.subplot(2, 2, 3)
-        plt.scatter(df['time_spent_studying'], df['test_score'])
-        plt.title('Study Time vs Test Score')
-        plt.xlabel('Time Spent Studying (Hours)')
-        plt.ylabel('Test Score')
+        points = np.column_stack([df['time_spent_studying'], df['test_score']]).astype(float)
+        max_points = REPORT_CHART_CONFIG['max_score_points']
+        if len(points) > max_points:
+            # Evenly spaced tests; the axis limits below still cover all of them
+            self._study_time_points.set_offsets(points[np.linspace(0, len(points) - 1, max_points).astype(int)])
+        else:
+            self._study_time_points.set_offsets(points)
+        study_time_ax.ignore_existing_data_limits = True
+        study_time_ax.update_datalim(points[~np.isnan(points).any(axis=1)])
+        study_time_ax.autoscale_view()
         
         # 4. Level Progression Bar Chart
-        plt.subplot(2, 2, 4)
+        level_ax.clear()
         level_progression = df['predicted_level'].value_counts()
-        level_progression.plot(kind='bar')
-        plt.title('Learning Level Progression')
-        plt.xlabel('Learning Level')
-        plt.ylabel('Number of Tests')
+        level_progression.plot(kind='bar', ax=level_ax)
+        level_ax.set_title('Learning Level Progression')
+        level_ax.set_xlabel('Learning Level')
+        level_ax.set_ylabel('Number of Tests')
         
-        plt.tight_layout()
-        plt.savefig(f'progress_visualizations/comprehensive_analysis_{self.student_id}.png')
-        plt.close()
+        if not self._laid_out:
+            self.figure.tight_layout()
+            self._laid_out = True
+
+
+# One render cache per directory and process
+_render_caches = {}
+_render_caches_lock = threading.Lock()
+
+
+def get_render_cache(output_dir=REPORTS_DIR, output_format='png'):
+    """Return the shared render cache for output_format under output_dir, creating it on first use."""
+    directory = os.path.abspath(os.path.join(output_dir, RENDER_CACHE_SUBDIR))
+    key = (directory, output_format)
+    cache = _render_caches.get(key)
+    if cache is None:
+        with _render_caches_lock:
+            cache = _render_caches.get(key)
+            if cache is None:
+                cache = _render_caches[key] = RenderCache(directory, suffix=f'.{output_format}')
+    return cache
+
+
+def report_path(output_dir, student_id, output_format='png'):
+    """Where the comprehensive analysis charts of a student are written."""
+    if output_format not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format {output_format!r}, use one of {', '.join(REPORT_FORMATS)}")
+    return os.path.join(output_dir, f'comprehensive_analysis_{student_id}.{output_format}')
+
+
+def _history_source(backend, student_id, cache):
+    """What a student's chart depends on, for RenderCache.remember(); None if the backend cannot tell cheaply."""
+    signature = backend.history_signature(student_id)
+    if signature is None:
+        return None
+    return {'history': signature, 'chart': dict(REPORT_CHART_CONFIG, format=cache.suffix)}
+
+
+def _render_cached(df, student_id, path, get_figure, cache, force=False, source=None):
+    """
+    Render df to path unless the cache already has the same chart.
+
+    Args:
+        student_id: Whose history df is; the pie chart is drawn from the
+            subject masks the storage backend keeps for it
+        get_figure: Returns the ReportFigure to draw with, only called on a miss
+        force: Redraw and replace the cache entry even if present
+        source: _history_source() taken before df was read; remembered for path
+            so an unchanged history is not read again (see _render_report())
+
+    Returns:
+        True on a cache hit
+    """
+    key = cache.key(df, dict(REPORT_CHART_CONFIG, format=cache.suffix))
+    hit = not force and cache.lookup(key) is not None
+    if not hit:
+        cache.store(key, lambda entry_path: get_figure().render(
+            df, entry_path, get_storage_backend().get_subject_masks(student_id)
+        ))
+    cache.place(key, path)
+    if source is not None:
+        cache.remember(path, source, key)
+    return hit
+
+
+class EnhancedProgressVisualizer:
+    def __init__(self, student_id):
+        self.student_id = student_id
+        self.progress_file = f'student_progress_{student_id}.csv'
+        # Running statistics for progress_report(), kept next to the history CSV
+        self.statistics_file = f'{self.progress_file}.stats.json'
+    
+    def comprehensive_progress_analysis(self, force=False, output_format='png'):
+        """
+        Perform comprehensive progress analysis with multiple visualizations
+
+        The charts are written to report_path(REPORTS_DIR, student_id,
+        output_format); output_format 'svg' or 'html' gives markup that web
+        pages can embed. They come from the render cache when this history
+        was drawn before; force redraws them.
+        """
+        backend = get_storage_backend()
+        cache = get_render_cache(REPORTS_DIR, output_format)
+        source = _history_source(backend, self.student_id, cache)
+        
+        # Read the progress data
+        df = backend.get_progress_history(self.student_id)
+        
+        # Convert date column to datetime
+        df['date'] = pd.to_datetime(df['date'])
+        
+        # Create a multi-panel visualization
+        _render_cached(df, self.student_id, report_path(REPORTS_DIR, self.student_id, output_format),
+                       ReportFigure, cache, force, source)
         
         # Generate detailed statistical report
         report = {
@@ -70,6 +281,26 @@ class EnhancedProgressVisualizer:
         
         return report
     
+    def progress_report(self):
+        """
+        The statistical report of comprehensive_progress_analysis, without the charts,
+        updated incrementally.
+
+        Running statistics are saved in statistics_file together with the
+        history position they cover. Each call reads only the test rows
+        appended since then, so the cost depends on the number of new rows,
+        not the length of the history. A rewritten history is read in full.
+        """
+        backend = get_storage_backend()
+        source = type(backend).__name__
+        stats, position = load_statistics(self.statistics_file, source)
+        rows, position, reset = backend.get_progress_history_since(self.student_id, position, STATISTICS_COLUMNS)
+        if reset:
+            stats = ProgressStatistics()
+        stats.update(rows)
+        save_statistics(self.statistics_file, source, stats, position)
+        return stats.report()
+    
     def calculate_score_improvement(self, df):
         """
         Calculate overall score improvement
@@ -88,6 +319,107 @@ class EnhancedProgressVisualizer:
         correlation = df['time_spent_studying'].corr(df['test_score'])
         return correlation
 
+# Figure template of the current render_reports worker, created on the first cache miss
+_worker_figure = None
+
+
+def _init_render_worker(backend_spec):
+    matplotlib.use('Agg')
+    init_worker_storage_backend(backend_spec)
+
+
+def _worker_report_figure():
+    global _worker_figure
+    if _worker_figure is None:
+        _worker_figure = ReportFigure()
+    return _worker_figure
+
+
+def _render_report(student_id, output_dir, force, output_format):
+    """Render one student's charts with the worker's figure; returns (student_id, seconds, error, cache hit)."""
+    start = time.perf_counter()
+    hit = False
+    try:
+        backend = get_storage_backend()
+        cache = get_render_cache(output_dir, output_format)
+        path = report_path(output_dir, student_id, output_format)
+        source = _history_source(backend, student_id, cache)
+        # Unchanged history: reuse the entry without reading or hashing the rows
+        key = cache.recall(path, source) if source is not None and not force else None
+        if key is not None and cache.lookup(key) is not None:
+            cache.place(key, path)
+            hit = True
+        else:
+            df = backend.get_progress_history(student_id)
+            df['date'] = pd.to_datetime(df['date'])
+            hit = _render_cached(df, student_id, path, _worker_report_figure, cache, force, source)
+        error = None
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return student_id, time.perf_counter() - start, error, hit
+
+
+def render_reports(student_ids, workers=None, output_dir=REPORTS_DIR, force=False, output_format='png'):
+    """
+    Render comprehensive_analysis_<id>.<output_format> for many students in a process pool.
+    
+    Each worker process uses the Agg backend and redraws one ReportFigure
+    for all of its students. Workers read histories through their own
+    copy of the active storage backend, rebuilt from storage_backend_spec()
+    so no SQLite connection crosses a fork. Students whose history did not change since it
+    was last drawn are served from the render cache under output_dir;
+    when the backend's history_signature() shows no change the history is
+    not even read. A student whose history cannot be read or drawn is reported as failed
+    and does not stop the batch.
+    
+    Args:
+        student_ids: Students to render
+        workers: Number of processes; defaults to the CPU count, 1 renders in this process
+        output_dir: Directory for the chart files
+        force: Redraw every student, ignoring the render cache
+        output_format: One of REPORT_FORMATS
+        
+    Returns:
+        dict with render_seconds (student_id -> seconds), failed
+        (student_id -> error), cache_hits, cache_misses, total_seconds and
+        reports_per_second
+    """
+    if output_format not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format {output_format!r}, use one of {', '.join(REPORT_FORMATS)}")
+    student_ids = list(student_ids)
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    
+    start = time.perf_counter()
+    if workers == 1:
+        results = [_render_report(student_id, output_dir, force, output_format) for student_id in student_ids]
+    else:
+        # A few students per task keeps inter-process overhead low while balancing the load
+        chunksize = max(1, min(16, len(student_ids) // (workers * 4)))
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_render_worker, initargs=(storage_backend_spec(),)
+        ) as executor:
+            results = list(executor.map(
+                _render_report, student_ids, [output_dir] * len(student_ids), [force] * len(student_ids),
+                [output_format] * len(student_ids), chunksize=chunksize
+            ))
+    total_seconds = time.perf_counter() - start
+    
+    rendered = {student_id: seconds for student_id, seconds, error, _ in results if error is None}
+    failed = {student_id: error for student_id, _, error, _ in results if error is not None}
+    for student_id, error in failed.items():
+        print(f"Error rendering report for {student_id}: {error}")
+    hits = sum(1 for _, _, error, hit in results if error is None and hit)
+    return {
+        'render_seconds': rendered,
+        'failed': failed,
+        'cache_hits': hits,
+        'cache_misses': len(rendered) - hits,
+        'total_seconds': total_seconds,
+        'reports_per_second': len(rendered) / total_seconds if total_seconds > 0 else 0.0
+    }
+
+
 # Example Usage
 def main():
     # Create visualizer for a student
@@ -101,5 +433,22 @@ def main():
     for key, value in analysis_report.items():
         print(f"{key}: {value}")
 
+def render_main():
+    # python progress_visualization_enhanced.py --render-reports <workers> [--force] [--svg | --html] <student_id> ...
+    workers = int(sys.argv[2])
+    flags = {arg for arg in sys.argv[3:] if arg.startswith('--')}
+    output_format = 'html' if '--html' in flags else 'svg' if '--svg' in flags else 'png'
+    summary = render_reports([arg for arg in sys.argv[3:] if arg not in flags], workers=workers,
+                             force='--force' in flags, output_format=output_format)
+    times = sorted(summary['render_seconds'].values())
+    if times:
+        print(f"Rendered {len(times)} reports in {summary['total_seconds']:.1f}s "
+              f"({summary['reports_per_second']:.1f}/s), per student: "
+              f"median {times[len(times) // 2] * 1000:.0f} ms, max {times[-1] * 1000:.0f} ms")
+    print(f"Cache hits: {summary['cache_hits']}, misses: {summary['cache_misses']}, failed: {len(summary['failed'])}")
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == '--render-reports':
+        render_main()
+    else:
+        main()
\ No newline at end of file
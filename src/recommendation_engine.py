@@ -1,8 +1,26 @@
 # recommendation_engine.py
-from typing import Dict, List, Optional, Union
+import json
+import os
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from itertools import islice
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
 from study_materials import get_study_materials
 from Adaptive_Learning_Content_Generator import AdaptiveLearningContentGenerator
 from Student_Progress_Tracking_System import get_student_progress
+from collaborative_filtering import ItemItemModel
+from similar_materials import SimilarMaterialsIndex, load_or_build_index, material_documents
+from storage_backends import get_storage_backend, init_worker_storage_backend, storage_backend_spec
+
+# Trained offline with collaborative_filtering.py; used by the shared recommender when present
+COLLABORATIVE_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "item_item_model.npz")
+# Persisted similar-materials index, rebuilt when the materials change
+SIMILAR_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "similar_materials.npz")
+# Students per recommend_for_cohort task
+COHORT_CHUNK_SIZE = 1_000
+COHORT_FORMATS = {'.jsonl': 'jsonl', '.parquet': 'parquet'}
 
 # At the top of recommendation_engine.py
 try:
@@ -17,9 +35,12 @@ except ImportError:
         }
         
 class StudyMaterialRecommender:
-    def __init__(self):
+    def __init__(self, collaborative_model: Optional[ItemItemModel] = None):
         self.content_generator = AdaptiveLearningContentGenerator()
         self.study_materials = get_study_materials()
+        self.collaborative_model = collaborative_model
+        self._similar_index: Optional[SimilarMaterialsIndex] = None
+        self._similar_index_lock = threading.Lock()
         self._initialize_default_materials()
         
     def _initialize_default_materials(self) -> None:
@@ -57,8 +78,10 @@ class StudyMaterialRecommender:
     
     def _get_student_learning_speed(self, student_id: str, subject: str) -> str:
         """Determine learning speed based on student progress."""
-        progress = get_student_progress(student_id, subject)
-        
+        return self._learning_speed_from_progress(get_student_progress(student_id, subject))
+    
+    @staticmethod
+    def _learning_speed_from_progress(progress: Optional[Dict]) -> str:
         if not progress:
             return 'medium'  # Default if no progress data
         
@@ -71,6 +94,14 @@ class StudyMaterialRecommender:
             return 'slow'
         return 'medium'
     
+    def _rank_collaboratively(self, materials: List[Dict], progress: Dict) -> List[Dict]:
+        """Order materials by similarity to what the student completed, weighted by their score."""
+        weight = min(max(progress.get('average_score', 0) / 100, 0.0), 1.0)
+        history = {url: weight for url in progress.get('completed_materials', [])}
+        scores = self.collaborative_model.score_candidates(history, [m['url'] for m in materials])
+        order = sorted(range(len(materials)), key=lambda i: -scores[i])
+        return [materials[i] for i in order]
+    
     def recommend_materials(
         self, 
         subject: str, 
@@ -83,7 +114,9 @@ class StudyMaterialRecommender:
         Args:
             subject: The subject area (e.g., 'Mathematics')
             learning_speed: Optional manual override ('slow', 'medium', 'fast')
-            student_id: Optional student ID for personalized recommendations
+            student_id: Optional student ID for personalized recommendations.
+                With a collaborative model, the level's materials are ordered
+                by what similar students completed and scored well on.
             
         Returns:
             Dictionary with recommendations or None if subject not found
@@ -95,19 +128,21 @@ class StudyMaterialRecommender:
                 f"Subject '{subject}' not found. Available subjects: {', '.join(available_subjects)}"
             )
         
+        progress = get_student_progress(student_id, subject) if student_id else None
+        
         # Determine learning speed (priority: manual > student progress > default)
         if learning_speed is None and student_id:
-            learning_speed = self._get_student_learning_speed(student_id, subject)
+            learning_speed = self._learning_speed_from_progress(progress)
         elif learning_speed is None:
             learning_speed = 'medium'
         
         level = self.map_learning_speed_to_level(learning_speed)
         
-        # Get base materials and filter by completion if student_id provided
-        materials = self.study_materials[subject].get(level, [])
+        # Get base materials and filter by completion if student_id provided;
+        # plain dict copies, the shared recommender keeps read-only views
+        materials = [dict(material) for material in self.study_materials[subject].get(level, [])]
         if student_id:
-            completed = get_student_progress(student_id, subject).get('completed_materials', [])
-            materials = [m for m in materials if m['url'] not in completed]
+            materials = self._personalize_materials(materials, progress)
         
         # Generate adaptive content
         adaptive_content = self.content_generator.generate_adaptive_content(
@@ -115,7 +150,24 @@ class StudyMaterialRecommender:
             learning_speed=learning_speed,
             student_level=level
         )
-        
+        return self._recommendation(subject, learning_speed, level, materials, adaptive_content)
+    
+    def _personalize_materials(self, materials: List[Dict], progress: Dict) -> List[Dict]:
+        """Drop completed materials and, with a collaborative model, rank the rest."""
+        completed = progress.get('completed_materials', [])
+        materials = [m for m in materials if m['url'] not in completed]
+        if self.collaborative_model is not None and len(materials) > 1:
+            materials = self._rank_collaboratively(materials, progress)
+        return materials
+    
+    @staticmethod
+    def _recommendation(
+        subject: str,
+        learning_speed: str,
+        level: str,
+        materials: List[Dict],
+        adaptive_content: Dict
+    ) -> Dict[str, Union[str, List[Dict]]]:
         return {
     "student_level": level,
     "learning_speed": learning_speed,
@@ -129,6 +181,34 @@ class StudyMaterialRecommender:
     }
 }
     
+    def _get_similar_index(self) -> SimilarMaterialsIndex:
+        """Load or build the similar-materials index on first use."""
+        index = self._similar_index
+        if index is None:
+            with self._similar_index_lock:
+                if self._similar_index is None:
+                    documents = material_documents(self.study_materials, get_storage_backend().get_materials())
+                    self._similar_index = load_or_build_index(documents, SIMILAR_INDEX_PATH)
+                index = self._similar_index
+        return index
+    
+    def similar_to(self, material_url: str, k: int = 5) -> List[Dict]:
+        """
+        Materials most similar to the given one, by title, description and tags.
+        
+        Args:
+            material_url: URL of a material in the catalog
+            k: Number of similar materials to return
+            
+        Returns:
+            List of dicts with title, url and similarity, most similar first
+        """
+        index = self._get_similar_index()
+        return [
+            {'title': index.titles[index.positions[url]], 'url': url, 'similarity': similarity}
+            for url, similarity in index.similar_to(material_url, k)
+        ]
+    
     def batch_recommend(
         self, 
         subjects: List[str], 
@@ -139,6 +219,276 @@ class StudyMaterialRecommender:
             subject: self.recommend_materials(subject, student_id=student_id)
             for subject in subjects
         }
+    
+    def recommend_for_cohort(
+        self,
+        student_ids: Iterable[str],
+        subjects: Sequence[str],
+        output_path: str,
+        workers: Optional[int] = None,
+        use_processes: bool = False,
+        chunk_size: int = COHORT_CHUNK_SIZE
+    ) -> int:
+        """
+        Recommend every subject to every student and stream the results to a file.
+        
+        Progress comes from the storage backend in one lookup per chunk of
+        students, and adaptive content is generated once per (subject,
+        learning speed). Chunks are spread over a thread or process pool and
+        written as they complete, so results are not in student order. The
+        file is written under a temporary name and moved into place at the end.
+        
+        Args:
+            student_ids: Students to recommend for; may be a generator
+            subjects: Subjects to recommend, each must be in the study materials
+            output_path: .jsonl (one recommendation per line) or .parquet (needs pyarrow)
+            workers: Pool size; defaults to the CPU count, 1 runs in this thread
+            use_processes: Use worker processes instead of threads. Each process
+                ranks materials with the collaborative model of its own get_recommender()
+                and uses its own copy of the active storage backend.
+            chunk_size: Students per task
+            
+        Returns:
+            Number of recommendations written
+        """
+        output_format = COHORT_FORMATS.get(os.path.splitext(output_path)[1].lower())
+        if output_format is None:
+            raise ValueError(f"output_path must end in one of: {', '.join(COHORT_FORMATS)}")
+        unknown = [subject for subject in subjects if subject not in self.study_materials]
+        if unknown:
+            raise ValueError(
+                f"Subject '{unknown[0]}' not found. Available subjects: {', '.join(self.study_materials.keys())}"
+            )
+        workers = workers or os.cpu_count() or 1
+        subjects = list(subjects)
+        
+        # Level, candidate materials and content only depend on (subject, learning speed)
+        plans = {}
+        for subject in subjects:
+            for learning_speed in ('slow', 'medium', 'fast'):
+                level = self.map_learning_speed_to_level(learning_speed)
+                content = self.content_generator.generate_adaptive_content(
+                    subject=subject,
+                    learning_speed=learning_speed,
+                    student_level=level
+                )
+                # dict() also copies read-only material views from the shared recommender
+                materials = [dict(material) for material in self.study_materials[subject].get(level, [])]
+                plans[(subject, learning_speed)] = (
+                    level, materials, content,
+                    _encode_around_materials(self._recommendation(subject, learning_speed, level, [], content))
+                )
+        
+        backend = get_storage_backend()
+        
+        def tasks():
+            students = iter(student_ids)
+            for chunk in iter(lambda: list(islice(students, chunk_size)), []):
+                progress = backend.get_progress_many((student_id, subject) for student_id in chunk for subject in subjects)
+                yield chunk, subjects, progress, plans, output_format
+        
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(output_path)), suffix=".tmp")
+        os.close(fd)
+        writer = None
+        try:
+            writer = _CohortWriter(tmp_path, output_format)
+            if workers == 1:
+                for task in tasks():
+                    writer.write(*self._recommend_cohort_chunk(*task))
+            else:
+                if use_processes:
+                    # Each process builds its own backend; SQLite connections must not cross a fork
+                    executor = ProcessPoolExecutor(
+                        max_workers=workers, initializer=init_worker_storage_backend,
+                        initargs=(storage_backend_spec(backend),)
+                    )
+                    run_chunk = _recommend_cohort_chunk_in_worker
+                else:
+                    executor = ThreadPoolExecutor(max_workers=workers)
+                    run_chunk = self._recommend_cohort_chunk
+                with executor:
+                    # Keep the pool busy without queueing the whole cohort
+                    pending = set()
+                    for task in tasks():
+                        if len(pending) >= 2 * workers:
+                            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in done:
+                                writer.write(*future.result())
+                        pending.add(executor.submit(run_chunk, *task))
+                    for future in wait(pending).done:
+                        writer.write(*future.result())
+            writer.close()
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if writer is not None:
+                writer.close()
+            os.remove(tmp_path)
+            raise
+        return writer.written
+    
+    def _recommend_cohort_chunk(
+        self,
+        student_ids: List[str],
+        subjects: List[str],
+        progress: Mapping[Tuple[str, str], Optional[Dict]],
+        plans: Mapping[Tuple[str, str], Tuple],
+        output_format: str
+    ):
+        """Recommendations for a chunk of students, as (count, JSONL text or list of records)."""
+        results = []
+        for student_id in student_ids:
+            for subject in subjects:
+                # Same fallback as get_student_progress
+                student_progress = progress.get((student_id, subject)) or {"completion_rate": 0.0, "average_score": 0.0}
+                learning_speed = self._learning_speed_from_progress(student_progress)
+                level, materials, content, (head, tail) = plans[(subject, learning_speed)]
+                materials = self._personalize_materials(materials, student_progress)
+                if output_format == 'jsonl':
+                    results.append(f'{{"student_id": {json.dumps(student_id)}{head}{json.dumps(materials)}{tail}\n')
+                else:
+                    record = {"student_id": student_id}
+                    record.update(self._recommendation(subject, learning_speed, level, materials, content))
+                    results.append(record)
+        if output_format == 'jsonl':
+            return len(results), "".join(results)
+        return len(results), results
+
+
+def _encode_around_materials(recommendation: Dict) -> Tuple[str, str]:
+    """
+    JSON text before and after the recommended_materials value of a recommendation.
+
+    The fields around the materials are shared by every student with the same
+    subject and learning speed, so they are encoded once per cohort. Joined
+    with a leading student_id and the encoded materials, the result matches
+    json.dumps of the full record.
+    """
+    parts = ([], [])
+    side = 0
+    for key, value in recommendation.items():
+        if key == "recommended_materials":
+            side = 1
+            continue
+        parts[side].append(f"{json.dumps(key)}: {json.dumps(value)}")
+    head = "".join(f", {part}" for part in parts[0]) + ', "recommended_materials": '
+    tail = "".join(f", {part}" for part in parts[1]) + "}"
+    return head, tail
+
+
+def _recommend_cohort_chunk_in_worker(*task):
+    return get_recommender()._recommend_cohort_chunk(*task)
+
+
+class _CohortWriter:
+    """Appends recommend_for_cohort chunks to a JSONL or Parquet file."""
+    
+    def __init__(self, path: str, output_format: str):
+        self.written = 0
+        self._file = None
+        self._parquet = None
+        if output_format == 'jsonl':
+            self._file = open(path, 'w', encoding='utf-8')
+        else:
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError as e:
+                raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from e
+            self._pa = pa
+            self._schema = _cohort_parquet_schema(pa)
+            self._parquet = pq.ParquetWriter(path, self._schema)
+    
+    def write(self, count: int, payload) -> None:
+        if self._file is not None:
+            self._file.write(payload)
+        else:
+            self._parquet.write_table(self._pa.Table.from_pylist(payload, schema=self._schema))
+        self.written += count
+    
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def _cohort_parquet_schema(pa):
+    material = pa.struct([('title', pa.string()), ('description', pa.string()), ('url', pa.string())])
+    content = pa.struct([
+        ('topic', pa.string()), ('subject', pa.string()), ('complexity_level', pa.string()), ('content', pa.string())
+    ])
+    return pa.schema([
+        ('student_id', pa.string()),
+        ('student_level', pa.string()),
+        ('learning_speed', pa.string()),
+        ('subject', pa.string()),
+        ('recommended_materials', pa.list_(material)),
+        ('adaptive_content', content),
+    ])
+
+
+# Process-wide recommender shared by every session and thread
+_shared_recommender: Optional[StudyMaterialRecommender] = None
+_shared_recommender_lock = threading.Lock()
+
+
+def _freeze_materials(study_materials: Dict) -> Mapping:
+    """Return a read-only copy of the subject -> level -> materials index."""
+    return MappingProxyType({
+        subject: MappingProxyType({
+            level: tuple(MappingProxyType(dict(material)) for material in materials)
+            for level, materials in levels.items()
+        })
+        for subject, levels in study_materials.items()
+    })
+
+
+def _load_collaborative_model() -> Optional[ItemItemModel]:
+    if not os.path.exists(COLLABORATIVE_MODEL_PATH):
+        return None
+    try:
+        return ItemItemModel.load(COLLABORATIVE_MODEL_PATH)
+    except Exception as e:
+        print(f"Error loading collaborative model: {e}")
+        return None
+
+
+def _build_shared_recommender() -> StudyMaterialRecommender:
+    recommender = StudyMaterialRecommender(collaborative_model=_load_collaborative_model())
+    recommender.study_materials = _freeze_materials(recommender.study_materials)
+    recommender.content_generator.warm_up_cache()
+    return recommender
+
+
+def get_recommender() -> StudyMaterialRecommender:
+    """
+    Return the process-wide recommender, building it on first use.
+
+    The content generator and the materials index are built once and shared
+    between sessions and threads. The materials index is read-only.
+    """
+    global _shared_recommender
+    recommender = _shared_recommender
+    if recommender is None:
+        with _shared_recommender_lock:
+            if _shared_recommender is None:
+                _shared_recommender = _build_shared_recommender()
+            recommender = _shared_recommender
+    return recommender
+
+
+def reload_recommender() -> StudyMaterialRecommender:
+    """
+    Rebuild the shared recommender, e.g. after study materials change.
+
+    Callers already holding the previous instance keep using it until they
+    call get_recommender() again.
+    """
+    global _shared_recommender
+    recommender = _build_shared_recommender()
+    with _shared_recommender_lock:
+        _shared_recommender = recommender
+    return recommender
 
 # Usage examples
 def main():
@@ -0,0 +1,219 @@
+# render_cache.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+from typing import Callable, Dict, Mapping, Optional
+
+import pandas as pd
+
+DEFAULT_MAX_ENTRIES = 10_000
+DEFAULT_MAX_BYTES = 1 << 30
+# Subdirectory for remember() records; not an entry since it lacks the suffix
+SOURCES_SUBDIR = 'sources'
+
+
+class RenderCache:
+    """
+    Content-addressed, size-capped cache of rendered chart files.
+
+    An entry is a file named by the hash of the chart's input rows and
+    configuration, so an unchanged student maps to an existing file and
+    nothing is redrawn. Outputs are hard links to entries where the file
+    system allows it, which makes an up-to-date output a single stat
+    comparison. Every hit refreshes the entry's modification time and the
+    oldest entries are evicted once max_entries or max_bytes is exceeded.
+
+    remember() and recall() keep, per output file, the key it was placed
+    from and a cheap description of its source (e.g. the history file's
+    size and mtime), so callers can skip reading and hashing the rows
+    when the source did not change.
+
+    Several processes can share one directory: entries are written
+    atomically, and an entry evicted by another process is just a miss.
+    Hit/miss/eviction counters are per instance.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        suffix: str = '.png'
+    ):
+        if max_entries <= 0 or max_bytes <= 0:
+            raise ValueError("max_entries and max_bytes must be positive")
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.suffix = suffix
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        entries = self._entries()
+        self._entry_count = len(entries)
+        self._total_bytes = sum(size for _, size, _ in entries)
+
+    @staticmethod
+    def key(df: pd.DataFrame, config: Mapping) -> str:
+        """Hash of the rows (values, column names and order) and the chart configuration."""
+        digest = hashlib.sha256(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        digest.update(json.dumps([str(column) for column in df.columns]).encode('utf-8'))
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.suffix)
+
+    def _source_path(self, output_path: str) -> str:
+        name = hashlib.sha256(os.path.abspath(output_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, SOURCES_SUBDIR, name + '.json')
+
+    def remember(self, output_path: str, source, key: str) -> None:
+        """Record that output_path holds the entry for key, made from source (anything JSON can encode)."""
+        record = {"source": json.dumps(source, sort_keys=True, default=str), "key": key}
+        path = self._source_path(output_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.json')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(record, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def recall(self, output_path: str, source) -> Optional[str]:
+        """
+        Key remembered for output_path, if it was made from an equal source.
+
+        Returns:
+            The key, or None when nothing usable was remembered or its
+            entry has been evicted; does not count as a hit or miss
+        """
+        try:
+            with open(self._source_path(output_path), encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(record, dict) or record.get("source") != json.dumps(source, sort_keys=True, default=str):
+            return None
+        key = record.get("key")
+        if not isinstance(key, str) or not os.path.exists(self.entry_path(key)):
+            return None
+        return key
+
+    def lookup(self, key: str) -> Optional[str]:
+        """Path of the cached file for key, marking it recently used, or None on a miss."""
+        path = self.entry_path(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def store(self, key: str, render: Callable[[str], None]) -> str:
+        """
+        Add an entry by calling render(path), then evict down to the size cap.
+
+        render must write the file atomically, e.g. through a temporary file.
+        """
+        path = self.entry_path(key)
+        previous_size = os.path.getsize(path) if os.path.exists(path) else None
+        render(path)
+        size = os.path.getsize(path)
+        with self._lock:
+            if previous_size is None:
+                self._entry_count += 1
+                self._total_bytes += size
+            else:
+                self._total_bytes += size - previous_size
+            over_cap = self._entry_count > self.max_entries or self._total_bytes > self.max_bytes
+        if over_cap:
+            self._evict(keep=path)
+        return path
+
+    def place(self, key: str, output_path: str) -> bool:
+        """
+        Make output_path hold the entry for key.
+
+        Returns:
+            False if output_path already was that entry, True if it was written
+        """
+        entry = self.entry_path(key)
+        try:
+            if os.path.samefile(entry, output_path):
+                return False
+        except FileNotFoundError:
+            pass
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=self.suffix)
+        os.close(fd)
+        try:
+            os.remove(tmp_path)
+            try:
+                os.link(entry, tmp_path)
+            except OSError:
+                # No hard links on this file system
+                shutil.copyfile(entry, tmp_path)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def _entries(self):
+        """(path, size, mtime) of every entry, oldest first."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(self.suffix):
+                continue
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry.path, stat.st_size, stat.st_mtime_ns))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def _evict(self, keep: Optional[str] = None) -> None:
+        with self._lock:
+            # Rescan so entries added or evicted by other processes are counted
+            entries = self._entries()
+            count = len(entries)
+            total = sum(size for _, size, _ in entries)
+            for path, size, _ in entries:
+                if count <= self.max_entries and total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+                count -= 1
+                total -= size
+                self.evictions += 1
+            self._entry_count, self._total_bytes = count, total
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss/eviction counters and current size."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": self._entry_count,
+                "bytes": self._total_bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes
+            }
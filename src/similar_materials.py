@@ -0,0 +1,303 @@
+# similar_materials.py
+import hashlib
+import os
+import tempfile
+import zlib
+from typing import List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from material_index import tokenize
+
+# Hashed bag-of-words dimensionality
+N_FEATURES = 2 ** 14
+# Inverted-file index: materials are clustered into lists and a query
+# scans the N_PROBE lists whose centroids are closest to it
+N_PROBE = 8
+# Clusters are trained on at most this many materials, then all are assigned
+KMEANS_SAMPLE = 50_000
+INDEX_SEED = 0
+# Below this many materials a brute-force scan is as fast and always exact
+EXACT_SEARCH_LIMIT = 2_000
+
+# A material to index: (url, title, text to embed)
+Document = Tuple[str, str, str]
+
+
+def material_documents(study_materials: Mapping, catalog: Optional[pd.DataFrame] = None) -> List[Document]:
+    """
+    Collect indexable documents from the nested study materials and the CSV catalog.
+
+    Subject and level are added to the text so materials from the same
+    course area are closer. Each URL is indexed once; the first source wins.
+
+    Args:
+        study_materials: subject -> level -> list of {title, description, url}
+        catalog: Optional DataFrame with resource_name, tags, subject, level and link
+
+    Returns:
+        List of (url, title, text)
+    """
+    documents = {}
+    for subject, levels in study_materials.items():
+        for level, materials in levels.items():
+            for material in materials:
+                text = ' '.join([material.get('title', ''), material.get('description', ''), subject, level])
+                documents.setdefault(material['url'], (material['url'], material.get('title', ''), text))
+
+    if catalog is not None:
+        for row in catalog.itertuples(index=False):
+            url = getattr(row, 'link', None)
+            if not isinstance(url, str) or not url:
+                continue
+            parts = [getattr(row, column, '') for column in ('resource_name', 'tags', 'subject', 'level')]
+            text = ' '.join(part for part in parts if isinstance(part, str))
+            # Catalog rows without a name read back from the CSV as NaN
+            title = row.resource_name if isinstance(row.resource_name, str) else ''
+            documents.setdefault(url, (url, title, text))
+    return list(documents.values())
+
+
+def _hash_token(token: str) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(token.encode('utf-8')) % N_FEATURES
+
+
+def embed_documents(texts: Sequence[str], idf: Optional[np.ndarray] = None):
+    """
+    Hashed TF-IDF vectors, L2-normalized, one row per text.
+
+    Args:
+        texts: Texts to embed
+        idf: Inverse document frequencies from an earlier call; computed from texts if None
+
+    Returns:
+        (CSR matrix of shape (len(texts), N_FEATURES), idf)
+    """
+    indptr = [0]
+    indices = []
+    for text in texts:
+        indices.extend(_hash_token(token) for token in tokenize(text))
+        indptr.append(len(indices))
+    counts = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), np.array(indices, dtype=np.int32), np.array(indptr)),
+        shape=(len(texts), N_FEATURES)
+    )
+    counts.sum_duplicates()
+
+    if idf is None:
+        document_frequency = np.bincount(counts.indices, minlength=N_FEATURES)
+        idf = (np.log((1 + len(texts)) / (1 + document_frequency)) + 1).astype(np.float32)
+    vectors = counts.multiply(idf).tocsr()
+    norms = np.sqrt(np.asarray(vectors.multiply(vectors).sum(axis=1)).ravel())
+    vectors = sparse.diags(1 / np.maximum(norms, 1e-12)).dot(vectors).tocsr().astype(np.float32)
+    return vectors, idf
+
+
+def default_list_count(n_materials: int) -> int:
+    """About sqrt(n) lists, the usual balance between centroid and list scan cost."""
+    return int(min(max(round(np.sqrt(n_materials)), 1), 4096))
+
+
+def _train_centroids(vectors: sparse.csr_matrix, n_lists: int, seed: int) -> np.ndarray:
+    """Unit-length k-means centroids, shape (n_lists, N_FEATURES)."""
+    from sklearn.cluster import MiniBatchKMeans
+
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if vectors.shape[0] > KMEANS_SAMPLE:
+        sample = vectors[np.sort(rng.choice(vectors.shape[0], KMEANS_SAMPLE, replace=False))]
+    n_lists = min(n_lists, sample.shape[0])
+    kmeans = MiniBatchKMeans(n_clusters=n_lists, batch_size=4096, n_init=1, max_iter=20, random_state=seed)
+    centroids = kmeans.fit(sample).cluster_centers_.astype(np.float32)
+    return centroids / np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+
+
+def _assign_lists(vectors: sparse.csr_matrix, centroids: np.ndarray, block_size: int = 50_000) -> np.ndarray:
+    """Nearest centroid (by cosine) of every vector."""
+    assignments = np.empty(vectors.shape[0], dtype=np.int32)
+    centroids_t = np.ascontiguousarray(centroids.T)
+    for first in range(0, vectors.shape[0], block_size):
+        scores = vectors[first:first + block_size] @ centroids_t
+        assignments[first:first + block_size] = np.asarray(scores).argmax(axis=1)
+    return assignments
+
+
+def _fingerprint(documents: Sequence[Document]) -> str:
+    digest = hashlib.sha256(f"{N_FEATURES}:{INDEX_SEED}".encode('utf-8'))
+    for url, title, text in documents:
+        digest.update(f"\0{url}\0{title}\0{text}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+class SimilarMaterialsIndex:
+    """
+    Approximate nearest-neighbour index over material embeddings.
+
+    Materials are embedded as hashed TF-IDF vectors and clustered with
+    k-means into inverted lists (IVF). A query scores the centroids, scans
+    the members of the closest lists and ranks them by exact cosine
+    similarity, so it touches a few percent of the catalog.
+    """
+
+    def __init__(self, urls: Sequence[str], titles: Sequence[str], vectors: sparse.csr_matrix,
+                 idf: np.ndarray, centroids: np.ndarray, assignments: np.ndarray, fingerprint: str = ''):
+        """
+        Args:
+            urls: Material URL per row
+            titles: Material title per row
+            vectors: L2-normalized embeddings, one row per material
+            idf: Inverse document frequencies used for the embeddings
+            centroids: Unit-length list centroids, one row per list
+            assignments: List of every material
+            fingerprint: Identifies the documents and parameters the index was built from
+        """
+        self.urls = list(urls)
+        self.titles = list(titles)
+        self.vectors = vectors
+        self.idf = idf
+        self.centroids = centroids
+        self.assignments = assignments
+        self.fingerprint = fingerprint
+        self.positions = {url: position for position, url in enumerate(self.urls)}
+
+        # Materials sorted by list, so a list is the slice between two bounds
+        self._list_order = np.argsort(assignments, kind='stable').astype(np.int32)
+        self._list_bounds = np.searchsorted(assignments[self._list_order], np.arange(len(centroids) + 1))
+
+    @classmethod
+    def build(cls, documents: Sequence[Document], n_lists: Optional[int] = None) -> 'SimilarMaterialsIndex':
+        """
+        Embed and cluster the documents.
+
+        Args:
+            documents: (url, title, text) per material, URLs unique
+            n_lists: Number of inverted lists; default_list_count() if None
+        """
+        urls = [url for url, _, _ in documents]
+        if not urls:
+            raise ValueError("No materials to index")
+        if len(set(urls)) != len(urls):
+            raise ValueError("Material URLs must be unique")
+        vectors, idf = embed_documents([text for _, _, text in documents])
+        centroids = _train_centroids(vectors, n_lists or default_list_count(len(urls)), INDEX_SEED)
+        return cls(urls, [title for _, title, _ in documents], vectors, idf,
+                   centroids, _assign_lists(vectors, centroids), _fingerprint(documents))
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def candidates(self, position: int, n_probe: int = N_PROBE) -> np.ndarray:
+        """Members of the n_probe lists whose centroids are most similar to the given material."""
+        query = self.vectors[position]
+        # Only the query's non-zero features contribute to the centroid scores
+        scores = self.centroids[:, query.indices] @ query.data
+        if n_probe < len(scores):
+            lists = np.argpartition(-scores, n_probe - 1)[:n_probe]
+        else:
+            lists = np.arange(len(scores))
+        return np.concatenate([self._list_order[self._list_bounds[i]:self._list_bounds[i + 1]] for i in lists])
+
+    def _rank(self, position: int, rows: np.ndarray, k: int) -> List[Tuple[str, float]]:
+        rows = rows[rows != position]
+        if len(rows) == 0:
+            return []
+        scores = (self.vectors[rows] @ self.vectors[position].T).toarray().ravel()
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+            rows, scores = rows[top], scores[top]
+        order = np.lexsort((rows, -scores))
+        return [(self.urls[row], float(scores[i])) for i, row in zip(order, rows[order])]
+
+    def similar_to(self, material_url: str, k: int = 5, n_probe: int = N_PROBE) -> List[Tuple[str, float]]:
+        """
+        Approximate top-k most similar materials.
+
+        Small indexes (up to EXACT_SEARCH_LIMIT materials) are scanned exactly.
+
+        Args:
+            material_url: URL of an indexed material
+            k: Number of results
+            n_probe: Lists scanned; more is slower and closer to exact
+
+        Returns:
+            (url, cosine similarity) pairs, most similar first
+        """
+        position = self.positions.get(material_url)
+        if position is None:
+            raise ValueError(f"Unknown material: {material_url}")
+        if len(self.urls) <= EXACT_SEARCH_LIMIT:
+            return self._rank(position, np.arange(len(self.urls)), k)
+        return self._rank(position, self.candidates(position, n_probe), k)
+
+    def exact_similar_to(self, material_url: str, k: int = 5) -> List[Tuple[str, float]]:
+        """Brute-force top-k over every material, for checking recall."""
+        position = self.positions.get(material_url)
+        if position is None:
+            raise ValueError(f"Unknown material: {material_url}")
+        return self._rank(position, np.arange(len(self.urls)), k)
+
+    def save(self, path: str) -> None:
+        """
+        Write the index to an .npz file.
+
+        The file is written next to path and moved into place, so a
+        concurrent load() sees either the old index or the new one.
+        """
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.npz')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(
+                    f, urls=np.array(self.urls), titles=np.array(self.titles),
+                    data=self.vectors.data, indices=self.vectors.indices, indptr=self.vectors.indptr,
+                    idf=self.idf, centroids=self.centroids, assignments=self.assignments,
+                    fingerprint=np.array(self.fingerprint)
+                )
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> 'SimilarMaterialsIndex':
+        """Read an index written by save()."""
+        with np.load(path, allow_pickle=False) as data:
+            vectors = sparse.csr_matrix((data['data'], data['indices'], data['indptr']),
+                                        shape=(len(data['urls']), N_FEATURES))
+            if data['centroids'].shape[1:] != (N_FEATURES,):
+                raise ValueError(f"Index in {path} was built with a different feature count")
+            return cls(data['urls'].tolist(), data['titles'].tolist(), vectors, data['idf'],
+                       data['centroids'], data['assignments'], str(data['fingerprint']))
+
+
+def load_or_build_index(documents: Sequence[Document], path: Optional[str] = None) -> SimilarMaterialsIndex:
+    """
+    Load the persisted index if it was built from the same documents, otherwise rebuild it.
+
+    Args:
+        documents: Current (url, title, text) list
+        path: Optional .npz location; the rebuilt index is saved there
+
+    Returns:
+        Index over the documents
+    """
+    fingerprint = _fingerprint(documents)
+    if path:
+        try:
+            index = SimilarMaterialsIndex.load(path)
+            if index.fingerprint == fingerprint:
+                return index
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Rebuilding similar materials index, could not load {path}: {e}")
+
+    index = SimilarMaterialsIndex.build(documents)
+    if path:
+        try:
+            index.save(path)
+        except OSError as e:
+            print(f"Could not save similar materials index to {path}: {e}")
+    return index
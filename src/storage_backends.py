@@ -0,0 +1,833 @@
+# storage_backends.py
+import csv
+import glob
+import io
+import json
+import os
+import queue
+import re
+import sqlite3
+import tempfile
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from Student_Progress_Tracking_System import (
+    PROGRESS_FILE,
+    ProgressEventLog,
+    ProgressStore,
+    _apply_progress_event,
+    _file_signature,
+    _read_snapshot,
+    _replay_log,
+)
+from subject_masks import OVERFLOW_MASK, encode_subjects, mask_dtype
+
+MATERIALS_FILE = "study_materials_database.csv"
+MATERIALS_COLUMNS = ["level", "subject", "material_type", "resource_name", "difficulty", "link", "tags"]
+HISTORY_FILE_PATTERN = "student_progress_{student_id}.csv"
+HISTORY_COLUMNS = ["date", "test_score", "predicted_level", "subjects_tested", "time_spent_studying"]
+
+# Opaque, JSON-serializable history position from get_progress_history_since()
+HistoryPosition = Union[int, str]
+# Bytes before a CSV history position that are re-checked on resume
+RESUME_WINDOW = 64 * 1024
+
+
+class StorageBackend(ABC):
+    """Storage for student progress, per-student test history and study materials."""
+
+    @abstractmethod
+    def get_progress(self, student_id: str, subject: str) -> Optional[Dict]:
+        """
+        Look up progress for a student and subject.
+
+        Returns:
+            Progress dict, or None if no progress has been recorded at all
+        """
+
+    def get_progress_many(self, keys: Iterable[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[Dict]]:
+        """Look up progress for many (student_id, subject) pairs; see get_progress()."""
+        return {(student_id, subject): self.get_progress(student_id, subject) for student_id, subject in keys}
+
+    @abstractmethod
+    def update_progress(self, student_id: str, subject: str, score: float, completed_material: str) -> None:
+        """Record a new score and completed material."""
+
+    @abstractmethod
+    def get_progress_history(self, student_id: str) -> pd.DataFrame:
+        """Return the student's test history, oldest first."""
+
+    def get_progress_history_since(
+        self,
+        student_id: str,
+        position: Optional[HistoryPosition] = None,
+        columns: Optional[Sequence[str]] = None
+    ) -> Tuple[pd.DataFrame, HistoryPosition, bool]:
+        """
+        Test history rows added after a position returned by an earlier call.
+
+        For consumers that keep running results over an append-only history:
+        the new rows continue the order of get_progress_history(). Backends
+        that cannot read from a position return the full history sliced
+        after the first `position` rows.
+
+        Args:
+            student_id: Student whose history to read
+            position: Position returned by the previous call; None reads everything
+            columns: Optional subset of HISTORY_COLUMNS to return
+
+        Returns:
+            (new rows, position to pass next time, reset). reset is True when
+            the rows are the whole history: position was None or unusable,
+            the history was rewritten since position was taken, or new rows
+            would not come after the ones already read.
+        """
+        history = self.get_progress_history(student_id)
+        if columns is not None:
+            history = history[list(columns)]
+        if position is None or position > len(history):
+            return history, len(history), True
+        return history.iloc[position:], len(history), False
+
+    def history_signature(self, student_id: str) -> Optional[tuple]:
+        """
+        Cheap fingerprint of the student's history, without reading the rows.
+
+        Equal signatures mean the history did not change, so derived
+        results such as rendered charts can be reused. Take the signature
+        before reading the history it describes.
+
+        Returns:
+            A JSON-encodable tuple, or None when this backend cannot tell
+            (the default), in which case the history must be read
+        """
+        return None
+
+    def get_subject_masks(self, student_id: str) -> Tuple[np.ndarray, List[str]]:
+        """
+        subjects_tested of the student's history as multi-hot bitmasks, oldest first.
+
+        Backends that store the masks at ingestion return them without
+        parsing any strings; this default encodes the full history.
+
+        Returns:
+            (masks, vocabulary), bit i of a mask standing for vocabulary[i];
+            see subject_masks.subject_counts() and subjects_filter(). Rows
+            with OVERFLOW_MASK set tested a subject past MAX_SUBJECTS that
+            only their subjects_tested string names
+        """
+        return encode_subjects(self.get_progress_history(student_id)['subjects_tested'])
+
+    @abstractmethod
+    def get_materials(self) -> Optional[pd.DataFrame]:
+        """Return the study materials catalog, or None if there is none yet."""
+
+    @abstractmethod
+    def save_materials(self, materials: pd.DataFrame) -> None:
+        """Replace the study materials catalog with rows in MATERIALS_COLUMNS."""
+
+    def materials_version(self) -> Optional[Hashable]:
+        """
+        Cheap token that changes whenever the materials catalog changes.
+
+        Returns None when the backend cannot tell, in which case callers
+        caching the catalog must reload it explicitly.
+        """
+        return None
+
+    def flush(self, compact: bool = False) -> None:
+        """Make buffered writes durable. Backends that do not buffer ignore this."""
+
+    def spec(self) -> Optional[tuple]:
+        """
+        Picklable (kind, *arguments) that rebuilds this backend in another process.
+
+        See storage_backend_spec(). None (the default) means worker
+        processes keep their own default backend.
+        """
+        return None
+
+
+class CSVStorageBackend(StorageBackend):
+    """The flat files: progress snapshot + event log, per-student history CSVs and the materials CSV."""
+
+    def __init__(
+        self,
+        progress_path: str = PROGRESS_FILE,
+        materials_path: str = MATERIALS_FILE,
+        history_pattern: str = HISTORY_FILE_PATTERN
+    ):
+        self.progress_path = progress_path
+        self.materials_path = materials_path
+        self.history_pattern = history_pattern
+        self.event_log = ProgressEventLog(progress_path)
+        self.progress_store = ProgressStore(progress_path, event_log=self.event_log)
+
+    def spec(self):
+        return (
+            "csv", os.path.abspath(self.progress_path), os.path.abspath(self.materials_path),
+            os.path.abspath(self.history_pattern)
+        )
+
+    def get_progress(self, student_id, subject):
+        return self.progress_store.get(student_id, subject)
+
+    def get_progress_many(self, keys):
+        return self.progress_store.get_many(keys)
+
+    def update_progress(self, student_id, subject, score, completed_material):
+        self.event_log.append({
+            "student_id": student_id,
+            "subject": subject,
+            "score": score,
+            "completed_material": completed_material
+        })
+
+    def get_progress_history(self, student_id):
+        return pd.read_csv(self.history_pattern.format(student_id=student_id))
+
+    def get_progress_history_since(self, student_id, position=None, columns=None):
+        # position is "<offset>:<inode>:<size>:<mtime_ns>:<crc32 of the window>",
+        # offset being just past a complete row and the window the last
+        # RESUME_WINDOW bytes before it. See _resume_offset() for the checks.
+        with open(self.history_pattern.format(student_id=student_id), "rb") as history_file:
+            header = history_file.readline()
+            stat = os.fstat(history_file.fileno())
+            offset = _resume_offset(history_file, position, len(header), stat)
+            reset = offset is None
+            if reset:
+                offset = len(header)
+            history_file.seek(offset)
+            data = history_file.read()
+            # A writer may be halfway through a row
+            complete = data[:data.rfind(b"\n") + 1]
+            new_offset = offset + len(complete)
+            window = _read_window(history_file, new_offset)
+
+        names = next(csv.reader([header.decode("utf-8")]))
+        if complete.strip():
+            rows = pd.read_csv(io.BytesIO(complete), header=None, names=names, usecols=columns)
+        else:
+            rows = pd.DataFrame(columns=list(columns) if columns is not None else names)
+        new_position = (
+            f"{new_offset}:{stat.st_ino}:{offset + len(data)}:{stat.st_mtime_ns}:{zlib.crc32(window)}"
+        )
+        return rows, new_position, reset
+
+    def history_signature(self, student_id):
+        path = os.path.abspath(self.history_pattern.format(student_id=student_id))
+        stat = os.stat(path)
+        return path, stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def get_subject_masks(self, student_id):
+        # Masks are kept next to the history CSV and extended with the rows appended since
+        masks_path = self.history_pattern.format(student_id=student_id) + ".subjects.npz"
+        masks, vocabulary, position = _load_subject_masks(masks_path)
+        rows, new_position, reset = self.get_progress_history_since(
+            student_id, position, columns=["subjects_tested"]
+        )
+        if reset:
+            masks, vocabulary = np.zeros(0, dtype=np.uint8), []
+        if reset or len(rows):
+            new_masks, vocabulary = encode_subjects(rows["subjects_tested"], vocabulary)
+            masks = np.concatenate([masks, new_masks])
+        if new_position != position:
+            try:
+                _save_subject_masks(masks_path, masks, vocabulary, new_position)
+            except OSError as e:
+                print(f"Could not save subject masks to {masks_path}: {e}")
+        return masks, vocabulary
+
+    def get_materials(self):
+        if not os.path.exists(self.materials_path):
+            return None
+        return pd.read_csv(self.materials_path)
+
+    def save_materials(self, materials):
+        directory = os.path.dirname(os.path.abspath(self.materials_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".csv")
+        try:
+            with os.fdopen(fd, "w", newline="") as f:
+                materials.reindex(columns=MATERIALS_COLUMNS).to_csv(f, index=False)
+            os.replace(tmp_path, self.materials_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+    def materials_version(self):
+        return _file_signature(self.materials_path)
+
+    def flush(self, compact=False):
+        if compact:
+            self.event_log.compact()
+        else:
+            self.event_log.flush()
+
+
+def _read_window(history_file, offset: int) -> bytes:
+    """The RESUME_WINDOW bytes of history_file just before offset."""
+    start = max(0, offset - RESUME_WINDOW)
+    history_file.seek(start)
+    return history_file.read(offset - start)
+
+
+def _resume_offset(history_file, position, header_length: int, stat) -> Optional[int]:
+    """
+    Offset to continue a history CSV from, or None if position no longer describes the file.
+
+    The cost is bounded by RESUME_WINDOW, not the file size. A rewrite is
+    detected when the file was replaced (inode), shrank below offset,
+    changed the bytes just before offset, or kept the size it had when
+    position was taken but got a new mtime. A file that grew is taken as
+    appended to, so a rewrite that also changes the length and leaves the
+    last RESUME_WINDOW bytes before offset intact goes unnoticed.
+    """
+    try:
+        offset, inode, size, mtime_ns, checksum = (int(part) for part in position.split(":"))
+    except (AttributeError, ValueError):
+        return None
+    if inode != stat.st_ino or not header_length <= offset <= stat.st_size:
+        return None
+    if stat.st_size == size and stat.st_mtime_ns != mtime_ns:
+        return None
+    if zlib.crc32(_read_window(history_file, offset)) != checksum:
+        return None
+    return offset
+
+
+def _load_subject_masks(path: str) -> Tuple[np.ndarray, List[str], Optional[HistoryPosition]]:
+    """Masks, vocabulary and history position saved by _save_subject_masks(); position None if unusable."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            return data["masks"], data["vocabulary"].tolist(), json.loads(str(data["position"]))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Re-encoding subjects, could not read {path}: {e}")
+    return np.zeros(0, dtype=np.uint8), [], None
+
+
+def _save_subject_masks(path: str, masks: np.ndarray, vocabulary: List[str], position: HistoryPosition) -> None:
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".npz")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(f, masks=masks, vocabulary=np.array(vocabulary, dtype=str),
+                     position=np.array(json.dumps(position)))
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+class SQLiteConnectionPool:
+    """
+    Fixed-size pool of SQLite connections in WAL mode.
+
+    Each connection keeps its own cache of prepared statements, keyed by
+    SQL text, so the constant queries below are compiled once per connection.
+    """
+
+    def __init__(self, db_path: str, size: int = 4, timeout: float = 30.0):
+        self.db_path = db_path
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: transactions are opened explicitly with BEGIN
+        connection = sqlite3.connect(
+            self.db_path, timeout=self.timeout, isolation_level=None,
+            check_same_thread=False, cached_statements=256
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection, waiting for one if the pool is exhausted."""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            connection = self._connect() if create else self._idle.get(timeout=self.timeout)
+        try:
+            yield connection
+        finally:
+            self._idle.put(connection)
+
+    def close(self) -> None:
+        """Close every idle connection."""
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._created -= 1
+
+
+# id is the history position: unlike an implicit rowid, VACUUM keeps it,
+# and AUTOINCREMENT never hands out an id again once rows are deleted
+_CREATE_HISTORY_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    student_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    test_score REAL,
+    predicted_level TEXT,
+    subjects_tested TEXT,
+    time_spent_studying REAL,
+    subjects_mask INTEGER NOT NULL DEFAULT 0
+);"""
+_CREATE_HISTORY_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_progress_history_student_date ON progress_history (student_id, date);",
+    "CREATE INDEX IF NOT EXISTS idx_progress_history_date ON progress_history (date);"
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS progress (
+    student_id TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    completion_rate REAL NOT NULL,
+    average_score REAL NOT NULL,
+    completed_materials TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (student_id, subject)
+) WITHOUT ROWID;
+
+{history_table}
+{history_indexes}
+
+-- Bit of each subject in progress_history.subjects_mask
+CREATE TABLE IF NOT EXISTS subject_vocabulary (
+    bit INTEGER PRIMARY KEY,
+    subject TEXT NOT NULL UNIQUE
+);
+
+CREATE TABLE IF NOT EXISTS study_materials (
+    id INTEGER PRIMARY KEY,
+    level TEXT NOT NULL,
+    subject TEXT NOT NULL,
+    material_type TEXT,
+    resource_name TEXT,
+    difficulty TEXT,
+    link TEXT,
+    tags TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_study_materials_level_subject ON study_materials (level, subject);
+""".format(
+    history_table=_CREATE_HISTORY_TABLE.format(table="progress_history"),
+    history_indexes="\n".join(_CREATE_HISTORY_INDEXES)
+)
+
+_SELECT_PROGRESS = (
+    "SELECT completion_rate, average_score, completed_materials FROM progress "
+    "WHERE student_id = ? AND subject = ?"
+)
+_SELECT_PROGRESS_FOR_STUDENTS = (
+    "SELECT student_id, subject, completion_rate, average_score, completed_materials FROM progress "
+    "WHERE student_id IN ({placeholders})"
+)
+# Stays under SQLite's default bound-parameter limit
+_MAX_SQL_PARAMETERS = 900
+_UPSERT_PROGRESS = (
+    "INSERT INTO progress (student_id, subject, completion_rate, average_score, completed_materials) "
+    "VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT (student_id, subject) DO UPDATE SET "
+    "completion_rate = excluded.completion_rate, average_score = excluded.average_score, "
+    "completed_materials = excluded.completed_materials"
+)
+_SELECT_HISTORY = (
+    "SELECT date, test_score, predicted_level, subjects_tested, time_spent_studying "
+    "FROM progress_history WHERE student_id = ? ORDER BY date, id"
+)
+_SELECT_HISTORY_SINCE = (
+    "SELECT {columns} FROM progress_history "
+    "WHERE student_id = ? AND id > ? AND id <= ? ORDER BY date, id"
+)
+_SELECT_HISTORY_LAST_ID = "SELECT MAX(id) FROM progress_history WHERE student_id = ?"
+_SELECT_HISTORY_FIRST_DATE_SINCE = (
+    "SELECT MIN(date) FROM progress_history WHERE student_id = ? AND id > ? AND id <= ?"
+)
+_SELECT_HISTORY_LAST_DATE_UNTIL = "SELECT MAX(date) FROM progress_history WHERE student_id = ? AND id <= ?"
+_SELECT_SUBJECT_MASKS = "SELECT subjects_mask FROM progress_history WHERE student_id = ? ORDER BY date, id"
+_INSERT_HISTORY = (
+    "INSERT INTO progress_history (student_id, date, test_score, predicted_level, subjects_tested, "
+    "time_spent_studying, subjects_mask) VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+_SELECT_SUBJECT_VOCABULARY = "SELECT subject FROM subject_vocabulary ORDER BY bit"
+_INSERT_SUBJECT = "INSERT INTO subject_vocabulary (bit, subject) VALUES (?, ?)"
+_SELECT_MATERIALS = (
+    "SELECT level, subject, material_type, resource_name, difficulty, link, tags "
+    "FROM study_materials ORDER BY id"
+)
+_SELECT_MATERIALS_BY_LEVEL = (
+    "SELECT level, subject, material_type, resource_name, difficulty, link, tags "
+    "FROM study_materials WHERE level = ? ORDER BY id"
+)
+_SELECT_MATERIALS_BY_LEVEL_SUBJECT = (
+    "SELECT level, subject, material_type, resource_name, difficulty, link, tags "
+    "FROM study_materials WHERE level = ? AND subject = ? ORDER BY id"
+)
+_INSERT_MATERIAL = (
+    "INSERT INTO study_materials (level, subject, material_type, resource_name, difficulty, link, tags) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+
+def _progress_from_row(row) -> Dict:
+    if row is None:
+        return {"completion_rate": 0.0, "average_score": 0.0, "completed_materials": []}
+    completion_rate, average_score, completed_materials = row
+    return {
+        "completion_rate": completion_rate,
+        "average_score": average_score,
+        "completed_materials": completed_materials.split("|") if completed_materials else []
+    }
+
+
+def _subject_vocabulary(connection: sqlite3.Connection) -> List[str]:
+    return [subject for subject, in connection.execute(_SELECT_SUBJECT_VOCABULARY)]
+
+
+def _encode_history_subjects(connection: sqlite3.Connection, subjects_tested: Iterable) -> List[int]:
+    """
+    Masks for rows about to be inserted, adding new subjects to subject_vocabulary.
+
+    Must run inside the write transaction that inserts the rows.
+    """
+    vocabulary = _subject_vocabulary(connection)
+    known = len(vocabulary)
+    masks, vocabulary = encode_subjects(subjects_tested, vocabulary)
+    connection.executemany(_INSERT_SUBJECT, ((bit, vocabulary[bit]) for bit in range(known, len(vocabulary))))
+    # SQLite integers are signed; OVERFLOW_MASK is stored as the sign bit
+    return masks.astype(np.uint64).view(np.int64).tolist()
+
+
+def _migrate_history_ids(connection: sqlite3.Connection) -> None:
+    """Rebuild progress_history tables from before the id column, keeping each rowid as its id."""
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(progress_history)")]
+    if "id" in columns:
+        return
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(progress_history)")]
+        if "id" not in columns:
+            copied = ", ".join(columns)
+            connection.execute(_CREATE_HISTORY_TABLE.format(table="progress_history_with_ids"))
+            connection.execute(
+                f"INSERT INTO progress_history_with_ids (id, {copied}) "
+                f"SELECT rowid, {copied} FROM progress_history ORDER BY rowid"
+            )
+            connection.execute("DROP TABLE progress_history")
+            connection.execute("ALTER TABLE progress_history_with_ids RENAME TO progress_history")
+            for statement in _CREATE_HISTORY_INDEXES:
+                connection.execute(statement)
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+def _migrate_subject_masks(connection: sqlite3.Connection) -> None:
+    """Add subjects_mask to databases created before it existed and encode their rows."""
+    columns = [row[1] for row in connection.execute("PRAGMA table_info(progress_history)")]
+    if "subjects_mask" in columns:
+        return
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        columns = [row[1] for row in connection.execute("PRAGMA table_info(progress_history)")]
+        if "subjects_mask" not in columns:
+            connection.execute(
+                "ALTER TABLE progress_history ADD COLUMN subjects_mask INTEGER NOT NULL DEFAULT 0"
+            )
+            subjects = [value for value, in connection.execute(
+                "SELECT DISTINCT subjects_tested FROM progress_history WHERE subjects_tested IS NOT NULL"
+            )]
+            connection.executemany(
+                "UPDATE progress_history SET subjects_mask = ? WHERE subjects_tested = ?",
+                zip(_encode_history_subjects(connection, subjects), subjects)
+            )
+    except BaseException:
+        connection.execute("ROLLBACK")
+        raise
+    connection.execute("COMMIT")
+
+
+class SQLiteStorageBackend(StorageBackend):
+    """Progress, history and materials in one SQLite database (standard library sqlite3)."""
+
+    def __init__(self, db_path: str = "tutor.db", pool_size: int = 4):
+        self.db_path = db_path
+        self.pool = SQLiteConnectionPool(db_path, size=pool_size)
+        with self.pool.connection() as connection:
+            connection.executescript(_SCHEMA)
+            _migrate_subject_masks(connection)
+            _migrate_history_ids(connection)
+
+    def spec(self):
+        return "sqlite", os.path.abspath(self.db_path), self.pool.size
+
+    @contextmanager
+    def transaction(self, connection: sqlite3.Connection):
+        """Run a write transaction, taking the write lock up front."""
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        connection.execute("COMMIT")
+
+    def get_progress(self, student_id, subject):
+        with self.pool.connection() as connection:
+            row = connection.execute(_SELECT_PROGRESS, (str(student_id), str(subject))).fetchone()
+        return _progress_from_row(row)
+
+    def get_progress_many(self, keys):
+        keys = list(keys)
+        rows = {}
+        with self.pool.connection() as connection:
+            for first in range(0, len(keys), _MAX_SQL_PARAMETERS):
+                student_ids = list({str(student_id) for student_id, _ in keys[first:first + _MAX_SQL_PARAMETERS]})
+                query = _SELECT_PROGRESS_FOR_STUDENTS.format(placeholders=", ".join("?" * len(student_ids)))
+                for student_id, subject, *row in connection.execute(query, student_ids):
+                    rows[(student_id, subject)] = row
+        return {
+            (student_id, subject): _progress_from_row(rows.get((str(student_id), str(subject))))
+            for student_id, subject in keys
+        }
+
+    def update_progress(self, student_id, subject, score, completed_material):
+        event = {"score": score, "completed_material": completed_material}
+        student_id, subject = str(student_id), str(subject)
+        with self.pool.connection() as connection, self.transaction(connection):
+            row = connection.execute(_SELECT_PROGRESS, (student_id, subject)).fetchone()
+            record = _apply_progress_event(row, event)
+            connection.execute(_UPSERT_PROGRESS, (student_id, subject) + record)
+
+    def get_progress_history(self, student_id):
+        with self.pool.connection() as connection:
+            rows = connection.execute(_SELECT_HISTORY, (student_id,)).fetchall()
+        return pd.DataFrame(rows, columns=HISTORY_COLUMNS)
+
+    def get_progress_history_since(self, student_id, position=None, columns=None):
+        # position is the largest history id already read. Rows are returned in
+        # get_progress_history()'s (date, id) order, so new rows dated
+        # before ones already read mean the history is read again in full.
+        columns = list(columns) if columns is not None else HISTORY_COLUMNS
+        unknown = set(columns) - set(HISTORY_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown history columns: {', '.join(sorted(unknown))}")
+        with self.pool.connection() as connection:
+            last_id = connection.execute(_SELECT_HISTORY_LAST_ID, (student_id,)).fetchone()[0] or 0
+            reset = not isinstance(position, int) or position > last_id
+            if not reset and position < last_id:
+                first_new_date = connection.execute(
+                    _SELECT_HISTORY_FIRST_DATE_SINCE, (student_id, position, last_id)
+                ).fetchone()[0]
+                last_read_date = connection.execute(
+                    _SELECT_HISTORY_LAST_DATE_UNTIL, (student_id, position)
+                ).fetchone()[0]
+                reset = last_read_date is not None and first_new_date < last_read_date
+            query = _SELECT_HISTORY_SINCE.format(columns=", ".join(columns))
+            rows = connection.execute(query, (student_id, 0 if reset else position, last_id)).fetchall()
+        return pd.DataFrame(rows, columns=columns), last_id, reset
+
+    def history_signature(self, student_id):
+        # History rows are only appended, so the last id changes with every insert
+        with self.pool.connection() as connection:
+            last_id, = connection.execute(_SELECT_HISTORY_LAST_ID, (student_id,)).fetchone()
+        return os.path.abspath(self.db_path), last_id
+
+    def get_subject_masks(self, student_id):
+        with self.pool.connection() as connection:
+            masks = [mask for mask, in connection.execute(_SELECT_SUBJECT_MASKS, (student_id,))]
+            vocabulary = _subject_vocabulary(connection)
+        masks = np.array(masks, dtype=np.int64).view(np.uint64)
+        if masks.size and masks.max() >= OVERFLOW_MASK:
+            return masks, vocabulary
+        return masks.astype(mask_dtype(len(vocabulary))), vocabulary
+
+    def append_progress_history(self, student_id: str, rows: Iterable[tuple]) -> None:
+        """
+        Append (date, test_score, predicted_level, subjects_tested, time_spent_studying) rows.
+
+        subjects_tested is encoded into subjects_mask on the way in.
+        """
+        rows = [tuple(row) for row in rows]
+        with self.pool.connection() as connection, self.transaction(connection):
+            masks = _encode_history_subjects(connection, [row[3] for row in rows])
+            connection.executemany(
+                _INSERT_HISTORY, ((student_id,) + row + (mask,) for row, mask in zip(rows, masks))
+            )
+
+    def get_materials(self):
+        with self.pool.connection() as connection:
+            rows = connection.execute(_SELECT_MATERIALS).fetchall()
+        if not rows:
+            return None
+        return pd.DataFrame(rows, columns=MATERIALS_COLUMNS)
+
+    def save_materials(self, materials):
+        with self.pool.connection() as connection, self.transaction(connection):
+            connection.execute("DELETE FROM study_materials")
+            connection.executemany(_INSERT_MATERIAL, _rows(materials.reindex(columns=MATERIALS_COLUMNS)))
+
+    def get_materials_for(self, level: str, subject: Optional[str] = None) -> pd.DataFrame:
+        """Return materials for a level (and subject) through the (level, subject) index."""
+        with self.pool.connection() as connection:
+            if subject is None:
+                rows = connection.execute(_SELECT_MATERIALS_BY_LEVEL, (level,)).fetchall()
+            else:
+                rows = connection.execute(_SELECT_MATERIALS_BY_LEVEL_SUBJECT, (level, subject)).fetchall()
+        return pd.DataFrame(rows, columns=MATERIALS_COLUMNS)
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+def import_csv_data(
+    db_path: str,
+    progress_path: str = PROGRESS_FILE,
+    materials_path: str = MATERIALS_FILE,
+    history_pattern: str = HISTORY_FILE_PATTERN,
+    chunk_size: int = 100_000
+) -> SQLiteStorageBackend:
+    """
+    Copy the existing CSV data into a SQLite database.
+
+    The progress snapshot is imported together with any events still in its
+    log; per-student history files are found by expanding history_pattern.
+    Existing rows in the database are replaced.
+
+    Returns:
+        A SQLiteStorageBackend for the imported database
+    """
+    backend = SQLiteStorageBackend(db_path)
+    with backend.pool.connection() as connection, backend.transaction(connection):
+        if os.path.exists(progress_path) or os.path.exists(f"{progress_path}.log"):
+            records = _read_snapshot(progress_path) if os.path.exists(progress_path) else {}
+            _replay_log(f"{progress_path}.log", records)
+            connection.execute("DELETE FROM progress")
+            connection.executemany(
+                _UPSERT_PROGRESS,
+                (key + (rate, score, materials if isinstance(materials, str) else "")
+                 for key, (rate, score, materials) in records.items())
+            )
+
+        if os.path.exists(materials_path):
+            connection.execute("DELETE FROM study_materials")
+            for chunk in pd.read_csv(materials_path, chunksize=chunk_size):
+                chunk = chunk.reindex(columns=MATERIALS_COLUMNS)
+                connection.executemany(_INSERT_MATERIAL, _rows(chunk))
+
+        history_regex = re.compile(
+            "^" + re.escape(history_pattern).replace(re.escape("{student_id}"), "(.+)") + "$"
+        )
+        for path in glob.glob(history_pattern.format(student_id="*")):
+            match = history_regex.match(path)
+            if match is None:
+                continue
+            student_id = match.group(1)
+            connection.execute("DELETE FROM progress_history WHERE student_id = ?", (student_id,))
+            for chunk in pd.read_csv(path, chunksize=chunk_size):
+                chunk = chunk.reindex(columns=HISTORY_COLUMNS)
+                masks = _encode_history_subjects(connection, chunk["subjects_tested"])
+                connection.executemany(
+                    _INSERT_HISTORY, ((student_id,) + row + (mask,) for row, mask in zip(_rows(chunk), masks))
+                )
+    return backend
+
+
+def _rows(df: pd.DataFrame):
+    """DataFrame rows as tuples with NaN turned into NULL."""
+    return df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+
+
+# Backend used by get_student_progress, update_progress, the progress
+# visualizer and the study material recommender
+_storage_backend: Optional[StorageBackend] = None
+_storage_backend_lock = threading.Lock()
+# Backends a forked worker inherited from its parent; kept referenced so
+# their SQLite connections are never used or closed in the child
+_inherited_backends: List[StorageBackend] = []
+_BACKEND_KINDS = {"csv": CSVStorageBackend, "sqlite": SQLiteStorageBackend}
+
+
+def get_storage_backend() -> StorageBackend:
+    """Return the active storage backend, defaulting to the CSV files."""
+    global _storage_backend
+    backend = _storage_backend
+    if backend is None:
+        with _storage_backend_lock:
+            if _storage_backend is None:
+                _storage_backend = CSVStorageBackend()
+            backend = _storage_backend
+    return backend
+
+
+def set_storage_backend(backend) -> StorageBackend:
+    """
+    Switch every progress and materials consumer to another backend.
+
+    Args:
+        backend: A StorageBackend instance, or 'csv' / 'sqlite' for the defaults
+
+    Returns:
+        The backend now in use
+    """
+    global _storage_backend
+    if backend == "csv":
+        backend = CSVStorageBackend()
+    elif backend == "sqlite":
+        backend = SQLiteStorageBackend()
+    elif not isinstance(backend, StorageBackend):
+        raise ValueError("backend must be a StorageBackend, 'csv' or 'sqlite'")
+
+    with _storage_backend_lock:
+        previous, _storage_backend = _storage_backend, backend
+    if previous is not None:
+        previous.flush()
+    return backend
+
+
+def storage_backend_spec(backend: Optional[StorageBackend] = None) -> Optional[tuple]:
+    """
+    Description of backend (default: the active one) for worker processes.
+
+    set_storage_backend() only affects the current process. Pass the spec
+    to a process pool's initializer and call init_worker_storage_backend()
+    there, so workers use the same storage.
+    """
+    return (backend or get_storage_backend()).spec()
+
+
+def init_worker_storage_backend(spec: Optional[tuple]) -> None:
+    """
+    Process pool initializer: build this worker's own backend from storage_backend_spec().
+
+    SQLite connections must not cross a fork, so a backend inherited from
+    the parent is set aside unused instead of flushed or closed.
+    """
+    global _storage_backend
+    if spec is None:
+        return
+    kind, *arguments = spec
+    backend = _BACKEND_KINDS[kind](*arguments)
+    with _storage_backend_lock:
+        if _storage_backend is not None:
+            _inherited_backends.append(_storage_backend)
+        _storage_backend = backend
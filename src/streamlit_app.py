@@ -3,34 +3,68 @@ import joblib
 import pandas as pd
 import numpy as np
 import os
-from sklearn.tree import DecisionTreeClassifier
+import sys
+from level_prediction import build_next_level_table
+from model_artifact import load_model_artifact
 
-class EqualFeatureImportanceClassifier(DecisionTreeClassifier):
-    def __init__(self, **kwargs):
-        # Call the parent class constructor with all provided arguments
-        super().__init__(**kwargs)
-        self._feature_importances = None
-    
-    def fit(self, X, y, sample_weight=None):
-        # Fit the model using parent class method
-        super().fit(X, y, sample_weight)
+MODEL_NAME = "student_performance_model"
+
+def _define_pickled_model_classes():
+    """
+    Define the classes the older pickled models refer to.
+
+    Only the pickle fallback needs them, so scikit-learn is imported here
+    and not when the app serves from the model artifact.
+    """
+    from sklearn.tree import DecisionTreeClassifier
+
+    class EqualFeatureImportanceClassifier(DecisionTreeClassifier):
+        def __init__(self, **kwargs):
+            # Call the parent class constructor with all provided arguments
+            super().__init__(**kwargs)
+            self._feature_importances = None
         
-        # Set equal feature importances
-        n_features = X.shape[1]
-        self._feature_importances = np.ones(n_features) / n_features
+        def fit(self, X, y, sample_weight=None):
+            # Fit the model using parent class method
+            super().fit(X, y, sample_weight)
+            
+            # Set equal feature importances
+            n_features = X.shape[1]
+            self._feature_importances = np.ones(n_features) / n_features
+            
+            return self
         
-        return self
-    
-    @property
-    def feature_importances_(self):
-        return self._feature_importances
+        @property
+        def feature_importances_(self):
+            return self._feature_importances
+
+    # The pickles were written from a script, so unpickling looks the class up in __main__
+    EqualFeatureImportanceClassifier.__qualname__ = 'EqualFeatureImportanceClassifier'
+    globals()['EqualFeatureImportanceClassifier'] = EqualFeatureImportanceClassifier
+    setattr(sys.modules['__main__'], 'EqualFeatureImportanceClassifier', EqualFeatureImportanceClassifier)
 
+def _find_model_artifact(script_dir):
+    """Return the base path of the model artifact next to the app or in models/."""
+    for directory in (script_dir, os.path.join(script_dir, "models")):
+        base_path = os.path.join(directory, MODEL_NAME)
+        if os.path.exists(f"{base_path}.json"):
+            return base_path
+    return None
+
+@st.cache_resource
 def load_model_and_encoders():
     # Get the directory of the current script
     script_dir = os.path.dirname(os.path.abspath(__file__))
     
     try:
-        # Load the saved model
+        # Prefer the pickle-free artifact, mapped once per process
+        base_path = _find_model_artifact(script_dir)
+        if base_path is not None:
+            artifact = load_model_artifact(base_path)
+            return artifact.model, artifact.encoders
+
+        # Fall back to the pickles written by older training runs
+        _define_pickled_model_classes()
         model_path = os.path.join(script_dir, "student_performance_model.pkl")
         encoders_path = os.path.join(script_dir, "label_encoders.pkl")
         
@@ -42,7 +76,22 @@ def load_model_and_encoders():
         st.error(f"Error loading model: {e}")
         return None, None
 
-def predict_next_level(model, encoders, input_data):
+@st.cache_resource
+def load_prediction_table(_model, _encoders):
+    # Every integer age/score combination, evaluated once per process
+    try:
+        return build_next_level_table(_model, _encoders)
+    except Exception as e:
+        st.warning(f"Prediction table unavailable, using the model directly: {e}")
+        return None
+
+def predict_next_level(model, encoders, input_data, table=None):
+    # Integer inputs inside the table's ranges are a single array lookup
+    if table is not None:
+        predicted_level = table.lookup(*(input_data[column] for column in table.columns))
+        if predicted_level is not None:
+            return predicted_level
+    
     # Get the label encoders and scaler
     knowledge_encoder = encoders['knowledge_encoder']
     learning_encoder = encoders['learning_encoder']
@@ -76,6 +125,7 @@ def main():
     if model is None or encoders is None:
         st.error("Could not load the model. Please run the training script first.")
         return
+    table = load_prediction_table(model, encoders)
     
     # Get unique values for categorical features
     knowledge_levels = encoders['knowledge_encoder'].classes_
@@ -103,7 +153,7 @@ def main():
         }
         
         # Make prediction
-        predicted_level = predict_next_level(model, encoders, input_data)
+        predicted_level = predict_next_level(model, encoders, input_data, table)
         
         # Display prediction
         st.success(f"Predicted Next Level: {predicted_level}")
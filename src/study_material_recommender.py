@@ -1,20 +1,97 @@
 import pandas as pd
-from pathlib import Path
 import random
+import threading
+from material_index import MaterialIndex
+from storage_backends import get_storage_backend
+
+class MaterialCatalog:
+    """
+    Study materials loaded once and grouped by (level, subject)
+
+    groups maps (level, subject) and (level, None) to read-only int32 row
+    arrays, so an unranked recommendation is a sample of a precomputed
+    group. The catalog is shared between recommenders and must not be
+    modified; load a new one instead.
+    """
+
+    def __init__(self, df, version=None):
+        self.df = df
+        self.version = version
+        # Postings and BM25 text index, built once per load
+        self.index = MaterialIndex(df)
+        self.groups = {}
+        for level in self.index.field_values['level']:
+            self.groups[(level, None)] = self.index.matching_rows(level=level)
+            for subject in self.index.field_values['subject']:
+                rows = self.index.matching_rows(level=level, subject=subject)
+                if len(rows):
+                    self.groups[(level, subject)] = rows
+        for rows in self.groups.values():
+            rows.flags.writeable = False
+
+# Shared by the standalone functions below
+_shared_catalog = None
+_shared_catalog_lock = threading.Lock()
+
+def get_catalog():
+    """
+    Return the shared materials catalog, reloading it when the source changes
+
+    The storage backend's materials_version (the CSV file's mtime and size)
+    is checked on every call and the catalog is rebuilt only when it differs.
+    Backends without a version keep the first catalog until reload_catalog().
+
+    Returns:
+    MaterialCatalog: The current catalog, or None if it could not be loaded
+    """
+    global _shared_catalog
+    version = get_storage_backend().materials_version()
+    catalog = _shared_catalog
+    if catalog is not None and (version is None or version == catalog.version):
+        return catalog
+    
+    with _shared_catalog_lock:
+        catalog = _shared_catalog
+        if catalog is None or (version is not None and version != catalog.version):
+            catalog = StudyMaterialRecommender().catalog
+            if catalog is not None:
+                _shared_catalog = catalog
+    return catalog
+
+def reload_catalog():
+    """Rebuild the shared catalog from the storage backend."""
+    global _shared_catalog
+    catalog = StudyMaterialRecommender().catalog
+    with _shared_catalog_lock:
+        _shared_catalog = catalog
+    return catalog
 
 class StudyMaterialRecommender:
-    def __init__(self):
-        self.df = self.load_study_materials()
+    def __init__(self, catalog=None):
+        """
+        Args:
+        catalog (MaterialCatalog, optional): Shared catalog to use instead of loading one
+        """
+        if catalog is None:
+            # Read the version first so a concurrent change triggers another reload
+            version = get_storage_backend().materials_version()
+            df = self.load_study_materials()
+            if df is not None:
+                catalog = MaterialCatalog(df, version)
+        self.catalog = catalog
+        self.df = catalog.df if catalog is not None else None
+        self.index = catalog.index if catalog is not None else None
         self.valid_levels = ['Beginner', 'Intermediate', 'Advanced']
         self.valid_subjects = ['Math', 'Science', 'English']
 
     def load_study_materials(self):
         """Load and validate study materials database"""
         try:
-            if not Path('study_materials_database.csv').exists():
+            backend = get_storage_backend()
+            df = backend.get_materials()
+            if df is None:
                 self.create_sample_csv()
-            
-            df = pd.read_csv('study_materials_database.csv')
+                df = backend.get_materials()
             
             # Validate required columns
             required_columns = ['level', 'subject', 'material_type', 'resource_name']
@@ -30,7 +107,7 @@ class StudyMaterialRecommender:
             return None
 
     def create_sample_csv(self):
-        """Create sample CSV if not exists"""
+        """Seed the active storage backend with sample materials when it has none"""
         sample_data = {
             'level': ['Beginner']*4 + ['Intermediate']*4 + ['Advanced']*4,
             'subject': ['Math', 'Math', 'Science', 'English']*3,
@@ -58,11 +135,17 @@ class StudyMaterialRecommender:
                 'angles advanced', 'derivatives integrals', 'particles theory', 'composition advanced'
             ]
         }
-        pd.DataFrame(sample_data).to_csv('study_materials_database.csv', index=False)
+        get_storage_backend().save_materials(pd.DataFrame(sample_data))
         print("Created sample study materials database")
 
-    def get_recommendations(self, predicted_level, subject=None, num_recommendations=3):
-        """Get personalized recommendations"""
+    def get_recommendations(self, predicted_level, subject=None, num_recommendations=3, query=None):
+        """
+        Get personalized recommendations
+
+        Without a query a random selection of the matching materials is
+        returned; with one, the best BM25 matches on tags and resource name.
+        Results are read-only record views that behave like dicts.
+        """
         if self.df is None:
             return None
             
@@ -72,17 +155,19 @@ class StudyMaterialRecommender:
         if subject and subject not in self.valid_subjects:
             raise ValueError(f"Invalid subject. Must be one of: {', '.join(self.valid_subjects)}")
             
-        # Filter materials
-        filtered = self.df[self.df['level'] == predicted_level]
-        if subject:
-            filtered = filtered[filtered['subject'] == subject]
+        if query:
+            recommendations = self.index.search(
+                query, k=num_recommendations, level=predicted_level, subject=subject
+            )
+            return recommendations or None
         
-        # Select random recommendations if available
-        if not filtered.empty:
-            if len(filtered) > num_recommendations:
-                filtered = filtered.sample(n=num_recommendations)
-            return filtered.to_dict('records')
-        return None
+        # Sample from the precomputed (level, subject) group
+        rows = self.catalog.groups.get((predicted_level, subject or None))
+        if rows is None or len(rows) == 0:
+            return None
+        if len(rows) > num_recommendations:
+            rows = rows[random.sample(range(len(rows)), num_recommendations)]
+        return [self.index.record(int(row)) for row in rows]
 
     def print_recommendations(self, predicted_level, subject=None):
         """Display recommendations in user-friendly format"""
@@ -114,12 +199,12 @@ class StudyMaterialRecommender:
 # Standalone functions for easy integration
 def get_recommendations(level, subject=None):
     """Standalone function to get recommendations"""
-    recommender = StudyMaterialRecommender()
+    recommender = StudyMaterialRecommender(catalog=get_catalog())
     return recommender.get_recommendations(level, subject)
 
 def print_recommendations(level, subject=None):
     """Standalone function to print recommendations"""
-    recommender = StudyMaterialRecommender()
+    recommender = StudyMaterialRecommender(catalog=get_catalog())
     return recommender.print_recommendations(level, subject)
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+# subject_masks.py
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+# subjects_tested holds subject names joined by this separator
+SUBJECT_SEPARATOR = ', '
+# Subjects that get their own bit; later ones only set OVERFLOW_MASK
+MAX_SUBJECTS = 63
+# Set on rows that tested a subject without a bit; their subjects_tested
+# string is the only record of that subject
+OVERFLOW_MASK = 1 << MAX_SUBJECTS
+
+
+def mask_dtype(n_subjects: int) -> np.dtype:
+    """Smallest unsigned integer type with a bit for each of n_subjects; uint64 past MAX_SUBJECTS."""
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if n_subjects <= np.iinfo(dtype).bits:
+            return np.dtype(dtype)
+    return np.dtype(np.uint64)
+
+
+def encode_subjects(
+    values: Iterable,
+    vocabulary: Optional[Sequence[str]] = None
+) -> Tuple[np.ndarray, List[str]]:
+    """
+    Turn subjects_tested strings into multi-hot bitmasks.
+
+    Bit i of a mask is set when the row tested vocabulary[i]. Only the
+    distinct strings are split, so the cost is one hashing pass over the
+    rows. Missing values and empty strings encode as 0. Subjects past
+    MAX_SUBJECTS are not added to the vocabulary; rows that tested one get
+    OVERFLOW_MASK on top of the bits of their other subjects.
+
+    Args:
+        values: subjects_tested per row, e.g. 'Math, Science'
+        vocabulary: Subjects already assigned to bits; new subjects are
+            appended in order of first appearance, so earlier masks stay valid
+
+    Returns:
+        (masks, vocabulary) with masks of dtype mask_dtype(len(vocabulary)),
+        or uint64 when a row overflowed
+    """
+    vocabulary = list(vocabulary) if vocabulary is not None else []
+    bits = {subject: bit for bit, subject in enumerate(vocabulary)}
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+
+    # One extra slot for code -1 (missing values)
+    unique_masks = np.zeros(len(uniques) + 1, dtype=np.uint64)
+    overflow = False
+    for code, value in enumerate(uniques):
+        mask = 0
+        for subject in str(value).split(SUBJECT_SEPARATOR):
+            if not subject:
+                continue
+            bit = bits.get(subject)
+            if bit is None and len(vocabulary) < MAX_SUBJECTS:
+                bit = bits[subject] = len(vocabulary)
+                vocabulary.append(subject)
+            if bit is None:
+                mask |= OVERFLOW_MASK
+                overflow = True
+            else:
+                mask |= 1 << bit
+        unique_masks[code] = mask
+    dtype = np.uint64 if overflow else mask_dtype(len(vocabulary))
+    return unique_masks.astype(dtype)[codes], vocabulary
+
+
+def _split_overflow(
+    masks: np.ndarray,
+    vocabulary: Sequence[str],
+    subjects_tested: Optional[Iterable]
+) -> pd.Series:
+    """Subjects without a bit, one entry per row and subject, from the rows flagged with OVERFLOW_MASK."""
+    if subjects_tested is None or masks.dtype.itemsize < 8:
+        return pd.Series([], dtype=object)
+    flagged = np.flatnonzero(masks & np.uint64(OVERFLOW_MASK))
+    if not len(flagged):
+        return pd.Series([], dtype=object)
+    values = pd.Series(pd.Series(subjects_tested, dtype=object).to_numpy()[flagged], index=flagged).dropna()
+    subjects = values.astype(str).str.split(SUBJECT_SEPARATOR).explode()
+    return subjects[(subjects != '') & ~subjects.isin(list(vocabulary))]
+
+
+def subject_counts(
+    masks: np.ndarray,
+    vocabulary: Sequence[str],
+    subjects_tested: Optional[Iterable] = None
+) -> pd.Series:
+    """
+    Number of rows that tested each subject, like value_counts() of the split strings.
+
+    Args:
+        subjects_tested: The strings the masks were encoded from, in the
+            same order; only read for rows flagged with OVERFLOW_MASK, to
+            count the subjects past MAX_SUBJECTS. Those are left out without it
+
+    Returns:
+        Counts indexed by subject, most tested first; untested subjects are left out
+    """
+    masks = np.asarray(masks)
+    if masks.dtype.itemsize <= 2:
+        # One pass: histogram of the distinct masks, then sum the ones with each bit set
+        histogram = np.bincount(masks, minlength=1 << (8 * masks.dtype.itemsize))
+        values = np.arange(len(histogram))
+        counts = [int(histogram[(values >> bit) & 1 == 1].sum()) for bit in range(len(vocabulary))]
+    else:
+        counts = [int(np.count_nonzero(masks & masks.dtype.type(1 << bit))) for bit in range(len(vocabulary))]
+    series = pd.Series(counts, index=pd.Index(list(vocabulary), name='subjects_tested'), name='count')
+    overflow = _split_overflow(masks, vocabulary, subjects_tested)
+    if len(overflow):
+        # A subject listed twice in one string still counts the row once
+        rows = overflow.reset_index().drop_duplicates()
+        series = pd.concat([series, rows.iloc[:, 1].value_counts().rename_axis('subjects_tested')])
+    return series[series > 0].sort_values(ascending=False, kind='stable')
+
+
+def subjects_filter(
+    masks: np.ndarray,
+    vocabulary: Sequence[str],
+    subjects: Iterable[str],
+    require_all: bool = False,
+    subjects_tested: Optional[Iterable] = None
+) -> np.ndarray:
+    """
+    Boolean row filter: rows that tested any (or all) of the given subjects.
+
+    A subject missing from the vocabulary matches no row, unless
+    subjects_tested is given and it is one of the subjects past
+    MAX_SUBJECTS (see subject_counts()).
+    """
+    masks = np.asarray(masks)
+    bits = {subject: bit for bit, subject in enumerate(vocabulary)}
+    wanted = 0
+    unencoded = set()
+    for subject in subjects:
+        if subject in bits:
+            wanted |= 1 << bits[subject]
+        else:
+            unencoded.add(subject)
+    wanted = masks.dtype.type(wanted)
+    if require_all:
+        matched = (masks & wanted) == wanted
+    else:
+        matched = (masks & wanted) != 0
+    if not unencoded:
+        return matched
+    overflow = _split_overflow(masks, vocabulary, subjects_tested)
+    overflow = overflow[overflow.isin(unencoded)]
+    if require_all:
+        found = overflow.groupby(level=0).nunique()
+        rows = found.index[found == len(unencoded)]
+        result = np.zeros(len(masks), dtype=bool)
+        result[rows] = matched[rows]
+        return result
+    result = matched.copy()
+    result[np.unique(overflow.index)] = True
+    return result
@@ -0,0 +1,162 @@
+# substitution_engine.py
+import re
+from typing import Dict, Mapping, Optional
+
+
+def _build_trie(keys):
+    """Build a character trie from the given keys. The empty string marks a terminal node."""
+    root = {}
+    for key in keys:
+        node = root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[''] = True
+    return root
+
+
+def _trie_to_pattern(node) -> str:
+    """
+    Convert a character trie into a regex alternation.
+
+    Sharing prefixes keeps the alternation small, and the greedy optional
+    groups make the engine try the longest key first, falling back to
+    shorter keys only when the word-boundary check fails.
+    """
+    is_terminal = '' in node
+    branches = [
+        re.escape(char) + _trie_to_pattern(child)
+        for char, child in sorted((c, n) for c, n in node.items() if c != '')
+    ]
+
+    if not branches:
+        return ''
+    if len(branches) == 1 and not is_terminal:
+        return branches[0]
+
+    pattern = '(?:' + '|'.join(branches) + ')'
+    if is_terminal:
+        pattern += '?'
+    return pattern
+
+
+class SubstitutionEngine:
+    """
+    Rewrites text in a single pass using one precompiled regex.
+
+    Keys are matched on word boundaries and the longest key wins, so
+    "metaphorically" is never rewritten through its prefix "metaphor".
+    Replacement output is never rescanned.
+    """
+
+    def __init__(self, mapping: Mapping[str, str], ignore_case: bool = False):
+        """
+        Args:
+            mapping: Dictionary of phrase -> replacement
+            ignore_case: Match keys case-insensitively
+        """
+        self.ignore_case = ignore_case
+        if ignore_case:
+            self._lookup = {key.lower(): value for key, value in mapping.items() if key}
+        else:
+            self._lookup = {key: value for key, value in mapping.items() if key}
+
+        self._pattern = None
+        if self._lookup:
+            flags = re.IGNORECASE if ignore_case else 0
+            alternation = _trie_to_pattern(_build_trie(self._lookup))
+            self._pattern = re.compile(r'(?<!\w)' + alternation + r'(?!\w)', flags)
+
+    def __len__(self) -> int:
+        return len(self._lookup)
+
+    def _replace(self, match) -> str:
+        matched = match.group(0)
+        if self.ignore_case:
+            matched = matched.lower()
+        return self._lookup[matched]
+
+    def substitute(self, text: str) -> str:
+        """
+        Replace every dictionary phrase in the text.
+
+        Args:
+            text: Input text
+
+        Returns:
+            Text with all matched phrases replaced
+        """
+        if self._pattern is None or not text:
+            return text
+        return self._pattern.sub(self._replace, text)
+
+
+class SubstitutionDictionary(dict):
+    """
+    Dictionary of word substitutions that owns a compiled SubstitutionEngine.
+
+    The engine is compiled on first use and dropped whenever the dictionary
+    is modified, so it is rebuilt only after the words actually change.
+    `version` increases on every modification and can be used by callers
+    to invalidate anything derived from the substitutions.
+    """
+
+    def __init__(self, *args, ignore_case: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.ignore_case = ignore_case
+        self.version = 0
+        self._engine: Optional[SubstitutionEngine] = None
+
+    def _invalidate(self) -> None:
+        self._engine = None
+        self.version += 1
+
+    @property
+    def engine(self) -> SubstitutionEngine:
+        """Return the compiled engine, building it if the words changed."""
+        engine = self._engine
+        if engine is None:
+            engine = SubstitutionEngine(self, ignore_case=self.ignore_case)
+            self._engine = engine
+        return engine
+
+    def substitute(self, text: str) -> str:
+        """Rewrite the text using the current substitutions."""
+        return self.engine.substitute(text)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._invalidate()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._invalidate()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._invalidate()
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self._invalidate()
+        return super().setdefault(key, default)
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._invalidate()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._invalidate()
+        return item
+
+    def clear(self):
+        super().clear()
+        self._invalidate()
+
+    def copy(self) -> Dict[str, str]:
+        return SubstitutionDictionary(self, ignore_case=self.ignore_case)
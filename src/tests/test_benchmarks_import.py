@@ -0,0 +1,19 @@
+import glob
+import importlib.util
+import os
+import sys
+
+import pytest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+sys.path.insert(0, os.path.join(SRC_DIR, "benchmarks"))
+
+BENCHMARKS = sorted(glob.glob(os.path.join(SRC_DIR, "benchmarks", "bench_*.py")))
+
+
+@pytest.mark.parametrize("path", BENCHMARKS, ids=os.path.basename)
+def test_benchmark_imports(path):
+    # Benchmarks only run under __main__; importing catches names moved out of the modules they use
+    spec = importlib.util.spec_from_file_location(os.path.basename(path)[:-3], path)
+    spec.loader.exec_module(importlib.util.module_from_spec(spec))
@@ -0,0 +1,144 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collaborative_filtering import (
+    ItemItemModel,
+    interactions_from_progress,
+    precision_at_k,
+    train_item_item_model,
+)
+
+PROGRESS = pd.DataFrame([
+    ("S1", "Mathematics", 80.0, "m1|m2|m3"),
+    ("S1", "Science", 40.0, "m3|s1"),
+    ("S2", "Mathematics", 60.0, "m1|m2"),
+    ("S3", "Mathematics", 100.0, "m2|m4"),
+    ("S4", "Science", 50.0, "s1|s2"),
+    ("S5", "English", 90.0, ""),
+], columns=["student_id", "subject", "average_score", "completed_materials"])
+
+
+def random_interactions(seed, n_students=60, n_items=40, per_student=6):
+    rng = np.random.default_rng(seed)
+    students = np.repeat(np.arange(n_students), per_student)
+    items = np.concatenate([rng.choice(n_items, per_student, replace=False) for _ in range(n_students)])
+    weights = rng.uniform(0.1, 1.0, len(items)).astype(np.float32)
+    return students.astype(np.int32), items.astype(np.int32), weights, [f"m{i}" for i in range(n_items)]
+
+
+def direct_similarities(students, items, weights, n_items):
+    ratings = np.zeros((students.max() + 1, n_items))
+    np.add.at(ratings, (students, items), weights)
+    normalized = ratings / np.maximum(np.linalg.norm(ratings, axis=0), 1e-12)
+    similarities = normalized.T @ normalized
+    np.fill_diagonal(similarities, 0)
+    return similarities
+
+
+def model_similarities(model):
+    dense = np.zeros((len(model.materials), len(model.materials)))
+    for item in range(len(model.materials)):
+        start, end = model.indptr[item], model.indptr[item + 1]
+        dense[item, model.indices[start:end]] = model.similarities[start:end]
+    return dense
+
+
+def test_interactions_keep_the_best_weight_per_material():
+    student_codes, material_codes, weights, students, materials = interactions_from_progress(PROGRESS)
+    pairs = {(students[s], materials[m]): w for s, m, w in zip(student_codes, material_codes, weights)}
+    # m3 was completed in two subjects; the higher average score wins
+    assert pairs[("S1", "m3")] == pytest.approx(0.8)
+    assert pairs[("S1", "s1")] == pytest.approx(0.4)
+    assert len(pairs) == 10
+    # A student with nothing completed contributes no interactions
+    assert "S5" not in students and "" not in materials
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_similarities_match_a_dense_cosine(seed):
+    students, items, weights, materials = random_interactions(seed)
+    expected = direct_similarities(students, items, weights, len(materials))
+    model = train_item_item_model(students, items, weights, materials, neighbours=len(materials), block_size=7)
+    np.testing.assert_allclose(model_similarities(model), expected, atol=1e-5)
+    # Neighbour lists are sorted strongest first
+    for item in range(len(materials)):
+        row = model.similarities[model.indptr[item]:model.indptr[item + 1]]
+        assert np.all(np.diff(row) <= 0)
+
+
+def test_only_the_strongest_neighbours_are_kept():
+    students, items, weights, materials = random_interactions(0)
+    expected = direct_similarities(students, items, weights, len(materials))
+    model = train_item_item_model(students, items, weights, materials, neighbours=5)
+    for item in range(len(materials)):
+        kept = model.similarities[model.indptr[item]:model.indptr[item + 1]]
+        assert len(kept) == min(5, np.count_nonzero(expected[item] > 0))
+        np.testing.assert_allclose(kept, np.sort(expected[item])[::-1][:len(kept)], atol=1e-5)
+    # The block size only bounds memory; the model is the same
+    single_block = train_item_item_model(students, items, weights, materials, neighbours=5, block_size=len(materials))
+    np.testing.assert_allclose(model_similarities(model), model_similarities(single_block), atol=1e-6)
+
+
+def test_recommend_scores_match_the_summed_neighbour_lists():
+    students, items, weights, materials = random_interactions(1)
+    model = train_item_item_model(students, items, weights, materials, neighbours=len(materials))
+    similarities = direct_similarities(students, items, weights, len(materials))
+    history = {"m0": 1.0, "m3": 0.5, "unknown": 1.0}
+    expected = similarities[0] + 0.5 * similarities[3]
+    expected[[0, 3]] = 0
+
+    results = model.recommend(history, k=5)
+    assert [url for url, _ in results] == [f"m{i}" for i in np.argsort(-expected, kind="stable")[:5]]
+    np.testing.assert_allclose([score for _, score in results], np.sort(expected)[::-1][:5], atol=1e-5)
+
+    candidates = ["m3", "m7", "missing"]
+    scores = model.score_candidates(history, candidates)
+    np.testing.assert_allclose(scores, [0.0, expected[7], 0.0], atol=1e-5)
+
+
+def test_short_and_empty_histories_are_filled_by_popularity():
+    student_codes, material_codes, weights, _, materials = interactions_from_progress(PROGRESS)
+    model = train_item_item_model(student_codes, material_codes, weights, materials)
+    # m2 has the most summed weight, then m1
+    assert [url for url, _ in model.recommend([], k=2)] == ["m2", "m1"]
+    assert all(score == 0.0 for _, score in model.recommend([], k=2))
+
+    results = model.recommend(["s2"], k=4)
+    urls = [url for url, _ in results]
+    assert urls[0] == "s1" and results[0][1] > 0
+    assert "s2" not in urls and len(urls) == len(set(urls)) == 4
+
+
+def test_save_and_load_round_trip(tmp_path):
+    students, items, weights, materials = random_interactions(2)
+    model = train_item_item_model(students, items, weights, materials, neighbours=8)
+    path = str(tmp_path / "item_item.npz")
+    model.save(path)
+    assert os.path.exists(tmp_path / "item_item.materials.json")
+
+    loaded = ItemItemModel.load(path)
+    assert loaded.materials == model.materials
+    for name in ("indptr", "indices", "similarities", "popularity"):
+        np.testing.assert_array_equal(getattr(loaded, name), getattr(model, name))
+    history = ["m1", "m5", "m9"]
+    assert loaded.recommend(history, k=10) == model.recommend(history, k=10)
+
+
+def test_precision_at_k():
+    def recommend(history, k):
+        return [(url, 1.0) for url in ["a", "b", "c", "d"][:k]]
+
+    assert precision_at_k(recommend, [[], []], [{"a", "x"}, {"c", "d"}], k=2) == pytest.approx(0.25)
+    with pytest.raises(ValueError):
+        precision_at_k(recommend, [], [], k=2)
+
+
+def test_mismatched_interaction_lengths_are_rejected():
+    with pytest.raises(ValueError):
+        train_item_item_model(np.array([0, 1]), np.array([0]), np.array([1.0, 1.0]), ["m0"])
@@ -0,0 +1,103 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIR)
+
+pytest.importorskip("sklearn")
+joblib = pytest.importorskip("joblib")
+
+from compiled_tree import CompiledTree, export_tree
+from model_artifact import read_model_artifact, save_model_artifact
+from model_training import EqualFeatureImportanceClassifier, _encode_training_data
+
+MODELS_DIR = os.path.join(SRC_DIR, "models")
+AGES = np.arange(0, 101)
+SCORES = np.arange(0, 101)
+
+
+@pytest.fixture(scope="module")
+def trained():
+    df = pd.read_csv(os.path.join(SRC_DIR, "data", "intel.csv"))
+    X, y, encoders = _encode_training_data(df)
+    model = EqualFeatureImportanceClassifier(random_state=42).fit(X, y)
+    return model, encoders, X
+
+
+def _grid(encoders):
+    """Every integer age and score the app accepts, with every category."""
+    knowledge = encoders['knowledge_encoder'].classes_
+    learning = encoders['learning_encoder'].classes_
+    age, score, k, l = np.meshgrid(AGES, SCORES, np.arange(len(knowledge)), np.arange(len(learning)), indexing='ij')
+    return pd.DataFrame({
+        'Age': age.ravel(),
+        'Last_Test_Score': score.ravel(),
+        'Knowledge_Level': knowledge[k.ravel()],
+        'Learning_Speed': learning[l.ravel()]
+    })
+
+
+def _sklearn_levels(model, encoders, grid):
+    """The Streamlit app's per-row encode + predict path, for a whole grid."""
+    X = grid.copy()
+    X['Knowledge_Level'] = encoders['knowledge_encoder'].transform(X['Knowledge_Level'])
+    X['Learning_Speed'] = encoders['learning_encoder'].transform(X['Learning_Speed'])
+    X[['Age', 'Last_Test_Score']] = encoders['scaler'].transform(X[['Age', 'Last_Test_Score']])
+    return encoders['target_encoder'].inverse_transform(model.predict(X)), X
+
+
+def test_compiled_tree_matches_sklearn(trained):
+    model, encoders, X = trained
+    tree = CompiledTree(export_tree(model))
+
+    # For every split, a training row that reaches it with the split feature
+    # moved to just below, at and just above the threshold
+    X_values = X.to_numpy(dtype=np.float64)
+    reaches = model.decision_path(X).tocsc()
+    rows = []
+    for node in np.flatnonzero(model.tree_.feature >= 0):
+        feature, threshold = model.tree_.feature[node], model.tree_.threshold[node]
+        sample = X_values[reaches.indices[reaches.indptr[node]]]
+        for value in (np.nextafter(threshold, -np.inf), threshold, np.nextafter(threshold, np.inf)):
+            row = sample.copy()
+            row[feature] = value
+            rows.append(row)
+    edges = pd.DataFrame(rows, columns=X.columns)
+
+    _, grid = _sklearn_levels(model, encoders, _grid(encoders))
+    for features_df in (X, edges, grid):
+        expected = model.predict(features_df)
+        np.testing.assert_array_equal(tree.predict(features_df), expected)
+        sample = features_df.to_numpy()[::97]
+        assert [tree.predict_one(row) for row in sample] == expected[::97].tolist()
+
+
+def _assert_artifact_matches(model, encoders, artifact):
+    grid = _grid(encoders)
+    expected, _ = _sklearn_levels(model, encoders, grid)
+    predicted = [
+        artifact.predict_level(age, score, knowledge, learning)
+        for age, score, knowledge, learning in grid.itertuples(index=False, name=None)
+    ]
+    assert predicted == expected.tolist()
+
+
+def test_artifact_matches_trained_model(trained, tmp_path):
+    model, encoders, _ = trained
+    save_model_artifact(model, encoders, str(tmp_path / "model"))
+    _assert_artifact_matches(model, encoders, read_model_artifact(str(tmp_path / "model")))
+
+
+def test_shipped_artifact_matches_shipped_pickle():
+    base_path = os.path.join(MODELS_DIR, "student_performance_model")
+    if not all(os.path.exists(path) for path in (f"{base_path}.pkl", f"{base_path}.json")):
+        pytest.skip("no shipped model")
+    # The pickle refers to the class through __main__
+    sys.modules['__main__'].EqualFeatureImportanceClassifier = EqualFeatureImportanceClassifier
+    model = joblib.load(f"{base_path}.pkl")
+    encoders = joblib.load(os.path.join(MODELS_DIR, "label_encoders.pkl"))
+    _assert_artifact_matches(model, encoders, read_model_artifact(base_path))
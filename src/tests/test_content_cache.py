@@ -0,0 +1,47 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Adaptive_Learning_Content_Generator import AdaptiveLearningContentGenerator
+
+
+def slow_math(generator):
+    return generator.generate_adaptive_content("Mathematics", "slow")["content"]
+
+
+def test_changing_a_dictionary_invalidates_cached_content():
+    generator = AdaptiveLearningContentGenerator()
+    before = slow_math(generator)
+    assert slow_math(generator) == before
+    assert generator.cache_stats()["hits"] == 1
+
+    generator.simple_words["numbers"] = "digits"
+    after = slow_math(generator)
+    assert "digits" in after and after != before
+
+    # Replacing the whole dictionary also counts as a change
+    generator.simple_words = {"numbers": "values"}
+    assert "values" in slow_math(generator)
+
+
+def test_rendering_finished_after_a_dictionary_change_is_not_served():
+    generator = AdaptiveLearningContentGenerator()
+    process_content = generator.process_content
+    interleaved = []
+
+    def process_then_race(content, learning_speed):
+        result = process_content(content, learning_speed)
+        if not interleaved:
+            interleaved.append(None)
+            # Another thread changes the words and caches the new rendering
+            # before this, now stale, rendering is stored
+            generator.simple_words["numbers"] = "digits"
+            interleaved[0] = slow_math(generator)
+        return result
+
+    generator.process_content = process_then_race
+    stale = slow_math(generator)
+    assert "digits" not in stale
+    assert "digits" in interleaved[0]
+    assert slow_math(generator) == interleaved[0]
@@ -0,0 +1,72 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from downsampling import DOWNSAMPLING_METHODS, downsample_indices, lttb_indices, min_max_indices
+
+
+def noisy_series(seed, n):
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.5, 2.0, n))
+    y = 60 + np.cumsum(rng.normal(0, 1, n))
+    return x, y
+
+
+@pytest.mark.parametrize("method", DOWNSAMPLING_METHODS)
+@pytest.mark.parametrize("n, n_points", [(1_000, 100), (1_001, 37), (10_000, 500), (50, 49), (7, 4)])
+def test_indices_are_ascending_unique_and_bounded(method, n, n_points):
+    x, y = noisy_series(n, n)
+    indices = downsample_indices(x, y, n_points, method=method)
+    assert indices[0] == 0 and indices[-1] == n - 1
+    assert np.all(np.diff(indices) > 0)
+    assert len(indices) <= n_points
+    if method == 'lttb':
+        # LTTB keeps exactly one point per bucket
+        assert len(indices) == n_points
+
+
+@pytest.mark.parametrize("method", DOWNSAMPLING_METHODS)
+def test_short_series_are_kept_whole(method):
+    x, y = noisy_series(0, 20)
+    np.testing.assert_array_equal(downsample_indices(x, y, 20, method=method), np.arange(20))
+    np.testing.assert_array_equal(downsample_indices(x, y, 100, method=method), np.arange(20))
+
+
+@pytest.mark.parametrize("method", DOWNSAMPLING_METHODS)
+def test_nan_values_are_skipped(method):
+    x, y = noisy_series(1, 2_000)
+    y[0] = np.nan
+    y[500:520] = np.nan
+    y[-1] = np.nan
+    x[900] = np.nan
+    indices = downsample_indices(x, y, 100, method=method)
+    assert np.all(np.isfinite(y[indices])) and np.all(np.isfinite(x[indices]))
+    # The first and last finite points stand in for the missing end points
+    assert indices[0] == 1 and indices[-1] == len(y) - 2
+    assert np.all(np.diff(indices) > 0) and len(indices) <= 100
+
+
+@pytest.mark.parametrize("method", DOWNSAMPLING_METHODS)
+@pytest.mark.parametrize("position", [1, 733, 4_998])
+def test_a_spike_survives(method, position):
+    x = np.arange(5_000, dtype=np.float64)
+    y = np.full(5_000, 70.0) + np.sin(x / 50)
+    y[position] = 100.0
+    y[position + 1000 if position < 4_000 else position - 1000] = 20.0
+    indices = downsample_indices(x, y, 60, method=method)
+    assert position in indices
+    assert y[indices].min() == 20.0 and y[indices].max() == 100.0
+
+
+def test_minimum_point_counts():
+    x, y = noisy_series(2, 100)
+    with pytest.raises(ValueError):
+        lttb_indices(x, y, 2)
+    with pytest.raises(ValueError):
+        min_max_indices(y, 3)
+    with pytest.raises(ValueError):
+        downsample_indices(x, y, 10, method='average')
@@ -0,0 +1,96 @@
+import math
+import os
+import random
+import sys
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from material_index import BM25_B, BM25_K1, TEXT_COLUMNS, MaterialIndex, tokenize
+
+WORDS = ["algebra", "fractions", "cells", "energy", "poetry", "grammar", "video", "quiz", "intro", "advanced"]
+
+
+def random_catalog(n_rows, rng):
+    def text(low, high):
+        return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+    return pd.DataFrame({
+        "level": rng.choices(["Beginner", "Intermediate", "Advanced"], k=n_rows),
+        "subject": rng.choices(["Mathematics", "Science", "English"], k=n_rows),
+        "material_type": rng.choices(["Video", "Article"], k=n_rows),
+        "resource_name": [text(1, 4) for _ in range(n_rows)],
+        "tags": [text(0, 6) if rng.random() > 0.1 else None for _ in range(n_rows)],
+    })
+
+
+def documents(df):
+    """Tokens of each row's text columns."""
+    return [
+        [token for column in TEXT_COLUMNS for token in tokenize(row[column])]
+        for _, row in df.iterrows()
+    ]
+
+
+def direct_scores(documents, query):
+    """BM25 of every document for query, computed from the token lists."""
+    average_length = sum(map(len, documents)) / len(documents)
+    document_frequency = Counter(token for document in documents for token in set(document))
+    scores = np.zeros(len(documents))
+    for row, document in enumerate(documents):
+        counts = Counter(document)
+        for term in set(tokenize(query)):
+            tf = counts[term]
+            if not tf:
+                continue
+            idf = math.log1p((len(documents) - document_frequency[term] + 0.5) / (document_frequency[term] + 0.5))
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * len(document) / average_length)
+            scores[row] += idf * tf * (BM25_K1 + 1) / (tf + norm)
+    return scores
+
+
+def test_scores_match_direct_bm25():
+    df = pd.DataFrame({
+        "level": ["Beginner"] * 3,
+        "subject": ["Mathematics"] * 3,
+        "material_type": ["Video"] * 3,
+        "resource_name": ["Algebra basics", "Algebra algebra drill", "Fractions"],
+        "tags": ["algebra, intro", None, "fractions, intro"],
+    })
+    index = MaterialIndex(df)
+    for query in ["algebra", "intro", "algebra intro", "fractions drill"]:
+        expected = direct_scores(documents(df), query)
+        impacts = np.zeros(len(df))
+        for token in set(tokenize(query)):
+            term = index.vocabulary[token]
+            start, end = index._text_offsets[term], index._text_offsets[term + 1]
+            np.add.at(impacts, index._text_rows[start:end], index._text_impacts[start:end])
+        np.testing.assert_allclose(impacts, expected, rtol=1e-5)
+    # The row with algebra twice in a short name ranks first
+    assert [record.row for record in index.search("algebra", k=3)] == [1, 0]
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_ranking_matches_direct_bm25(seed):
+    rng = random.Random(seed)
+    df = random_catalog(400, rng)
+    index = MaterialIndex(df)
+    tokens = documents(df)
+    for _ in range(60):
+        query = " ".join(rng.sample(WORDS, rng.randint(1, 3)))
+        filters = {"subject": rng.choice(["Mathematics", "Science", None])}
+        k = rng.randint(1, 10)
+        rows = [record.row for record in index.search(query, k=k, **filters)]
+
+        scores = direct_scores(tokens, query)
+        candidates = np.flatnonzero(scores > 0)
+        if filters["subject"] is not None:
+            candidates = candidates[df["subject"].to_numpy()[candidates] == filters["subject"]]
+        best = sorted(scores[candidates], reverse=True)[:k]
+        # Same top-k scores, best first (float32 impacts make exact ties order-insensitive)
+        assert len(rows) == len(best)
+        np.testing.assert_allclose(scores[rows], best, rtol=1e-5)
+        assert all(np.diff(scores[rows]) <= 1e-5)
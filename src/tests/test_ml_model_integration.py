@@ -0,0 +1,56 @@
+import os
+import sys
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ml_model_integration
+from ml_model_integration import get_student_level_predictor, load_student_level_model
+
+SMALL_CONFIG = dict(ml_model_integration.TRAINING_CONFIG, n_samples=200)
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches(monkeypatch):
+    monkeypatch.setattr(ml_model_integration, "_trained_models", {})
+    monkeypatch.setattr(ml_model_integration, "_shared_predictor", None)
+
+
+def test_failed_model_dump_leaves_no_temp_file(tmp_path):
+    with mock.patch.object(ml_model_integration.joblib, "dump", side_effect=OSError("disk full")):
+        model, scaler = load_student_level_model(SMALL_CONFIG, str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+    # Errors other than OSError still propagate, and still clean up
+    ml_model_integration._trained_models.clear()
+    with mock.patch.object(ml_model_integration.joblib, "dump", side_effect=KeyboardInterrupt):
+        with pytest.raises(KeyboardInterrupt):
+            load_student_level_model(SMALL_CONFIG, str(tmp_path))
+    assert os.listdir(tmp_path) == []
+
+    load_student_level_model(SMALL_CONFIG, str(tmp_path))
+    assert [name.endswith(".joblib") for name in os.listdir(tmp_path)] == [True]
+
+
+def test_shared_predictor_is_built_once_across_threads():
+    built = []
+
+    def slow_predictor():
+        built.append(None)
+        # Wide enough for every thread to get past an unlocked None check
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    with mock.patch.object(ml_model_integration, "StudentLevelPredictor", slow_predictor):
+        threads = [threading.Thread(target=lambda: results.append(get_student_level_predictor())) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    assert len(built) == 1
+    assert len(results) == 8 and all(result is results[0] for result in results)
@@ -0,0 +1,65 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Student_Progress_Tracking_System as tracking
+from storage_backends import CSVStorageBackend, set_storage_backend
+
+
+@pytest.fixture
+def backend(tmp_path):
+    backend = CSVStorageBackend(
+        progress_path=str(tmp_path / "student_progress.csv"),
+        materials_path=str(tmp_path / "study_materials_database.csv"),
+        history_pattern=str(tmp_path / "student_progress_{student_id}.csv")
+    )
+    # Only explicit flushes, so the tests control when events are written
+    backend.event_log.flush_every = 1_000
+    backend.event_log.flush_interval_ms = 60_000
+    set_storage_backend(backend)
+    yield backend
+    set_storage_backend("csv")
+
+
+def test_unserializable_update_is_rejected_without_losing_others(backend):
+    assert tracking.update_progress("S1", "Math", object(), "m1") is False
+    assert tracking.update_progress("S1", "Science", np.int64(70), "m2") is True
+    tracking.flush_progress()
+
+    assert tracking.get_student_progress("S1", "Science")["average_score"] == 70
+    assert tracking.get_student_progress("S1", "Math")["average_score"] == 0.0
+    with open(backend.event_log.log_path) as log_file:
+        assert len(log_file.readlines()) == 1
+
+
+def test_failed_write_keeps_events_queued(backend, monkeypatch):
+    assert tracking.update_progress("S1", "Math", 80, "m1")
+    assert tracking.update_progress("S1", "Science", 70, "m2")
+
+    def failing_fsync(fd):
+        raise OSError("disk full")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(tracking.os, "fsync", failing_fsync)
+        with pytest.raises(OSError):
+            backend.event_log.flush()
+    assert [event["subject"] for event in backend.event_log.pending_events()] == ["Math", "Science"]
+
+    assert tracking.update_progress("S1", "Math", 90, "m3")
+    assert backend.event_log.flush() == 3
+    progress = tracking.get_student_progress("S1", "Math")
+    assert progress["average_score"] == 90
+    assert progress["completed_materials"] == ["m1", "m3"]
+
+
+def test_integer_student_ids_match_the_csv(backend):
+    assert tracking.update_progress(7, "Math", 80, "m1")
+    assert tracking.get_student_progress(7, "Math")["average_score"] == 80
+    tracking.flush_progress(compact=True)
+    backend.progress_store._signature = None
+    assert tracking.get_student_progress(7, "Math")["average_score"] == 80
+    assert tracking.get_student_progress("7", "Math")["average_score"] == 80
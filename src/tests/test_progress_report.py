@@ -0,0 +1,137 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from progress_visualization_enhanced import EnhancedProgressVisualizer
+from storage_backends import (
+    HISTORY_COLUMNS,
+    RESUME_WINDOW,
+    CSVStorageBackend,
+    SQLiteStorageBackend,
+    get_storage_backend,
+    set_storage_backend,
+)
+
+HISTORY = [
+    ("2024-01-01", 61.0, "Beginner", "Math", 1.5),
+    ("2024-01-02", 70.0, "Beginner", "Math, Science", 2.0),
+    ("2024-01-03", 82.5, "Intermediate", "English", 3.25),
+]
+
+
+def full_report(student_id):
+    """The statistics of comprehensive_progress_analysis, read from the whole history."""
+    visualizer = EnhancedProgressVisualizer(student_id)
+    df = get_storage_backend().get_progress_history(student_id)
+    return {
+        'total_tests': len(df),
+        'average_score': df['test_score'].mean(),
+        'score_improvement': visualizer.calculate_score_improvement(df),
+        'study_time_correlation': visualizer.calculate_study_time_correlation(df)
+    }
+
+
+def assert_reports_match(student_id):
+    incremental = EnhancedProgressVisualizer(student_id).progress_report()
+    expected = full_report(student_id)
+    assert incremental.keys() == expected.keys()
+    for key, value in expected.items():
+        assert incremental[key] == pytest.approx(value, nan_ok=True), key
+
+
+@pytest.fixture
+def in_tmp_path(tmp_path, monkeypatch):
+    # History CSVs and statistics files live in the working directory
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    set_storage_backend("csv")
+
+
+def history_csv(rows, header=True):
+    return pd.DataFrame(rows, columns=HISTORY_COLUMNS).to_csv(index=False, header=header)
+
+
+def write_history(rows, mode="w"):
+    with open("student_progress_S1.csv", mode) as f:
+        f.write(history_csv(rows, header=mode == "w"))
+
+
+def test_csv_same_length_rewrite_is_read_in_full(in_tmp_path):
+    set_storage_backend(CSVStorageBackend())
+    write_history(HISTORY)
+    assert_reports_match("S1")
+
+    # Correct one score in place; the file keeps its length
+    corrected = list(HISTORY)
+    corrected[0] = ("2024-01-01", 75.0) + HISTORY[0][2:]
+    size = os.path.getsize("student_progress_S1.csv")
+    with open("student_progress_S1.csv", "r+") as f:
+        f.write(history_csv(corrected))
+    assert os.path.getsize("student_progress_S1.csv") == size
+    assert_reports_match("S1")
+
+    write_history([("2024-01-04", 90.0, "Advanced", "Math", 4.0)], mode="a")
+    assert_reports_match("S1")
+
+
+def long_history(n_rows=3000):
+    """A history longer than RESUME_WINDOW; every row has the same byte length."""
+    return [(f"2024-01-01T{i:06d}", 50.0 + i % 40, "Beginner", "Math", 1.5) for i in range(n_rows)]
+
+
+def rewrite_row(rows, index, score):
+    """Replace one score in place, keeping the file length; returns the new rows."""
+    rows = list(rows)
+    rows[index] = rows[index][:1] + (score,) + rows[index][2:]
+    size = os.path.getsize("student_progress_S1.csv")
+    with open("student_progress_S1.csv", "r+") as f:
+        f.write(history_csv(rows))
+    assert os.path.getsize("student_progress_S1.csv") == size
+    return rows
+
+
+def test_csv_same_length_rewrite_of_the_tail_is_read_in_full(in_tmp_path):
+    set_storage_backend(CSVStorageBackend())
+    rows = long_history()
+    write_history(rows)
+    assert os.path.getsize("student_progress_S1.csv") > RESUME_WINDOW
+    assert_reports_match("S1")
+
+    # Only the bytes just before the saved position change; the mtime may not
+    stat = os.stat("student_progress_S1.csv")
+    rewrite_row(rows, -1, 12.0)
+    os.utime("student_progress_S1.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert_reports_match("S1")
+
+
+def test_csv_same_length_rewrite_of_the_head_is_read_in_full(in_tmp_path):
+    set_storage_backend(CSVStorageBackend())
+    rows = long_history()
+    write_history(rows)
+    assert_reports_match("S1")
+
+    # Outside the checked window; the unchanged size with a new mtime gives it away
+    stat = os.stat("student_progress_S1.csv")
+    rewrite_row(rows, 0, 10.0)
+    os.utime("student_progress_S1.csv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert_reports_match("S1")
+
+    write_history([("2024-01-02T000000", 90.0, "Advanced", "Math", 4.0)], mode="a")
+    assert_reports_match("S1")
+
+
+def test_sqlite_rows_inserted_out_of_date_order(in_tmp_path):
+    backend = set_storage_backend(SQLiteStorageBackend(str(in_tmp_path / "tutor.db")))
+    backend.append_progress_history("S1", HISTORY[1:])
+    assert_reports_match("S1")
+
+    # An older test recorded late becomes the first score
+    backend.append_progress_history("S1", HISTORY[:1])
+    assert_reports_match("S1")
+
+    backend.append_progress_history("S1", [("2024-01-05", 95.0, "Advanced", "English", 5.0)])
+    assert_reports_match("S1")
@@ -0,0 +1,52 @@
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import recommendation_engine
+from recommendation_engine import StudyMaterialRecommender
+from storage_backends import SQLiteStorageBackend, set_storage_backend
+
+
+@pytest.fixture
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    set_storage_backend("csv")
+
+
+def test_cohort_workers_rebuild_the_parent_backend(in_tmp_path, monkeypatch):
+    backend = set_storage_backend(SQLiteStorageBackend(str(in_tmp_path / "tutor.db")))
+    pools = []
+
+    def recording_pool(*args, **kwargs):
+        pools.append(kwargs)
+        return ProcessPoolExecutor(*args, **kwargs)
+
+    monkeypatch.setattr(recommendation_engine, "ProcessPoolExecutor", recording_pool)
+    written = StudyMaterialRecommender().recommend_for_cohort(
+        ["S1", "S2", "S3"], ["Mathematics"], "cohort.jsonl", workers=2, use_processes=True, chunk_size=1
+    )
+    assert written == 3
+    assert len(pools) == 1
+    assert pools[0]["initializer"] is recommendation_engine.init_worker_storage_backend
+    assert pools[0]["initargs"] == (backend.spec(),)
+    with open("cohort.jsonl") as f:
+        assert sorted(json.loads(line)["student_id"] for line in f) == ["S1", "S2", "S3"]
+
+
+def test_shared_recommender_returns_plain_dicts(in_tmp_path):
+    recommender = recommendation_engine.get_recommender()
+    recommendation = recommender.recommend_materials("Mathematics", learning_speed="medium")
+    materials = recommendation["recommended_materials"]
+    assert materials and all(type(material) is dict for material in materials)
+    json.dumps(recommendation)
+
+    # Callers may edit their copy without touching the shared catalog
+    materials[0]["title"] = "changed"
+    again = recommender.recommend_materials("Mathematics", learning_speed="medium")
+    assert again["recommended_materials"][0]["title"] != "changed"
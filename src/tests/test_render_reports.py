@@ -0,0 +1,96 @@
+import functools
+import multiprocessing
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+import matplotlib
+import pandas as pd
+import pytest
+
+matplotlib.use('Agg')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import progress_visualization_enhanced
+from progress_visualization_enhanced import render_reports
+from storage_backends import (
+    HISTORY_COLUMNS,
+    CSVStorageBackend,
+    SQLiteStorageBackend,
+    get_storage_backend,
+    init_worker_storage_backend,
+    set_storage_backend,
+    storage_backend_spec,
+)
+
+HISTORY = [
+    ("2024-01-01", 61.0, "Beginner", "Math", 1.5),
+    ("2024-01-02", 70.0, "Beginner", "Math, Science", 2.0),
+    ("2024-01-03", 82.5, "Intermediate", "English", 3.25),
+]
+NEW_TEST = ("2024-01-04", 90.0, "Advanced", "Math", 4.0)
+
+
+@pytest.fixture
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    set_storage_backend("csv")
+
+
+def render(backend, history_read):
+    """render_reports for S1, failing the test if the history is read when it should not be."""
+    if history_read:
+        summary = render_reports(["S1"], workers=1, output_dir="reports")
+    else:
+        with mock.patch.object(backend, "get_progress_history", side_effect=AssertionError("history was read")):
+            summary = render_reports(["S1"], workers=1, output_dir="reports")
+    assert not summary["failed"]
+    return summary["cache_hits"], summary["cache_misses"]
+
+
+def test_csv_unchanged_history_is_not_read(in_tmp_path):
+    backend = set_storage_backend(CSVStorageBackend())
+    pd.DataFrame(HISTORY, columns=HISTORY_COLUMNS).to_csv("student_progress_S1.csv", index=False)
+    assert render(backend, history_read=True) == (0, 1)
+    assert render(backend, history_read=False) == (1, 0)
+
+    pd.DataFrame([NEW_TEST]).to_csv("student_progress_S1.csv", mode="a", header=False, index=False)
+    assert render(backend, history_read=True) == (0, 1)
+    assert render(backend, history_read=False) == (1, 0)
+
+
+def test_sqlite_unchanged_history_is_not_read(in_tmp_path):
+    backend = set_storage_backend(SQLiteStorageBackend(str(in_tmp_path / "tutor.db")))
+    backend.append_progress_history("S1", HISTORY)
+    assert render(backend, history_read=True) == (0, 1)
+    assert render(backend, history_read=False) == (1, 0)
+
+    backend.append_progress_history("S1", [NEW_TEST])
+    assert render(backend, history_read=True) == (0, 1)
+    assert render(backend, history_read=False) == (1, 0)
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test_render_workers_use_the_parent_backend(in_tmp_path, monkeypatch, start_method):
+    backend = set_storage_backend(SQLiteStorageBackend(str(in_tmp_path / "tutor.db")))
+    backend.append_progress_history("S1", HISTORY)
+    backend.append_progress_history("S2", HISTORY[:2])
+    context = multiprocessing.get_context(start_method)
+    monkeypatch.setattr(progress_visualization_enhanced, "ProcessPoolExecutor",
+                        functools.partial(ProcessPoolExecutor, mp_context=context))
+    # There are no history CSVs, so a worker on the default backend fails
+    summary = render_reports(["S1", "S2"], workers=2, output_dir="reports")
+    assert summary["failed"] == {}
+    assert sorted(summary["render_seconds"]) == ["S1", "S2"]
+
+
+def test_worker_initializer_builds_a_fresh_backend(in_tmp_path):
+    parent = set_storage_backend(SQLiteStorageBackend(str(in_tmp_path / "tutor.db"), pool_size=2))
+    init_worker_storage_backend(storage_backend_spec())
+    worker = get_storage_backend()
+    # As after a fork: same database, but none of the parent's connections
+    assert worker is not parent and worker.pool is not parent.pool
+    assert worker.spec() == parent.spec()
@@ -0,0 +1,120 @@
+import os
+import random
+import sys
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import similar_materials
+from similar_materials import SimilarMaterialsIndex, load_or_build_index, material_documents
+
+STUDY_MATERIALS = {
+    "Mathematics": {
+        "Beginner": [
+            {"title": "Fractions", "description": "Adding fractions", "url": "https://example.com/fractions"},
+        ],
+    },
+}
+CATALOG = pd.DataFrame({
+    "resource_name": ["Fractions again", np.nan, "No link"],
+    "tags": ["fractions", "cells, biology", "misc"],
+    "subject": ["Mathematics", "Science", "English"],
+    "level": ["Beginner", "Intermediate", "Advanced"],
+    "link": ["https://example.com/fractions", "https://example.com/cells", np.nan],
+})
+
+
+def random_documents(seed, n=300):
+    rng = random.Random(seed)
+    topics = [[f"topic{t}word{w}" for w in range(12)] for t in range(10)]
+    documents = []
+    for i in range(n):
+        words = rng.sample(topics[i % len(topics)], 5) + [f"common{rng.randrange(40)}" for _ in range(3)]
+        documents.append((f"https://example.com/m{i}", f"Material {i}", ' '.join(words)))
+    return documents
+
+
+def test_material_documents_titles_are_strings():
+    documents = {url: (title, text) for url, title, text in material_documents(STUDY_MATERIALS, CATALOG)}
+    # Study materials come first, rows without a link are skipped
+    assert set(documents) == {"https://example.com/fractions", "https://example.com/cells"}
+    assert documents["https://example.com/fractions"][0] == "Fractions"
+    # A catalog row without a name gets an empty title, not NaN
+    assert documents["https://example.com/cells"][0] == ""
+    assert documents["https://example.com/cells"][1] == "cells, biology Science Intermediate"
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_probing_every_list_matches_the_exact_scan(seed, monkeypatch):
+    index = SimilarMaterialsIndex.build(random_documents(seed), n_lists=12)
+    # Force the inverted-list path even though the index is small
+    monkeypatch.setattr(similar_materials, "EXACT_SEARCH_LIMIT", 0)
+    n_lists = len(index.centroids)
+    for url in index.urls[::17]:
+        assert index.similar_to(url, k=10, n_probe=n_lists) == index.exact_similar_to(url, k=10)
+        approximate = index.similar_to(url, k=10, n_probe=2)
+        assert len(approximate) == 10 and url not in [found for found, _ in approximate]
+
+
+def test_exact_scan_ranks_by_cosine():
+    index = SimilarMaterialsIndex.build(random_documents(0), n_lists=4)
+    dense = index.vectors.toarray()
+    query = index.positions["https://example.com/m3"]
+    scores = dense @ dense[query]
+    scores[query] = -np.inf
+    expected = np.argsort(-scores, kind="stable")[:5]
+    results = index.exact_similar_to("https://example.com/m3", k=5)
+    assert [url for url, _ in results] == [index.urls[row] for row in expected]
+    np.testing.assert_allclose([score for _, score in results], scores[expected], atol=1e-5)
+    with pytest.raises(ValueError):
+        index.similar_to("https://example.com/unknown")
+
+
+def test_save_and_load_round_trip(tmp_path):
+    documents = random_documents(1, n=50) + [("https://example.com/untitled", "", "topic0word1 common3")]
+    index = SimilarMaterialsIndex.build(documents, n_lists=5)
+    path = str(tmp_path / "similar.npz")
+    index.save(path)
+    assert os.listdir(tmp_path) == ["similar.npz"]
+
+    loaded = SimilarMaterialsIndex.load(path)
+    assert loaded.urls == index.urls and loaded.titles == index.titles
+    assert loaded.titles[-1] == "" and loaded.fingerprint == index.fingerprint
+    np.testing.assert_array_equal(loaded.assignments, index.assignments)
+    assert (loaded.vectors != index.vectors).nnz == 0
+    assert loaded.similar_to(index.urls[0], k=5) == index.similar_to(index.urls[0], k=5)
+
+
+def test_load_or_build_reuses_a_matching_index(tmp_path):
+    documents = random_documents(2, n=40)
+    path = str(tmp_path / "similar.npz")
+    built = load_or_build_index(documents, path)
+
+    with mock.patch.object(SimilarMaterialsIndex, "build", side_effect=AssertionError("rebuilt")):
+        assert load_or_build_index(documents, path).fingerprint == built.fingerprint
+    changed = documents[:-1] + [(documents[-1][0], "Renamed", documents[-1][2])]
+    rebuilt = load_or_build_index(changed, path)
+    assert rebuilt.titles[-1] == "Renamed"
+    assert SimilarMaterialsIndex.load(path).fingerprint == rebuilt.fingerprint
+
+
+def test_failed_save_keeps_the_previous_index(tmp_path):
+    path = str(tmp_path / "similar.npz")
+    old = SimilarMaterialsIndex.build(random_documents(3, n=40), n_lists=4)
+    old.save(path)
+    new = SimilarMaterialsIndex.build(random_documents(4, n=40), n_lists=4)
+
+    def partial_savez(file, **arrays):
+        file.write(b"PK partial")
+        raise OSError("disk full")
+
+    with mock.patch.object(similar_materials.np, "savez", partial_savez):
+        with pytest.raises(OSError):
+            new.save(path)
+    # No half-written index replaced the old one, and no temp file is left
+    assert os.listdir(tmp_path) == ["similar.npz"]
+    assert SimilarMaterialsIndex.load(path).fingerprint == old.fingerprint
@@ -0,0 +1,58 @@
+import os
+import random
+import string
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from adaptive_content_generator import AdaptiveLearningContentGenerator
+
+LEVELS = ['Beginner', 'Intermediate', 'Advanced']
+
+
+def random_text(rng):
+    """Random passage: 0-6 sentences of 0-40 words of 1-12 letters, mixed terminators."""
+    sentences = []
+    for _ in range(rng.randint(0, 6)):
+        words = [
+            ''.join(rng.choices(string.ascii_letters, k=rng.randint(1, 12)))
+            for _ in range(rng.randint(0, 40))
+        ]
+        sentences.append(' '.join(words) + rng.choice(['.', '!', '?', '']))
+    return ' '.join(sentences)
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    rng = random.Random(0)
+    texts = [random_text(rng) for _ in range(2000)]
+    levels = [rng.choice(LEVELS) for _ in texts]
+    return texts, levels
+
+
+def expected(generator, texts, levels):
+    return [generator.simplify_content(text, level) for text, level in zip(texts, levels)]
+
+
+def test_serial_batch_matches_simplify_content(corpus):
+    generator = AdaptiveLearningContentGenerator()
+    texts, levels = corpus
+    assert generator.simplify_batch(texts, levels) == expected(generator, texts, levels)
+    for level in LEVELS:
+        assert generator.simplify_batch(texts[:200], level) == expected(generator, texts[:200], [level] * 200)
+
+
+def test_process_pool_batch_matches_simplify_content(corpus):
+    generator = AdaptiveLearningContentGenerator()
+    texts, levels = corpus
+    assert generator.simplify_batch(texts, levels, workers=2, chunk_size=300) == expected(generator, texts, levels)
+
+
+def test_mismatched_levels_are_rejected():
+    generator = AdaptiveLearningContentGenerator()
+    with pytest.raises(ValueError):
+        generator.simplify_batch(["a b c"], ["Beginner", "Advanced"])
+    with pytest.raises(ValueError):
+        generator.simplify_batch(["a b c"], ["Expert"])
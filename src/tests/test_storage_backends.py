@@ -0,0 +1,95 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage_backends import CSVStorageBackend, SQLiteStorageBackend, set_storage_backend
+
+UPDATES = [
+    ("S1", "Mathematics", 70.0, "https://example.com/fractions"),
+    ("S1", "Mathematics", 90.0, "https://example.com/decimals"),
+    ("S1", "Science", 55.0, "https://example.com/cells"),
+    (2, "Mathematics", 80.0, "https://example.com/fractions"),
+    ("2", "Mathematics", 60.0, "https://example.com/fractions"),
+]
+KEYS = [("S1", "Mathematics"), ("S1", "Science"), (2, "Mathematics"), ("2", "Mathematics"), ("S9", "English")]
+HISTORY = [
+    ("2024-01-01", 61.0, "Beginner", "Math", 1.5),
+    ("2024-01-02", 70.0, "Beginner", "Math, Science", 2.0),
+    ("2024-01-03", 82.5, "Intermediate", "English", 3.25),
+]
+
+
+@pytest.fixture
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    set_storage_backend("csv")
+
+
+def test_csv_and_sqlite_progress_agree(in_tmp_path):
+    backends = [CSVStorageBackend(), SQLiteStorageBackend(str(in_tmp_path / "tutor.db"))]
+    for backend in backends:
+        for update in UPDATES:
+            backend.update_progress(*update)
+        backend.flush()
+
+    csv_backend, sqlite_backend = backends
+    for student_id, subject in KEYS:
+        assert csv_backend.get_progress(student_id, subject) == sqlite_backend.get_progress(student_id, subject)
+    assert csv_backend.get_progress_many(KEYS) == sqlite_backend.get_progress_many(KEYS)
+    # Integer and string ids name the same student
+    assert sqlite_backend.get_progress(2, "Mathematics") == sqlite_backend.get_progress("2", "Mathematics")
+    assert sqlite_backend.get_progress("2", "Mathematics")["completed_materials"] == ["https://example.com/fractions"]
+
+
+def test_sqlite_history_positions_survive_vacuum(in_tmp_path):
+    backend = SQLiteStorageBackend(str(in_tmp_path / "tutor.db"))
+    # S2's rows come first, so VACUUM would renumber S1's implicit rowids after they go
+    backend.append_progress_history("S2", HISTORY)
+    backend.append_progress_history("S1", HISTORY)
+    _, position, _ = backend.get_progress_history_since("S1")
+
+    connection = sqlite3.connect(in_tmp_path / "tutor.db", isolation_level=None)
+    try:
+        # Only an INTEGER PRIMARY KEY is guaranteed to keep its values through VACUUM
+        primary_key = [(name, kind) for _, name, kind, _, _, pk in connection.execute(
+            "PRAGMA table_info(progress_history)") if pk]
+        assert primary_key == [("id", "INTEGER")]
+        connection.execute("DELETE FROM progress_history WHERE student_id = 'S2'")
+        connection.execute("VACUUM")
+    finally:
+        connection.close()
+
+    backend.append_progress_history("S1", [("2024-01-04", 90.0, "Advanced", "Math", 4.0)])
+    rows, _, reset = backend.get_progress_history_since("S1", position)
+    assert not reset
+    assert rows["test_score"].tolist() == [90.0]
+
+
+def test_sqlite_history_from_before_ids_is_migrated(in_tmp_path):
+    path = in_tmp_path / "tutor.db"
+    with sqlite3.connect(path) as connection:
+        connection.execute(
+            "CREATE TABLE progress_history (student_id TEXT NOT NULL, date TEXT NOT NULL, test_score REAL, "
+            "predicted_level TEXT, subjects_tested TEXT, time_spent_studying REAL)"
+        )
+        connection.executemany("INSERT INTO progress_history VALUES ('S1', ?, ?, ?, ?, ?)", HISTORY)
+        connection.execute("DELETE FROM progress_history WHERE rowid = 2")
+        old_rowids = [rowid for rowid, in connection.execute("SELECT rowid FROM progress_history ORDER BY rowid")]
+    connection.close()
+
+    backend = SQLiteStorageBackend(str(path))
+    with backend.pool.connection() as connection:
+        ids = [row_id for row_id, in connection.execute("SELECT id FROM progress_history ORDER BY id")]
+    assert ids == old_rowids == [1, 3]
+    # A position saved before the migration is still valid
+    backend.append_progress_history("S1", [("2024-01-04", 90.0, "Advanced", "Math", 4.0)])
+    rows, position, reset = backend.get_progress_history_since("S1", 3)
+    assert not reset and rows["test_score"].tolist() == [90.0]
+    assert position == 4
+    masks, vocabulary = backend.get_subject_masks("S1")
+    assert len(masks) == 3 and set(vocabulary) == {"Math", "English"}
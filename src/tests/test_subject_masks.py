@@ -0,0 +1,67 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from storage_backends import (
+    HISTORY_COLUMNS,
+    CSVStorageBackend,
+    SQLiteStorageBackend,
+    set_storage_backend,
+)
+from subject_masks import MAX_SUBJECTS, OVERFLOW_MASK, encode_subjects, subject_counts
+
+# More subjects than get a bit, three per test
+SUBJECTS = [f"Subject {i}" for i in range(MAX_SUBJECTS + 8)]
+HISTORY = [
+    (f"2024-01-{day % 28 + 1:02d}", 50.0 + day % 50, "Beginner", ", ".join(SUBJECTS[day:day + 3]), 1.0)
+    for day in range(len(SUBJECTS) - 2)
+]
+
+
+def string_counts(values):
+    return pd.Series(values).str.split(", ").explode().value_counts()
+
+
+def assert_counts_match(masks, vocabulary, values):
+    counts = subject_counts(masks, vocabulary, values)
+    expected = string_counts(values)
+    assert counts.sort_index().to_dict() == expected.sort_index().to_dict()
+
+
+@pytest.fixture
+def in_tmp_path(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    yield tmp_path
+    set_storage_backend("csv")
+
+
+def test_subjects_past_the_mask_width_are_flagged():
+    values = [row[3] for row in HISTORY]
+    masks, vocabulary = encode_subjects(values)
+    assert vocabulary == SUBJECTS[:MAX_SUBJECTS]
+    assert masks.dtype == np.uint64
+    overflowed = (masks & np.uint64(OVERFLOW_MASK)) != 0
+    assert overflowed.tolist() == [day + 2 >= MAX_SUBJECTS for day in range(len(values))]
+    assert_counts_match(masks, vocabulary, values)
+
+
+def test_csv_ingests_more_subjects_than_bits(in_tmp_path):
+    backend = set_storage_backend(CSVStorageBackend())
+    pd.DataFrame(HISTORY, columns=HISTORY_COLUMNS).to_csv("student_progress_S1.csv", index=False)
+    masks, vocabulary = backend.get_subject_masks("S1")
+    assert_counts_match(masks, vocabulary, [row[3] for row in HISTORY])
+
+
+def test_sqlite_ingests_more_subjects_than_bits(in_tmp_path):
+    backend = set_storage_backend(SQLiteStorageBackend(str(in_tmp_path / "tutor.db")))
+    backend.append_progress_history("S1", HISTORY[:40])
+    backend.append_progress_history("S1", HISTORY[40:])
+    masks, vocabulary = backend.get_subject_masks("S1")
+    history = backend.get_progress_history("S1")
+    assert len(masks) == len(history)
+    assert_counts_match(masks, vocabulary, history["subjects_tested"])
@@ -0,0 +1,92 @@
+import os
+import random
+import string
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from substitution_engine import SubstitutionDictionary, SubstitutionEngine
+
+
+def legacy_substitute(sentence, mapping):
+    """The per-entry str.replace loop SubstitutionEngine replaced."""
+    result = sentence
+    for key, value in mapping.items():
+        if key in result:
+            result = result.replace(key, value)
+    return result
+
+
+def random_word(rng, length):
+    return ''.join(rng.choices(string.ascii_lowercase, k=length))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_matches_sequential_replace_on_whole_words(seed):
+    # Where the old loop was unambiguous (whole words, no key inside another
+    # key or a replacement) both give the same text
+    rng = random.Random(seed)
+    words = {random_word(rng, 6) for _ in range(60)}
+    keys = sorted(words)[:30]
+    mapping = {key: key.upper() for key in keys}
+    filler = sorted(words)[30:]
+    for _ in range(50):
+        sentence = ' '.join(rng.choices(keys + filler, k=12)) + '.'
+        assert SubstitutionEngine(mapping).substitute(sentence) == legacy_substitute(sentence, mapping)
+
+
+def test_longest_key_wins_regardless_of_order():
+    for mapping in (
+        {"metaphor": "comparison", "metaphorically": "figuratively"},
+        {"metaphorically": "figuratively", "metaphor": "comparison"},
+    ):
+        engine = SubstitutionEngine(mapping)
+        assert engine.substitute("speaking metaphorically, a metaphor") == "speaking figuratively, a comparison"
+    # The old loop rewrote the longer word through its prefix
+    assert legacy_substitute("speaking metaphorically", {"metaphor": "comparison", "metaphorically": "figuratively"}) \
+        == "speaking comparisonically"
+
+
+def test_overlapping_phrases_prefer_the_longest():
+    engine = SubstitutionEngine({"body": "B", "body process": "BP", "process": "P", "ab": "x", "abc": "y", "abcd": "z"})
+    assert engine.substitute("a body process, a body and a process") == "a BP, a B and a P"
+    assert engine.substitute("ab abc abcd abcde") == "x y z abcde"
+
+
+def test_keys_only_match_whole_words():
+    engine = SubstitutionEngine({"cat": "dog", "c++": "C plus plus"})
+    assert engine.substitute("concatenate the cat; cats and bobcat") == "concatenate the dog; cats and bobcat"
+    assert engine.substitute("learn c++ today") == legacy_substitute("learn c++ today", {"c++": "C plus plus"})
+    assert legacy_substitute("concatenate the cat", {"cat": "dog"}) == "condogenate the dog"
+
+
+def test_case_handling():
+    sensitive = SubstitutionEngine({"polygon": "shape"})
+    assert sensitive.substitute("Polygon POLYGON polygon") == "Polygon POLYGON shape"
+
+    insensitive = SubstitutionEngine({"Polygon": "shape"}, ignore_case=True)
+    assert insensitive.substitute("Polygon POLYGON polygon") == "shape shape shape"
+    # simplify_sentence lowercases first, as the old loop did with lowercased keys
+    sentence = "A Polygon is classified by its sides."
+    mapping = {"polygon": "shape", "classified": "grouped"}
+    assert SubstitutionEngine(mapping, ignore_case=True).substitute(sentence.lower()) \
+        == legacy_substitute(sentence.lower(), mapping)
+
+
+def test_replacements_are_not_rescanned():
+    mapping = {"a": "b", "b": "c"}
+    assert SubstitutionEngine(mapping).substitute("a b") == "b c"
+    assert legacy_substitute("a b", mapping) == "c c"
+
+
+def test_dictionary_recompiles_after_changes():
+    words = SubstitutionDictionary({"polygon": "shape"})
+    version = words.version
+    assert words.substitute("a polygon") == "a shape"
+    words["polygon"] = "figure"
+    assert words.version > version
+    assert words.substitute("a polygon") == "a figure"
+    del words["polygon"]
+    assert words.substitute("a polygon") == "a polygon"
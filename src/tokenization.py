@@ -0,0 +1,97 @@
+# tokenization.py
+import re
+import threading
+
+# Set once per process by punkt_available(); None means "not checked yet"
+_punkt_available = None
+_punkt_lock = threading.Lock()
+
+# Whitespace after '.' or '?', except after abbreviations like "e.g." or "Mr.".
+# Matching the whitespace first lets the regex engine skip ahead quickly.
+_SENTENCE_BOUNDARY = re.compile(r'\s(?<=[.?]\s)(?<!\w\.\w.\s)(?<![A-Z][a-z]\.\s)')
+
+
+def regex_sentence_tokenize(text):
+    """
+    Split text into sentences with a regex. Needs no NLTK data.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list: List of sentences
+    """
+    sentences = _SENTENCE_BOUNDARY.split(text)
+    return [sentence.strip() for sentence in sentences if sentence.strip()]
+
+
+def punkt_available():
+    """
+    Check whether the NLTK punkt tokenizer is installed locally.
+
+    NLTK is imported on first call and the result is shared by every caller
+    in the process. Nothing is ever downloaded here.
+    """
+    global _punkt_available
+    if _punkt_available is None:
+        with _punkt_lock:
+            if _punkt_available is None:
+                _punkt_available = _find_punkt()
+    return _punkt_available
+
+
+def _find_punkt():
+    try:
+        import nltk
+    except ImportError:
+        return False
+
+    # Newer NLTK releases load punkt_tab instead of the pickled punkt model
+    for resource in ('tokenizers/punkt_tab/english/', 'tokenizers/punkt'):
+        try:
+            nltk.data.find(resource)
+            return True
+        except LookupError:
+            continue
+    return False
+
+
+def sentence_tokenize(text):
+    """
+    Split text into sentences with NLTK punkt, or the regex tokenizer when punkt is missing.
+
+    Args:
+        text (str): Input text
+
+    Returns:
+        list: List of sentences
+    """
+    global _punkt_available
+    if punkt_available():
+        from nltk.tokenize import sent_tokenize
+        try:
+            return sent_tokenize(text)
+        except LookupError:
+            # Installed data does not match what this NLTK version expects
+            _punkt_available = False
+    return regex_sentence_tokenize(text)
+
+
+def download_punkt(download_dir=None):
+    """
+    Explicitly download the punkt tokenizer, e.g. from a setup script.
+
+    Args:
+        download_dir (str, optional): Target directory, defaults to NLTK's own
+
+    Returns:
+        bool: True if punkt is available afterwards
+    """
+    global _punkt_available
+    import nltk
+
+    for package in ('punkt_tab', 'punkt'):
+        nltk.download(package, download_dir=download_dir, quiet=True)
+    with _punkt_lock:
+        _punkt_available = _find_punkt()
+    return _punkt_available